@@ -0,0 +1,75 @@
+"""Shared bits for the benchmark scripts.
+
+Each benchmark points the app at a throwaway SQLite file so numbers reflect
+real disk commits, then drives it in-process through FastAPI's TestClient.
+Run them from the repo root, e.g. ``python benchmarks/bench_evaluate_batch.py``.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Tuple
+
+# Scripts live one level down; make `import main` work without installing
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+# Startup still migrates the app's own engine; keep that DB out of the repo too
+os.environ.setdefault(
+    "DATABASE_URL",
+    f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='findability-bench-'), 'app.db')}",
+)
+
+import main  # noqa: E402
+
+
+@contextmanager
+def temp_client() -> Iterator[Tuple[TestClient, object]]:
+    """Yield a TestClient wired to a fresh on-disk SQLite DB, plus its engine."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            connect_args={"check_same_thread": False},
+        )
+
+        @event.listens_for(engine, "connect")
+        def _fk_on(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.close()
+
+        BenchSession = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+        def _get_db():
+            db = BenchSession()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        main.Base.metadata.create_all(bind=engine)
+        main.app.dependency_overrides[main.get_session] = _get_db
+        main.app.dependency_overrides[main.get_read_session] = _get_db
+        try:
+            with TestClient(main.app) as client:
+                yield client, engine
+        finally:
+            main.app.dependency_overrides.clear()
+            engine.dispose()
+
+
+def timed(fn: Callable[[], object]) -> float:
+    """Run fn once and return wall time in seconds."""
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def report(label: str, count: int, seconds: float) -> None:
+    rate = count / seconds if seconds else float("inf")
+    print(f"{label:<40} {count:>8} ops  {seconds:8.3f}s  {rate:12.1f} ops/s")
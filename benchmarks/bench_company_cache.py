@@ -0,0 +1,78 @@
+"""GET /companies/{id} with the read cache off vs on (and 304 revalidation).
+
+Drives the ASGI app directly like bench_middleware.py, cycling over a small
+set of hot ids the way the frontend and integrations do.
+
+Usage: python benchmarks/bench_company_cache.py [n_requests]
+"""
+
+import asyncio
+import sys
+import time
+
+from _harness import temp_client
+
+import main
+
+
+async def _drive(paths, n_requests: int, headers=()) -> float:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        return None
+
+    def _scope(path: str) -> dict:
+        return {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"host", b"bench"), *headers],
+            "client": ("127.0.0.1", 1234),
+            "server": ("bench", 80),
+            "app": main.app,
+        }
+
+    for path in paths:  # warm up
+        await main.app(_scope(path), receive, send)
+    start = time.perf_counter()
+    for i in range(n_requests):
+        await main.app(_scope(paths[i % len(paths)]), receive, send)
+    return time.perf_counter() - start
+
+
+def run(n_requests: int = 5000) -> None:
+    with temp_client() as (client, _engine):
+        ids = [
+            client.post("/companies", json={"name": f"Hot Co {i}", "city": "Austin"}).json()["id"]
+            for i in range(20)
+        ]
+        paths = [f"/companies/{cid}" for cid in ids]
+        etag = client.get(paths[0]).headers["etag"]
+        saved = main.company_cache.max_entries
+        try:
+            cases = [
+                ("cache off", 0, paths, ()),
+                ("cache on", saved, paths, ()),
+                ("cache on, 304", saved, paths[:1], ((b"if-none-match", etag.encode()),)),
+            ]
+            for label, size, case_paths, headers in cases:
+                main.company_cache.max_entries = size
+                main.company_cache.clear()
+                seconds = asyncio.run(_drive(case_paths, n_requests, headers))
+                print(
+                    f"{label:<16} {n_requests / seconds:10.1f} req/s"
+                    f"  {seconds / n_requests * 1e6:8.1f} us/req"
+                )
+        finally:
+            main.company_cache.max_entries = saved
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,54 @@
+"""Loading a prospect list: looped POST /companies vs POST /companies/import.
+
+Usage: python benchmarks/bench_company_import.py [n_companies]
+"""
+
+import json
+import sys
+
+from _harness import report, temp_client, timed
+
+
+def _rows(n: int, prefix: str):
+    return [
+        {"name": f"{prefix} {i}", "city": "Austin", "industry": "dental", "country": "US"}
+        for i in range(n)
+    ]
+
+
+def run(n_companies: int = 50_000) -> None:
+    looped_n = min(n_companies, 2000)  # one commit each; keep this part short
+    with temp_client() as (client, _engine):
+        rows = _rows(looped_n, "Looped")
+
+        def _looped() -> None:
+            for row in rows:
+                client.post("/companies", json=row)
+
+        report("POST /companies (looped)", looped_n, timed(_looped))
+
+    for label, content_type in (("ndjson", "application/x-ndjson"), ("csv", "text/csv")):
+        with temp_client() as (client, _engine):
+            rows = _rows(n_companies, "Imported")
+            if label == "csv":
+                body = "name,city,industry,country\n" + "".join(
+                    f"{r['name']},{r['city']},{r['industry']},{r['country']}\n" for r in rows
+                )
+            else:
+                body = "".join(json.dumps(r) + "\n" for r in rows)
+            payload = body.encode()
+
+            def _import() -> None:
+                r = client.post(
+                    "/companies/import", content=payload, headers={"content-type": content_type}
+                )
+                assert r.json()["created"] == n_companies, r.json()
+
+            report(f"POST /companies/import ({label})", n_companies, timed(_import))
+
+            export = timed(lambda: client.get("/companies/export", params={"format": label}))
+            report(f"GET /companies/export ({label})", n_companies, export)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,52 @@
+"""Looping POST /evaluate vs one POST /evaluate/batch for the same payloads.
+
+Usage: python benchmarks/bench_evaluate_batch.py [n_items]
+"""
+
+import random
+import sys
+
+from _harness import report, temp_client, timed
+
+import main
+
+
+def _payloads(company_ids, n_items: int) -> list:
+    rng = random.Random(42)
+    fields = [f for f in main.EvaluateIn.model_fields if f != "company_id"]
+    items = []
+    for _ in range(n_items):
+        body = {"company_id": rng.choice(company_ids)}
+        for field in fields:
+            body[field] = rng.random() < 0.5
+        items.append(body)
+    return items
+
+
+def run(n_items: int = 2000) -> None:
+    with temp_client() as (client, _engine):
+        company_ids = [
+            client.post("/companies", json={"name": f"Bench Co {i}"}).json()["id"]
+            for i in range(50)
+        ]
+        items = _payloads(company_ids, n_items)
+
+        def _loop():
+            for body in items:
+                client.post("/evaluate", json=body).raise_for_status()
+
+        def _batch():
+            for start in range(0, len(items), main.EVALUATE_BATCH_MAX):
+                chunk = items[start : start + main.EVALUATE_BATCH_MAX]
+                client.post("/evaluate/batch", json={"items": chunk}).raise_for_status()
+
+        loop_s = timed(_loop)
+        batch_s = timed(_batch)
+
+    report("POST /evaluate (looped)", n_items, loop_s)
+    report("POST /evaluate/batch", n_items, batch_s)
+    print(f"speedup: {loop_s / batch_s:.1f}x")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
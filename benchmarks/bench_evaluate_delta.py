@@ -0,0 +1,93 @@
+"""Periodic re-check traffic: full POST /evaluate vs PATCH /evaluate deltas.
+
+Seeds N companies with one evaluation each, then runs R re-check rounds in
+which a small share of companies flip one signal. Full mode resends all ten
+booleans every time (with the dedupe window off, like re-checks spaced
+further apart than it); delta mode sends only the flipped signal, or
+nothing. Reports request bytes, evaluation rows written and wall time.
+
+Usage: python benchmarks/bench_evaluate_delta.py [n_companies] [rounds] [change_share]
+"""
+
+import json
+import random
+import sys
+
+from sqlalchemy import text
+
+from _harness import report, temp_client, timed
+
+import main
+
+FIELDS = list(main.SIGNAL_FIELDS.values())
+
+
+def _full_body(company_id: int, mask: int) -> dict:
+    body = {"company_id": company_id}
+    for bit, field in enumerate(FIELDS):
+        body[field] = bool(mask >> bit & 1)
+    return body
+
+
+def _rounds(n_companies: int, rounds: int, change_share: float) -> list:
+    """Per round: (company index, flipped bit or None) for every company."""
+    rng = random.Random(24)
+    return [
+        [
+            (i, rng.randrange(len(FIELDS)) if rng.random() < change_share else None)
+            for i in range(n_companies)
+        ]
+        for _ in range(rounds)
+    ]
+
+
+def run(n_companies: int = 1000, rounds: int = 5, change_share: float = 0.05) -> None:
+    main.evaluation_dedupe.window_seconds = 0
+    plan = _rounds(n_companies, rounds, change_share)
+    print(f"{n_companies} companies x {rounds} re-check rounds, {change_share:.0%} change per round")
+    for mode in ("full", "delta"):
+        with temp_client() as (client, engine):
+            rng = random.Random(7)
+            masks = [rng.getrandbits(len(FIELDS)) for _ in range(n_companies)]
+            ids = [
+                client.post("/companies", json={"name": f"Recheck Co {i}"}).json()["id"]
+                for i in range(n_companies)
+            ]
+            for cid, mask in zip(ids, masks):
+                client.post("/evaluate", json=_full_body(cid, mask))
+            sent = {"bytes": 0}
+
+            def _recheck() -> None:
+                for round_plan in plan:
+                    for i, flip in round_plan:
+                        if flip is not None:
+                            masks[i] ^= 1 << flip
+                        if mode == "full":
+                            body = _full_body(ids[i], masks[i])
+                            r = client.post("/evaluate", json=body)
+                        else:
+                            body = {"company_id": ids[i]}
+                            if flip is not None:
+                                body[FIELDS[flip]] = bool(masks[i] >> flip & 1)
+                            r = client.patch("/evaluate", json=body)
+                        assert r.status_code in (200, 201), r.text
+                        sent["bytes"] += len(json.dumps(body))
+
+            requests = n_companies * rounds
+            seconds = timed(_recheck)
+            with engine.connect() as connection:
+                rows = connection.execute(text("SELECT count(*) FROM evaluations")).scalar_one()
+            report(f"{mode}: re-check requests", requests, seconds)
+            print(
+                f"  {sent['bytes'] / requests:6.1f} request bytes on average,"
+                f" {rows - n_companies} evaluation rows written"
+            )
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(
+        int(args[0]) if len(args) > 0 else 1000,
+        int(args[1]) if len(args) > 1 else 5,
+        float(args[2]) if len(args) > 2 else 0.05,
+    )
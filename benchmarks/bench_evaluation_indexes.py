@@ -0,0 +1,139 @@
+"""Evaluation time-series queries before/after the composite indexes.
+
+Builds a synthetic evaluations table with the original schema (a lone
+``company_id`` index), times a few history-style queries and prints their
+query plans, then applies the index migration and runs them again.
+
+Usage: python benchmarks/bench_evaluation_indexes.py [n_evaluations] [n_companies]
+
+The request behind this used 10,000,000 rows; the default is 1,000,000 so a
+run takes about a minute. Pass 10000000 for the full-size comparison.
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+
+import _harness  # noqa: F401  (puts the repo root on sys.path)
+
+import main
+
+LEGACY_EVALUATIONS_DDL = """
+CREATE TABLE evaluations (
+    id INTEGER NOT NULL PRIMARY KEY,
+    company_id INTEGER NOT NULL,
+    score FLOAT NOT NULL,
+    badge VARCHAR NOT NULL,
+    evidence JSON NOT NULL,
+    created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL
+)
+"""
+
+START = datetime(2024, 1, 1)
+SPAN_SECONDS = 2 * 365 * 24 * 3600
+
+
+def _seed(path: str, n_evaluations: int, n_companies: int) -> None:
+    rng = random.Random(12)
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode=OFF")
+    connection.execute("PRAGMA synchronous=OFF")
+    connection.execute(LEGACY_EVALUATIONS_DDL)
+    connection.execute("CREATE INDEX ix_evaluations_company_id ON evaluations (company_id)")
+
+    def _rows(count: int):
+        for _ in range(count):
+            mask = rng.getrandbits(10)
+            stamp = START + timedelta(seconds=rng.randrange(SPAN_SECONDS))
+            yield (
+                rng.randrange(1, n_companies + 1),
+                float(main._SCORE_TABLE[mask]),
+                main._BADGE_TABLE[mask],
+                "[]",
+                stamp.strftime("%Y-%m-%d %H:%M:%S"),
+            )
+
+    chunk = 200_000
+    for offset in range(0, n_evaluations, chunk):
+        connection.executemany(
+            "INSERT INTO evaluations (company_id, score, badge, evidence, created_at)"
+            " VALUES (?, ?, ?, ?, ?)",
+            _rows(min(chunk, n_evaluations - offset)),
+        )
+        connection.commit()
+    connection.execute("ANALYZE")
+    connection.commit()
+    connection.close()
+
+
+def _queries(n_companies: int) -> dict:
+    company_ids = ", ".join(str(i) for i in range(1, min(n_companies, 100) + 1))
+    return {
+        "company history, newest 50": (
+            "SELECT id, score, created_at FROM evaluations WHERE company_id = 42"
+            " ORDER BY created_at DESC, id DESC LIMIT 50"
+        ),
+        "company in time range": (
+            "SELECT id, score, created_at FROM evaluations WHERE company_id = 42"
+            " AND created_at BETWEEN '2025-01-01' AND '2025-03-01'"
+            " ORDER BY created_at DESC"
+        ),
+        "latest per company (100 ids)": (
+            "SELECT company_id, max(created_at) FROM evaluations"
+            f" WHERE company_id IN ({company_ids}) GROUP BY company_id"
+        ),
+        "badge in one week": (
+            "SELECT count(*) FROM evaluations WHERE badge = 'excellent'"
+            " AND created_at >= '2025-06-01' AND created_at < '2025-06-08'"
+        ),
+    }
+
+
+def _measure(path: str, queries: dict, repeats: int = 5) -> None:
+    connection = sqlite3.connect(path)
+    for label, sql in queries.items():
+        plan = "; ".join(row[-1] for row in connection.execute(f"EXPLAIN QUERY PLAN {sql}"))
+        connection.execute(sql).fetchall()  # warm the page cache
+        start = time.perf_counter()
+        for _ in range(repeats):
+            connection.execute(sql).fetchall()
+        elapsed = (time.perf_counter() - start) / repeats
+        print(f"  {label:<30} {elapsed * 1000:10.2f} ms   {plan}")
+    connection.close()
+
+
+def run(n_evaluations: int = 1_000_000, n_companies: int = 10_000) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        start = time.perf_counter()
+        _seed(path, n_evaluations, n_companies)
+        print(f"seeded {n_evaluations} evaluations in {time.perf_counter() - start:.1f}s")
+        queries = _queries(n_companies)
+
+        print("before: ix_evaluations_company_id only")
+        _measure(path, queries)
+
+        engine = create_engine(f"sqlite:///{path}")
+        start = time.perf_counter()
+        with engine.begin() as connection:
+            main._migrate_evaluation_time_series_indexes(connection)
+            connection.exec_driver_sql("ANALYZE")
+        engine.dispose()
+        print(f"migration built indexes in {time.perf_counter() - start:.1f}s")
+
+        print("after: composite (company_id, created_at DESC) + (badge, created_at)")
+        _measure(path, queries)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(
+        int(args[0]) if len(args) > 0 else 1_000_000,
+        int(args[1]) if len(args) > 1 else 10_000,
+    )
@@ -0,0 +1,100 @@
+"""Disk size and read cost: JSON evidence lists vs the signal_mask column.
+
+Seeds evaluations in the old layout (evidence as a JSON list of strings),
+measures file size and the time to read every row's evidence back, then runs
+the signal-mask migration (plus VACUUM to hand the space back) and measures
+again.
+
+Usage: python benchmarks/bench_evidence_storage.py [n_evaluations]
+"""
+
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+
+import _harness  # noqa: F401  (puts the repo root on sys.path)
+
+import main
+
+
+def _seed(path: str, n_evaluations: int) -> None:
+    rng = random.Random(13)
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE evaluations (id INTEGER NOT NULL PRIMARY KEY,"
+        " company_id INTEGER NOT NULL, score FLOAT NOT NULL, badge VARCHAR NOT NULL,"
+        " evidence JSON NOT NULL,"
+        " created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL)"
+    )
+    rows = []
+    for _ in range(n_evaluations):
+        mask = rng.getrandbits(10)
+        rows.append(
+            (
+                rng.randrange(1, 10_000),
+                float(main._SCORE_TABLE[mask]),
+                main._BADGE_TABLE[mask].item(),
+                json.dumps(list(main.FINDABILITY_EVIDENCE[mask])),
+            )
+        )
+    connection.executemany(
+        "INSERT INTO evaluations (company_id, score, badge, evidence) VALUES (?, ?, ?, ?)",
+        rows,
+    )
+    connection.commit()
+    connection.close()
+
+
+def _read_json(path: str) -> float:
+    connection = sqlite3.connect(path)
+    start = time.perf_counter()
+    for (raw,) in connection.execute("SELECT evidence FROM evaluations"):
+        json.loads(raw)
+    elapsed = time.perf_counter() - start
+    connection.close()
+    return elapsed
+
+
+def _read_mask(path: str) -> float:
+    connection = sqlite3.connect(path)
+    evidence = main.FINDABILITY_EVIDENCE
+    start = time.perf_counter()
+    for (mask,) in connection.execute("SELECT signal_mask FROM evaluations"):
+        list(evidence[mask])
+    elapsed = time.perf_counter() - start
+    connection.close()
+    return elapsed
+
+
+def run(n_evaluations: int = 1_000_000) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        _seed(path, n_evaluations)
+        before_size = os.path.getsize(path)
+        before_read = _read_json(path)
+
+        engine = create_engine(f"sqlite:///{path}")
+        start = time.perf_counter()
+        with engine.begin() as connection:
+            main._migrate_evaluation_signal_mask(connection)
+        migrate_seconds = time.perf_counter() - start
+        with engine.connect() as connection:
+            connection.exec_driver_sql("VACUUM")
+        engine.dispose()
+
+        after_size = os.path.getsize(path)
+        after_read = _read_mask(path)
+
+        print(f"{n_evaluations} evaluations, migration took {migrate_seconds:.1f}s")
+        print(f"  {'JSON evidence':<16} {before_size / 2**20:8.1f} MiB  read {before_read:6.2f}s")
+        print(f"  {'signal_mask':<16} {after_size / 2**20:8.1f} MiB  read {after_read:6.2f}s")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
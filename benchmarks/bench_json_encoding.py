@@ -0,0 +1,101 @@
+"""Serialization cost of company lists: response_model paths vs orjson.
+
+First encodes N in-memory Company rows three ways:
+
+- stdlib: validate into CompanyOut, jsonable_encoder, json.dumps (how FastAPI
+  encoded responses before its Pydantic dump_json shortcut, and still does
+  with a custom response_class)
+- pydantic: TypeAdapter(List[CompanyOut]) validate + dump_json (what
+  response_model does today)
+- orjson: copy the columns into dicts and orjson.dumps them (JSON_ENCODER=orjson)
+
+Then times GET /companies?limit=1000 end to end in both JSON_ENCODER modes.
+
+Usage: python benchmarks/bench_json_encoding.py [n_companies] [repeats]
+"""
+
+import json
+import sys
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from _harness import report, temp_client, timed
+
+import main
+
+
+def _companies(n: int) -> List[main.Company]:
+    start = datetime(2025, 1, 1, 12, 0, 0, 123456)
+    return [
+        main.Company(
+            id=i,
+            name=f"Company {i}",
+            website=f"https://company{i}.example",
+            country="US",
+            state="CA",
+            city="Los Angeles",
+            industry="Home services",
+            niche="Plumbing" if i % 2 else None,
+            created_at=start + timedelta(seconds=i),
+        )
+        for i in range(1, n + 1)
+    ]
+
+
+def _encode_stdlib(rows) -> bytes:
+    models = [main.CompanyOut.model_validate(row) for row in rows]
+    return json.dumps(jsonable_encoder(models), separators=(",", ":")).encode()
+
+
+_list_adapter = TypeAdapter(List[main.CompanyOut])
+
+
+def _encode_pydantic(rows) -> bytes:
+    return _list_adapter.dump_json(_list_adapter.validate_python(rows, from_attributes=True))
+
+
+def _encode_orjson(rows) -> bytes:
+    return main.orjson.dumps([main._company_dict(row) for row in rows])
+
+
+def run(n_companies: int = 10_000, repeats: int = 20) -> None:
+    rows = _companies(n_companies)
+    assert _encode_orjson(rows) == _encode_pydantic(rows)
+    print(f"encode {n_companies} companies, best of {repeats}")
+    for label, encode in (
+        ("stdlib json (jsonable_encoder)", _encode_stdlib),
+        ("pydantic validate + dump_json", _encode_pydantic),
+        ("orjson from ORM columns", _encode_orjson),
+    ):
+        best = min(timed(lambda: encode(rows)) for _ in range(repeats))
+        report(label, n_companies, best)
+
+    requests = max(1, repeats)
+    with temp_client() as (client, _):
+        imported = client.post(
+            "/companies/import",
+            content="".join(
+                json.dumps({"name": f"Company {i}", "city": "Los Angeles"}) + "\n"
+                for i in range(1000)
+            ),
+        ).json()
+        assert imported["created"] == 1000
+        print(f"GET /companies?limit=1000 x {requests}")
+        for fast in (False, True):
+            main.FAST_JSON = fast
+            client.get("/companies?limit=1000")  # warm up
+            seconds = timed(
+                lambda: [client.get("/companies?limit=1000") for _ in range(requests)]
+            )
+            report(f"JSON_ENCODER={'orjson' if fast else 'pydantic'}", requests, seconds)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(
+        int(args[0]) if len(args) > 0 else 10_000,
+        int(args[1]) if len(args) > 1 else 20,
+    )
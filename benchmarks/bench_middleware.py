@@ -0,0 +1,124 @@
+"""Per-request cost of the middleware stack.
+
+Drives the ASGI app directly (no HTTP client in the way) and compares three
+builds of the same app:
+
+- no user middleware at all,
+- the old pair of @app.middleware("http") wrappers (version header +
+  Prometheus), recreated here as the "before" baseline,
+- the current stack with the single pure-ASGI RequestInstrumentationMiddleware.
+
+Usage: python benchmarks/bench_middleware.py [n_requests]
+"""
+
+import asyncio
+import sys
+import time
+
+from fastapi.middleware.cors import CORSMiddleware
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from _harness import temp_client
+
+import main
+
+
+async def _legacy_version_header(request, call_next):
+    response = await call_next(request)
+    response.headers["x-app-version"] = main.__version__
+    return response
+
+
+async def _legacy_instrument(request, call_next):
+    start_time = time.perf_counter()
+    response = await call_next(request)
+    elapsed = time.perf_counter() - start_time
+    path = main._route_label(request.scope)
+    main.REQUEST_LATENCY.labels(method=request.method, path=path).observe(elapsed)
+    main.REQUEST_COUNT.labels(
+        method=request.method, path=path, status_code=str(response.status_code)
+    ).inc()
+    return response
+
+
+def _cors() -> Middleware:
+    return Middleware(
+        CORSMiddleware,
+        allow_origins=main.allowed_origins,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+
+def _build_stack(user_middleware):
+    saved = main.app.user_middleware
+    main.app.user_middleware = user_middleware
+    try:
+        return main.app.build_middleware_stack()
+    finally:
+        main.app.user_middleware = saved
+
+
+def _scope(path: str) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+        "app": main.app,
+    }
+
+
+async def _drive(asgi_app, path: str, n_requests: int) -> float:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        return None
+
+    # Warm up so lazy stack building and first-hit costs don't count
+    for _ in range(50):
+        await asgi_app(_scope(path), receive, send)
+
+    start = time.perf_counter()
+    for _ in range(n_requests):
+        await asgi_app(_scope(path), receive, send)
+    return time.perf_counter() - start
+
+
+def run(n_requests: int = 5000) -> None:
+    with temp_client() as (client, _engine):
+        cid = client.post("/companies", json={"name": "Bench Co"}).json()["id"]
+        stacks = {
+            "no middleware": _build_stack([]),
+            "before: 2x BaseHTTPMiddleware": _build_stack(
+                [
+                    # Outermost first, matching the old decorator order
+                    Middleware(BaseHTTPMiddleware, dispatch=_legacy_instrument),
+                    Middleware(BaseHTTPMiddleware, dispatch=_legacy_version_header),
+                    _cors(),
+                ]
+            ),
+            "after: pure ASGI": main.app.build_middleware_stack(),
+        }
+        for path in ("/health", f"/companies/{cid}"):
+            print(path)
+            for label, stack in stacks.items():
+                seconds = asyncio.run(_drive(stack, path, n_requests))
+                print(
+                    f"  {label:<32} {n_requests / seconds:10.1f} req/s"
+                    f"  {seconds / n_requests * 1e6:8.1f} us/req"
+                )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
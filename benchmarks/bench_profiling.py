@@ -0,0 +1,70 @@
+"""What request profiling costs, and what it reports for /evaluate.
+
+Times N POST /evaluate requests (each a new row) with profiling off, with
+PROFILE_SPANS on, and with spans plus stack sampling of every request, then
+prints the mean of each span from the Prometheus histograms.
+
+Usage: python benchmarks/bench_profiling.py [n_requests]
+"""
+
+import sys
+import tempfile
+
+from prometheus_client import REGISTRY
+
+from _harness import report, temp_client, timed
+
+import main
+
+SPANS = ("validation", "db_query", "db_commit", "scoring", "encoding")
+
+
+def _bodies(company_id: int, n: int) -> list:
+    fields = list(main.SIGNAL_FIELDS.values())
+    return [
+        {"company_id": company_id, **{f: bool(i >> bit & 1) for bit, f in enumerate(fields)}}
+        for i in range(n)
+    ]
+
+
+def _span_totals() -> dict:
+    labels = {"method": "POST", "path": "/evaluate"}
+    return {
+        span: (
+            REGISTRY.get_sample_value("api_request_span_seconds_sum", {**labels, "span": span}) or 0.0,
+            REGISTRY.get_sample_value("api_request_span_seconds_count", {**labels, "span": span}) or 0.0,
+        )
+        for span in SPANS
+    }
+
+
+def run(n_requests: int = 1000) -> None:
+    main.evaluation_dedupe.window_seconds = 0
+    modes = (
+        ("profiling off", False, 0),
+        ("PROFILE_SPANS=1", True, 0),
+        ("spans + PROFILE_SAMPLE_PERCENT=100", True, 100),
+    )
+    with tempfile.TemporaryDirectory() as profile_dir:
+        main.PROFILE_DIR = profile_dir
+        for label, spans, sample_percent in modes:
+            if spans:
+                main.enable_profile_spans()
+            main.PROFILE_SAMPLE_PERCENT = sample_percent
+            with temp_client() as (client, _):
+                cid = client.post("/companies", json={"name": "Profiled Co"}).json()["id"]
+                bodies = _bodies(cid, n_requests)
+                before = _span_totals()
+                seconds = timed(lambda: [client.post("/evaluate", json=b) for b in bodies])
+                report(label, n_requests, seconds)
+                if spans and not sample_percent:
+                    after = _span_totals()
+                    for span in SPANS:
+                        total = after[span][0] - before[span][0]
+                        count = after[span][1] - before[span][1]
+                        if count:
+                            print(f"  {span:<12} {total / count * 1e6:8.1f} us/request")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,77 @@
+"""Background re-score job throughput at a few chunk sizes.
+
+Seeds N companies with one evaluation each in a throwaway SQLite file
+(tuned profile), then runs a full /jobs/rescore job on the calling thread
+per chunk size and reports companies re-scored per second. Each run writes
+N more evaluation rows, like a real re-score would.
+
+Usage: python benchmarks/bench_rescore_job.py [n_companies] [chunk sizes ...]
+"""
+
+import os
+import random
+import sys
+import tempfile
+
+from sqlalchemy.orm import sessionmaker
+
+from _harness import report, timed
+
+import main
+
+
+def _seed(session_factory, n_companies: int) -> None:
+    rng = random.Random(22)
+    with session_factory() as db:
+        db.execute(
+            main.insert(main.Company),
+            [
+                {"name": f"Rescore Co {i}", "name_key": f"rescore co {i}"}
+                for i in range(n_companies)
+            ],
+        )
+        db.commit()
+        masks = [rng.getrandbits(10) for _ in range(n_companies)]
+        result = main.compute_findability_batch(main.np.array(masks, dtype=main.np.uint16))
+        rows = [
+            {"company_id": i + 1, "score": score, "badge": main.BADGES[badge], "signal_mask": mask}
+            for i, (mask, score, badge) in enumerate(
+                zip(masks, result.score.tolist(), result.badge.tolist())
+            )
+        ]
+        for offset in range(0, n_companies, 10_000):
+            main._insert_evaluations(db, rows[offset : offset + 10_000])
+
+
+def run(n_companies: int = 100_000, chunk_sizes=(100, 1000, 5000)) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = main.create_storage_engine(
+            f"sqlite:///{os.path.join(tmp, 'bench.db')}", profile="tuned"
+        )
+        with engine.begin() as connection:
+            main.migrate(connection)
+        session_factory = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+        seconds = timed(lambda: _seed(session_factory, n_companies))
+        report("seed companies + evaluations", n_companies, seconds)
+
+        for chunk_size in chunk_sizes:
+            runner = main.JobRunner(
+                session_factory, workers=1, chunk_size=chunk_size, poll_seconds=1, stale_seconds=60
+            )
+            with session_factory() as db:
+                job, _ = main._create_rescore_job(db)
+                job_id = job.id
+            seconds = timed(runner.run_pending)
+            with session_factory() as db:
+                job = main._job_out(db.get(main.Job, job_id))
+            assert job.status == "done" and job.processed == n_companies, job
+            report(f"rescore job, chunk={chunk_size}", n_companies, seconds)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(
+        int(args[0]) if args else 100_000,
+        tuple(int(a) for a in args[1:]) or (100, 1000, 5000),
+    )
@@ -0,0 +1,42 @@
+"""Scoring cost: readable rules vs compiled scoring-model lookups.
+
+Compiles a scoring model (1024 reference evaluations), then scores the same
+random masks with the readable rules, the scalar lookup
+(compute_findability) and the vectorized one (compute_findability_batch).
+
+Usage: python benchmarks/bench_scoring.py [n_rows]
+"""
+
+import sys
+
+import numpy as np
+
+from _harness import report, timed
+
+import main
+
+
+def run(n_rows: int = 1_000_000) -> None:
+    rng = np.random.default_rng(42)
+    masks = rng.integers(0, main.SIGNAL_MASK_ALL + 1, size=n_rows, dtype=np.uint16)
+
+    spec = main.ScoringModelSpec(version="bench", signal_weights={"contact page": 2.0})
+    compile_s = min(timed(lambda: main.compile_scoring_model(spec)) for _ in range(5))
+    report("compile_scoring_model (1024 outcomes)", 1, compile_s)
+
+    scalar_rows = min(n_rows, 100_000)
+    signal_dicts = [main.mask_to_signals(int(m)) for m in masks[:scalar_rows]]
+
+    reference_s = timed(
+        lambda: [main._compute_findability_reference(s, spec) for s in signal_dicts]
+    )
+    scalar_s = timed(lambda: [main.compute_findability(s) for s in signal_dicts])
+    batch_s = timed(lambda: main.compute_findability_batch(masks))
+
+    report("readable rules (reference)", scalar_rows, reference_s)
+    report("compute_findability (scalar lookup)", scalar_rows, scalar_s)
+    report("compute_findability_batch (uint16)", n_rows, batch_s)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
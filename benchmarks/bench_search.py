@@ -0,0 +1,67 @@
+"""Name search latency as the companies table grows: FTS5 trigram vs LIKE scan.
+
+Usage: python benchmarks/bench_search.py [max_rows]
+"""
+
+import random
+import string
+import sys
+import time
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from _harness import temp_client
+
+import main
+
+
+def _random_word(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))).title()
+
+
+def _random_name(rng: random.Random) -> str:
+    return f"{_random_word(rng)} {_random_word(rng)} Co"
+
+
+def _time_query(session: Session, statement, repeats: int = 20) -> float:
+    session.scalars(statement).all()  # warm the page cache
+    start = time.perf_counter()
+    for _ in range(repeats):
+        session.scalars(statement).all()
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def run(max_rows: int = 1_000_000) -> None:
+    rng = random.Random(7)
+    sizes = [n for n in (10_000, 100_000, 1_000_000, 10_000_000) if n <= max_rows]
+    with temp_client() as (_client, engine):
+        with Session(bind=engine) as session:
+            loaded = 0
+            for size in sizes:
+                while loaded < size:
+                    chunk = min(50_000, size - loaded)
+                    session.execute(
+                        insert(main.Company),
+                        [{"name": _random_name(rng), "city": "Springfield"} for _ in range(chunk)],
+                    )
+                    loaded += chunk
+                session.execute(insert(main.Company), [{"name": "Needle Haystack Co"}])
+                session.commit()
+
+                fts, _rank = main._search_companies(select(main.Company), "needle hay", engine)
+                fts = fts.order_by(main.Company.id).limit(100)
+                like = (
+                    select(main.Company)
+                    .where(func.lower(main.Company.name).like("%needle hay%"))
+                    .order_by(main.Company.id)
+                    .limit(100)
+                )
+                print(
+                    f"{size:>10} rows   fts5 {_time_query(session, fts):8.3f} ms"
+                    f"   like scan {_time_query(session, like, repeats=3):8.3f} ms"
+                )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
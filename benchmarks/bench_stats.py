@@ -0,0 +1,118 @@
+"""GET /stats latency over a large company table, cold and cached.
+
+Seeds N companies spread over countries/states/industries, each with a
+rollup row (what /evaluate keeps up to date), then times the SQL behind
+/stats for a few group-by/filter combos and the cached path through the app.
+
+Usage: python benchmarks/bench_stats.py [n_companies]
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+import _harness  # noqa: F401  (puts the repo root on sys.path)
+
+import main
+
+COUNTRIES = ["US", "CA", "GB", "AU", "DE", "FR", "IN", "BR", "MX", "NZ"]
+INDUSTRIES = ["dental", "legal", "plumbing", "roofing", "fitness", "salon", "auto", "cafe"]
+
+QUERIES = {
+    "no grouping": ([], {}),
+    "by country": (["country"], {}),
+    "by country, industry": (["country", "industry"], {}),
+    "US by state": (["state"], {"country": "US"}),
+    "US dental by city": (["city"], {"country": "US", "industry": "dental"}),
+}
+
+
+def _seed(path: str, n_companies: int) -> None:
+    rng = random.Random(14)
+    engine = main.create_storage_engine(f"sqlite:///{path}", profile="tuned")
+    with engine.begin() as connection:
+        main.migrate(connection)
+    engine.dispose()
+
+    connection = sqlite3.connect(path)
+    companies = []
+    summaries = []
+    for cid in range(1, n_companies + 1):
+        country = rng.choice(COUNTRIES)
+        state = f"{country}-{rng.randrange(20)}"
+        mask = rng.getrandbits(10)
+        companies.append(
+            (
+                cid,
+                f"Company {cid}",
+                f"company {cid}",
+                country,
+                state,
+                f"{state}-city-{rng.randrange(50)}",
+                rng.choice(INDUSTRIES),
+            )
+        )
+        score = float(main._SCORE_TABLE[mask])
+        badge = main.BADGES[main._BADGE_TABLE[mask]]
+        summaries.append((cid, 1, score, score, score, cid, score, badge, "2026-01-01 00:00:00"))
+    connection.executemany(
+        "INSERT INTO companies (id, name, name_key, country, state, city, industry)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?)",
+        companies,
+    )
+    connection.executemany(
+        "INSERT INTO evaluation_summaries (company_id, evaluation_count, score_sum,"
+        " score_min, score_max, latest_evaluation_id, latest_score, latest_badge,"
+        " latest_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        summaries,
+    )
+    connection.commit()
+    connection.execute("ANALYZE")
+    connection.close()
+
+
+def run(n_companies: int = 1_000_000) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        start = time.perf_counter()
+        _seed(path, n_companies)
+        print(f"seeded {n_companies} companies in {time.perf_counter() - start:.1f}s")
+
+        engine = main.create_storage_engine(f"sqlite:///{path}", profile="tuned")
+        print(f"{'query':<24} {'segments':>9} {'cold SQL':>10}")
+        for label, (group_by, filters) in QUERIES.items():
+            with Session(bind=engine) as session:
+                main._compute_stats(session, group_by, filters, 10)  # warm page cache
+                start = time.perf_counter()
+                stats = main._compute_stats(session, group_by, filters, 10)
+                elapsed = time.perf_counter() - start
+            print(f"{label:<24} {len(stats.segments):>9} {elapsed * 1000:8.1f}ms")
+
+        def _get_db():
+            with Session(bind=engine) as session:
+                yield session
+
+        main.app.dependency_overrides[main.get_read_session] = _get_db
+        try:
+            with TestClient(main.app) as client:
+                params = {"group_by": ["country", "industry"]}
+                client.get("/stats", params=params)
+                n_requests = 500
+                start = time.perf_counter()
+                for _ in range(n_requests):
+                    client.get("/stats", params=params)
+                elapsed = time.perf_counter() - start
+        finally:
+            main.app.dependency_overrides.clear()
+            engine.dispose()
+        print(f"cached GET /stats        {elapsed / n_requests * 1000:8.2f}ms per request")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
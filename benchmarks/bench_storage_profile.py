@@ -0,0 +1,122 @@
+"""Mixed read/write throughput for the "basic" vs "tuned" storage profiles.
+
+Reader threads page through companies on the read-only pool while writer
+threads insert evaluations one commit at a time, like concurrent /evaluate
+calls would.
+
+Usage: python benchmarks/bench_storage_profile.py [seconds] [readers] [writers]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+import _harness  # noqa: F401  (puts the repo root on sys.path)
+
+import main
+
+
+def _seed(engine, n_companies: int = 5000) -> None:
+    main.Base.metadata.create_all(bind=engine)
+    with Session(bind=engine) as session:
+        session.execute(
+            insert(main.Company),
+            [{"name": f"Seed Co {i}"} for i in range(n_companies)],
+        )
+        session.commit()
+
+
+def _run_profile(profile: str, seconds: float, readers: int, writers: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        writer_engine = main.create_storage_engine(url, profile=profile)
+        reader_engine = main.create_storage_engine(
+            url,
+            profile=profile,
+            read_only=True,
+            pool_size=readers,
+            max_overflow=0,
+        )
+        _seed(writer_engine)
+
+        counts = {"reads": 0, "writes": 0, "busy_errors": 0}
+        lock = threading.Lock()
+        stop = threading.Event()
+
+        def _reader() -> None:
+            done = 0
+            after_id = 0
+            while not stop.is_set():
+                with Session(bind=reader_engine) as session:
+                    rows = session.scalars(
+                        select(main.Company)
+                        .where(main.Company.id > after_id)
+                        .order_by(main.Company.id)
+                        .limit(100)
+                    ).all()
+                after_id = rows[-1].id if rows else 0
+                done += 1
+            with lock:
+                counts["reads"] += done
+
+        def _writer(worker: int) -> None:
+            done = busy = 0
+            while not stop.is_set():
+                try:
+                    with Session(bind=writer_engine) as session:
+                        session.execute(
+                            insert(main.Evaluation),
+                            [
+                                {
+                                    "company_id": 1 + (done + worker) % 5000,
+                                    "score": 0.5,
+                                    "badge": "fair",
+                                    "signal_mask": 1,
+                                }
+                            ],
+                        )
+                        session.commit()
+                    done += 1
+                except OperationalError:
+                    busy += 1  # "database is locked" under the basic profile
+            with lock:
+                counts["writes"] += done
+                counts["busy_errors"] += busy
+
+        threads = [threading.Thread(target=_reader) for _ in range(readers)]
+        threads += [threading.Thread(target=_writer, args=(i,)) for i in range(writers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        writer_engine.dispose()
+        reader_engine.dispose()
+        return counts
+
+
+def run(seconds: float = 5.0, readers: int = 8, writers: int = 2) -> None:
+    for profile in ("basic", "tuned"):
+        counts = _run_profile(profile, seconds, readers, writers)
+        print(
+            f"{profile:<6} reads {counts['reads'] / seconds:10.1f}/s"
+            f"   writes {counts['writes'] / seconds:9.1f}/s"
+            f"   lock errors {counts['busy_errors']}"
+        )
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(
+        float(args[0]) if len(args) > 0 else 5.0,
+        int(args[1]) if len(args) > 1 else 8,
+        int(args[2]) if len(args) > 2 else 2,
+    )
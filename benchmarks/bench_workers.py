@@ -0,0 +1,147 @@
+"""Real HTTP throughput with 1, 2 and 4 uvicorn workers under serve.py.
+
+Unlike the other benchmarks this one doesn't run the app in-process: it
+starts ``serve.py`` as a subprocess per worker count against a throwaway
+SQLite file, drives it over localhost with a mix of reads (GET
+/companies/{id}, GET /companies) and writes (POST /evaluate), and reports
+req/s and p99 latency. Afterwards it checks that ``/metrics`` counted every
+request, whichever worker served it.
+
+Usage: python benchmarks/bench_workers.py [n_requests] [concurrency] [workers ...]
+
+Extra workers only pay off with spare cores; on a single-CPU box expect
+roughly flat numbers.
+"""
+
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+from prometheus_client.parser import text_string_to_metric_families
+
+import _harness  # noqa: F401  (puts the repo root on sys.path)
+
+import main
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PORT = 8765
+BASE_URL = f"http://127.0.0.1:{PORT}"
+
+
+def _body(company_id: int, i: int) -> dict:
+    body = {"company_id": company_id}
+    fields = [f for f in main.EvaluateIn.model_fields if f != "company_id"]
+    for bit, field in enumerate(fields):
+        body[field] = bool(i >> bit & 1)
+    return body
+
+
+def _start_server(workers: int, tmp: str) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        WEB_CONCURRENCY=str(workers),
+        PORT=str(PORT),
+        HOST="127.0.0.1",
+        DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+        PROMETHEUS_MULTIPROC_DIR=os.path.join(tmp, "metrics"),
+        EVALUATE_DEDUPE_WINDOW_SECONDS="0",
+    )
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(REPO_ROOT, "serve.py")],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{BASE_URL}/health").status_code == 200:
+                return server
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("serve.py did not come up within 30s")
+
+
+# What _drive sends; setup and scrape requests are left out of the tally
+DRIVEN = {("POST", "/evaluate"), ("GET", "/companies"), ("GET", "/companies/{id}")}
+
+
+def _request_count(client: httpx.Client) -> float:
+    text = client.get("/metrics").text
+    return sum(
+        sample.value
+        for family in text_string_to_metric_families(text)
+        if family.name == "api_request_count"
+        for sample in family.samples
+        if sample.name == "api_request_count_total"
+        and (sample.labels["method"], sample.labels["path"]) in DRIVEN
+    )
+
+
+async def _drive(company_ids, n_requests: int, concurrency: int) -> list:
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=BASE_URL, limits=limits) as client:
+
+        async def _one(i: int) -> None:
+            company_id = company_ids[i % len(company_ids)]
+            async with semaphore:
+                start = time.perf_counter()
+                if i % 4 == 0:  # one write in four
+                    r = await client.post("/evaluate", json=_body(company_id, i % 1024))
+                elif i % 4 == 1:
+                    r = await client.get("/companies", params={"limit": 20})
+                else:
+                    r = await client.get(f"/companies/{company_id}")
+                latencies.append(time.perf_counter() - start)
+            assert r.status_code in (200, 201), r.text
+
+        await asyncio.gather(*(_one(i) for i in range(n_requests)))
+    return latencies
+
+
+def run(n_requests: int = 4000, concurrency: int = 32, worker_counts=(1, 2, 4)) -> None:
+    print(f"{os.cpu_count()} CPUs, {n_requests} requests, concurrency {concurrency}")
+    for workers in worker_counts:
+        with tempfile.TemporaryDirectory() as tmp:
+            server = _start_server(workers, tmp)
+            try:
+                with httpx.Client(base_url=BASE_URL) as client:
+                    company_ids = [
+                        client.post("/companies", json={"name": f"Worker Co {i}"}).json()["id"]
+                        for i in range(50)
+                    ]
+                    before = _request_count(client)
+
+                start = time.perf_counter()
+                latencies = asyncio.run(_drive(company_ids, n_requests, concurrency))
+                elapsed = time.perf_counter() - start
+
+                with httpx.Client(base_url=BASE_URL) as client:
+                    counted = _request_count(client) - before
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+
+        p99 = statistics.quantiles(latencies, n=100)[98]
+        print(
+            f"workers={workers}  {n_requests / elapsed:9.1f} req/s"
+            f"  p50 {statistics.median(latencies) * 1000:7.2f} ms  p99 {p99 * 1000:7.2f} ms"
+            f"  /metrics counted {counted:.0f}/{n_requests}"
+        )
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(
+        int(args[0]) if len(args) > 0 else 4000,
+        int(args[1]) if len(args) > 1 else 32,
+        tuple(int(a) for a in args[2:]) or (1, 2, 4),
+    )
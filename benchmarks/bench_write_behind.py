@@ -0,0 +1,100 @@
+"""Bursty /evaluate traffic: sync commits vs the write-behind queue.
+
+Fires concurrent /evaluate requests at the app in-process and reports
+throughput plus p50/p99 latency for each mode, then how the write-behind
+rows were grouped into commits.
+
+Usage: python benchmarks/bench_write_behind.py [n_requests] [concurrency]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+
+import httpx
+from prometheus_client import REGISTRY
+from sqlalchemy.orm import sessionmaker
+
+from _harness import temp_client
+
+import main
+
+
+def _body(company_id: int, i: int) -> dict:
+    body = {"company_id": company_id}
+    fields = [f for f in main.EvaluateIn.model_fields if f != "company_id"]
+    for bit, field in enumerate(fields):
+        body[field] = bool(i >> bit & 1)
+    return body
+
+
+async def _burst(company_ids, n_requests: int, concurrency: int) -> list:
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def _one(i: int) -> None:
+            # Distinct (company, signals) per request so dedupe never kicks in
+            body = _body(company_ids[i // 1024 % len(company_ids)], i % 1024)
+            async with semaphore:
+                start = time.perf_counter()
+                r = await client.post("/evaluate", json=body)
+                latencies.append(time.perf_counter() - start)
+            assert r.status_code in (201, 202), r.text
+
+        await asyncio.gather(*(_one(i) for i in range(n_requests)))
+    return latencies
+
+
+def run(n_requests: int = 3000, concurrency: int = 32) -> None:
+    main.evaluation_dedupe.window_seconds = 0
+    for mode in ("sync", "write_behind"):
+        with temp_client() as (client, engine):
+            company_ids = [
+                client.post("/companies", json={"name": f"Burst Co {i}"}).json()["id"]
+                for i in range(max(1, n_requests // 1024 + 1))
+            ]
+            writer = None
+            if mode == "write_behind":
+                writer = main.EvaluationWriter(
+                    sessionmaker(bind=engine),
+                    main.EVALUATE_QUEUE_MAX,
+                    main.EVALUATE_FLUSH_MS,
+                    main.EVALUATE_FLUSH_ROWS,
+                )
+                main.evaluation_writer = writer
+                writer.start()
+            batches_before = REGISTRY.get_sample_value("evaluation_commit_batch_size_count") or 0
+
+            start = time.perf_counter()
+            latencies = sorted(asyncio.run(_burst(company_ids, n_requests, concurrency)))
+            elapsed = time.perf_counter() - start
+            if writer is not None:
+                writer.stop()
+                drained = time.perf_counter() - start
+
+            p50 = statistics.median(latencies) * 1000
+            p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+            print(
+                f"{mode:<13} {n_requests / elapsed:9.1f} req/s"
+                f"   p50 {p50:7.2f}ms   p99 {p99:7.2f}ms"
+            )
+            if writer is not None:
+                batches = (
+                    REGISTRY.get_sample_value("evaluation_commit_batch_size_count")
+                    - batches_before
+                )
+                print(
+                    f"{'':<13} {batches:.0f} group commits"
+                    f" (avg {n_requests / batches:.1f} rows), all durable after {drained:.2f}s"
+                )
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(
+        int(args[0]) if len(args) > 0 else 3000,
+        int(args[1]) if len(args) > 1 else 32,
+    )
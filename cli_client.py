@@ -55,20 +55,6 @@ def find_or_create_company() -> int:
     industry = prompt("Industry (optional): ") or None
     niche = prompt("Niche (optional): ") or None
 
-    # Try to reuse an existing company by case-insensitive name
-    try:
-        r = requests.get(f"{API}/companies")
-        r.raise_for_status()
-        existing = r.json()
-    except Exception as exc:
-        print(f"Couldn't list companies: {exc}", file=sys.stderr)
-        sys.exit(1)
-
-    for c in existing:
-        if c["name"].strip().lower() == name.strip().lower():
-            print(f"Reusing company id {c['id']} ({c['name']}).")
-            return c["id"]
-
     payload: Dict[str, str] = {"name": name}
     if website:
         payload["website"] = website
@@ -83,19 +69,25 @@ def find_or_create_company() -> int:
     if niche:
         payload["niche"] = niche
 
+    # One small request: the API reuses a company with the same name
+    # (case-insensitive) or creates it
     try:
-        r = requests.post(f"{API}/companies", json=payload)
+        r = requests.post(f"{API}/companies/get-or-create", json=payload)
         r.raise_for_status()
-        company_id = r.json()["id"]
-        print(f"Created company with id {company_id}.")
-        return company_id
+        company = r.json()
     except requests.HTTPError as http_err:
         print(f"API said no: {http_err.response.text}", file=sys.stderr)
         sys.exit(1)
     except Exception as exc:
-        print(f"Couldn't create company: {exc}", file=sys.stderr)
+        print(f"Couldn't find or create company: {exc}", file=sys.stderr)
         sys.exit(1)
 
+    if r.status_code == 201:
+        print(f"Created company with id {company['id']}.")
+    else:
+        print(f"Reusing company id {company['id']} ({company['name']}).")
+    return company["id"]
+
 
 def collect_signals() -> Dict[str, bool]:
     print("Now let's capture a few quick signals — just y/n.")
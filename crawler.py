@@ -0,0 +1,677 @@
+"""Fetch a company's website and work out the ten findability signals.
+
+The one corner of the app that touches the network. A Crawler owns an httpx
+connection pool shared by every crawl, caps how many requests hit any one
+host at once, times out slow servers, and caches responses for a few
+minutes (concurrent fetches of the same URL share one request). Websites
+are user input, so every connection (redirects included) goes only to
+public addresses: loopback, private, link-local (cloud metadata) and other
+reserved ranges are refused before connecting.
+
+A crawl fetches the homepage, then up to a handful of same-site pages it
+links to (contact, services, about, booking, reviews), and derives:
+
+- contact page: a linked contact page that answers 2xx
+- clear services page: same, for a services / what-we-do page
+- maps/GMB listing: a Google Maps / Business link or embed, or schema.org hasMap
+- recent updates: a modified/published date (Last-Modified, article meta,
+  <time>, JSON-LD) within the last CRAWL_RECENT_DAYS
+- reviews/testimonials: review/testimonial wording or schema.org ratings
+- online booking/form: a non-search form, or a booking link
+- basic schema markup: JSON-LD or microdata from schema.org
+- NAP consistent: the name shows up, every phone number found is the same
+  one, and the city (when we know it) is mentioned
+- loads fast: the homepage arrived within CRAWL_FAST_LOAD_SECONDS
+- content matches intent: a niche (or industry) word in the title,
+  description or headings
+
+Usage: python crawler.py https://example.com [...]   (prints the signals)
+"""
+
+import asyncio
+import ipaddress
+import json
+import os
+import re
+import socket
+import sys
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from html.parser import HTMLParser
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+import httpcore
+import httpx
+from prometheus_client import Counter
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, default))
+
+
+# Deadline for a whole fetch, redirects and body included. httpx's own
+# timeouts only bound each socket operation (a server dripping a byte at a
+# time never trips them), so this is enforced around the fetch as well.
+# Connecting gets a shorter leash.
+CRAWL_TIMEOUT_SECONDS = _env_float("CRAWL_TIMEOUT_SECONDS", 10)
+CRAWL_CONNECT_TIMEOUT_SECONDS = _env_float("CRAWL_CONNECT_TIMEOUT_SECONDS", 5)
+# Connections across all hosts, and requests in flight to any single host
+CRAWL_MAX_CONNECTIONS = int(_env_float("CRAWL_MAX_CONNECTIONS", 50))
+CRAWL_PER_HOST = int(_env_float("CRAWL_PER_HOST", 2))
+# Pages per crawl, homepage included
+CRAWL_MAX_PAGES = int(_env_float("CRAWL_MAX_PAGES", 6))
+# Bodies past this are cut off; plenty for the markup we look at
+CRAWL_MAX_BYTES = int(_env_float("CRAWL_MAX_BYTES", 2 * 1024 * 1024))
+CRAWL_MAX_REDIRECTS = int(_env_float("CRAWL_MAX_REDIRECTS", 5))
+CRAWL_CACHE_TTL_SECONDS = _env_float("CRAWL_CACHE_TTL_SECONDS", 300)
+CRAWL_CACHE_MAX_ENTRIES = int(_env_float("CRAWL_CACHE_MAX_ENTRIES", 1024))
+CRAWL_FAST_LOAD_SECONDS = _env_float("CRAWL_FAST_LOAD_SECONDS", 2.5)
+CRAWL_RECENT_DAYS = int(_env_float("CRAWL_RECENT_DAYS", 365))
+CRAWL_USER_AGENT = "gpt-findability-crawler/1.0"
+
+CRAWL_FETCHES = Counter(
+    "crawl_fetches", "Crawler page fetches by where the answer came from", ["result"]
+)
+
+# Same names (and order) as main.SIGNALS, so results drop straight into scoring
+CONTACT = "contact page"
+SERVICES = "clear services page"
+MAPS = "maps/GMB listing"
+RECENT = "recent updates"
+REVIEWS = "reviews/testimonials"
+BOOKING = "online booking/form"
+SCHEMA = "basic schema markup"
+NAP = "NAP consistent"
+FAST = "loads fast"
+INTENT = "content matches intent"
+SIGNAL_NAMES: Tuple[str, ...] = (
+    CONTACT, SERVICES, MAPS, RECENT, REVIEWS, BOOKING, SCHEMA, NAP, FAST, INTENT
+)
+
+# Which linked pages are worth a fetch, most useful first
+PAGE_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "contact": ("contact", "get in touch", "reach us"),
+    "services": ("service", "what we do", "what-we-do", "solutions", "treatments"),
+    "booking": ("book", "appointment", "schedule", "reserve"),
+    "reviews": ("review", "testimonial"),
+    "about": ("about",),
+}
+MAPS_HOSTS = (
+    "google.com/maps",
+    "maps.google.",
+    "goo.gl/maps",
+    "maps.app.goo.gl",
+    "g.page",
+    "business.google.com",
+)
+BOOKING_HOSTS = (
+    "calendly.com",
+    "acuityscheduling.com",
+    "setmore.com",
+    "booksy.com",
+    "squareup.com/appointments",
+    "opentable.com",
+)
+REVIEW_RE = re.compile(r"\b(reviews?|testimonials?|what our (clients|customers) say)\b", re.I)
+PHONE_RE = re.compile(r"(?<!\d)(?:\+?1[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}(?!\d)")
+DATE_META = ("article:modified_time", "article:published_time", "og:updated_time", "last-modified")
+
+
+class CrawlError(Exception):
+    """The site couldn't be crawled at all (homepage unreachable or an error status)."""
+
+
+class BadWebsiteError(CrawlError):
+    """The website isn't an http(s) URL with a host, so there's nothing to fetch."""
+
+
+class BlockedAddressError(httpcore.ConnectError):
+    """The host resolved to an address crawls mustn't reach."""
+
+
+def _is_public(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split("%")[0])  # drop an IPv6 zone id
+    if ip.version == 6 and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped  # ::ffff:127.0.0.1 is still loopback
+    return ip.is_global and not ip.is_multicast
+
+
+class _PublicOnlyBackend(httpcore.AsyncNetworkBackend):
+    """Resolve, refuse non-public addresses, then connect to the address checked.
+
+    Sits under the connection pool, so it sees every new connection, redirect
+    hops included. Connecting to the checked address (rather than handing the
+    name back to the resolver) leaves no window for DNS rebinding; TLS still
+    verifies against the host name.
+    """
+
+    def __init__(self) -> None:
+        self._backend = httpcore.AnyIOBackend()
+
+    async def connect_tcp(
+        self, host: str, port: int, timeout=None, local_address=None, socket_options=None
+    ) -> httpcore.AsyncNetworkStream:
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(
+                host, port, type=socket.SOCK_STREAM
+            )
+        except OSError as exc:
+            raise httpcore.ConnectError(f"can't resolve {host}: {exc}") from exc
+        addresses = [info[4][0] for info in infos]
+        # Any private answer taints the name: which one we'd get is up to DNS
+        blocked = next((a for a in addresses if not _is_public(a)), None)
+        if blocked is not None:
+            raise BlockedAddressError(f"{host} resolves to non-public address {blocked}")
+        return await self._backend.connect_tcp(
+            addresses[0],
+            port,
+            timeout=timeout,
+            local_address=local_address,
+            socket_options=socket_options,
+        )
+
+    async def connect_unix_socket(self, *args, **kwargs) -> httpcore.AsyncNetworkStream:
+        raise BlockedAddressError("unix sockets aren't crawled")
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+def _public_only_transport(limits: httpx.Limits) -> httpx.AsyncHTTPTransport:
+    # trust_env=False: a proxy from the environment would be the only address
+    # ever checked, and it's usually a private one
+    transport = httpx.AsyncHTTPTransport(limits=limits, trust_env=False)
+    # httpx has no public hook for the network backend, so rebuild its pool
+    # with the same settings plus ours
+    transport._pool = httpcore.AsyncConnectionPool(
+        ssl_context=httpx.create_ssl_context(trust_env=False),
+        max_connections=limits.max_connections,
+        max_keepalive_connections=limits.max_keepalive_connections,
+        keepalive_expiry=limits.keepalive_expiry,
+        network_backend=_PublicOnlyBackend(),
+    )
+    return transport
+
+
+class Page(NamedTuple):
+    url: str  # after redirects
+    status: int
+    headers: Dict[str, str]
+    text: str
+    seconds: float  # request start to last byte
+
+
+class CrawledPage(NamedTuple):
+    kind: str  # home, contact, services, ...
+    url: str
+    status: int
+    seconds: float
+
+
+class CrawlReport(NamedTuple):
+    url: str
+    signals: Dict[str, bool]
+    pages: List[CrawledPage]
+    load_seconds: float
+
+
+class _PageParser(HTMLParser):
+    """Collect just the bits of a page the signals look at."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.links: List[Tuple[str, str]] = []  # (href, anchor text)
+        self.embeds: List[str] = []  # iframe srcs
+        self.meta: Dict[str, str] = {}
+        self.dates: List[str] = []
+        self.json_ld: List[str] = []
+        self.microdata = False
+        self.forms = 0
+        self.title = ""
+        self.headings: List[str] = []
+        self.text: List[str] = []
+        self._open: List[str] = []  # title/h1/h2/h3/script(ld)/a we're inside
+        self._href: Optional[str] = None
+        self._anchor: List[str] = []
+        self._form: Optional[dict] = None
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        attr = {name: (value or "") for name, value in attrs}
+        if "schema.org" in attr.get("itemtype", ""):
+            self.microdata = True
+        if tag == "a":
+            self._href, self._anchor = attr.get("href", ""), []
+        elif tag == "iframe":
+            self.embeds.append(attr.get("src", ""))
+        elif tag == "meta":
+            key = (attr.get("property") or attr.get("name") or attr.get("http-equiv") or "").lower()
+            if key:
+                self.meta[key] = attr.get("content", "")
+        elif tag == "time" and attr.get("datetime"):
+            self.dates.append(attr["datetime"])
+        elif tag == "form":
+            searchy = attr.get("role") == "search" or "search" in attr.get("action", "").lower()
+            self._form = {"search": searchy, "fields": 0}
+        elif tag in ("input", "textarea", "select") and self._form is not None:
+            kind = attr.get("type", "text").lower()
+            if kind == "search":
+                self._form["search"] = True
+            elif kind not in ("hidden", "submit", "button", "image", "reset"):
+                self._form["fields"] += 1
+        if tag in ("title", "h1", "h2", "h3") or (
+            tag == "script" and attr.get("type", "").lower() == "application/ld+json"
+        ):
+            self._open.append(tag)
+        elif tag in ("script", "style"):
+            self._open.append("skip")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "a" and self._href is not None:
+            self.links.append((self._href, " ".join(self._anchor).strip()))
+            self._href = None
+        elif tag == "form" and self._form is not None:
+            if self._form["fields"] and not self._form["search"]:
+                self.forms += 1
+            self._form = None
+        if self._open and self._open[-1] in (tag, "skip") and (
+            self._open[-1] == tag or tag in ("script", "style")
+        ):
+            self._open.pop()
+
+    def handle_data(self, data: str) -> None:
+        current = self._open[-1] if self._open else None
+        if current == "skip":
+            return
+        if current == "script":
+            self.json_ld.append(data)
+            return
+        if current == "title":
+            self.title += data
+        elif current in ("h1", "h2", "h3"):
+            self.headings.append(data)
+        if self._href is not None:
+            self._anchor.append(data)
+        self.text.append(data)
+
+
+class _ParsedPage(NamedTuple):
+    page: Page
+    parser: _PageParser
+    text: str  # visible text, whitespace squashed, lowercased
+    json_ld: List[object]
+
+
+def _parse(page: Page) -> _ParsedPage:
+    parser = _PageParser()
+    parser.feed(page.text)
+    parser.close()
+    blocks = []
+    for raw in parser.json_ld:
+        try:
+            blocks.append(json.loads(raw))
+        except ValueError:
+            continue  # broken JSON-LD doesn't count as markup
+    text = " ".join(" ".join(parser.text).split()).lower()
+    return _ParsedPage(page, parser, text, blocks)
+
+
+def normalize_website(website: str) -> str:
+    """The website as an absolute http(s) URL; raises BadWebsiteError if it can't be one."""
+    url = website.strip()
+    if "://" not in url:
+        url = "https://" + url
+    try:
+        parts = urlsplit(url)
+        parts.port  # a non-numeric or out-of-range port only raises here
+    except ValueError as exc:
+        raise BadWebsiteError(f"{website!r} isn't a valid URL: {exc}") from exc
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise BadWebsiteError(f"{website!r} isn't an http(s) URL with a host name")
+    return url
+
+
+def _same_site(url: str, home: str) -> bool:
+    return urlsplit(url).netloc.lower() == urlsplit(home).netloc.lower()
+
+
+def _pick_pages(home: _ParsedPage, limit: int) -> Dict[str, str]:
+    """kind -> absolute URL for the linked pages worth fetching."""
+    picked: Dict[str, str] = {}
+    for kind, keywords in PAGE_KEYWORDS.items():
+        if len(picked) >= limit:
+            break
+        for href, anchor in home.parser.links:
+            try:
+                url = urljoin(home.page.url, href).split("#")[0]
+                if not url.startswith(("http://", "https://")):
+                    continue
+                if not _same_site(url, home.page.url):
+                    continue
+                path = urlsplit(url).path
+            except ValueError:
+                continue  # a malformed href (say "http://[oops") is just a dead link
+            if url.rstrip("/") == home.page.url.rstrip("/"):
+                continue
+            haystack = f"{path} {anchor}".lower()
+            if any(keyword in haystack for keyword in keywords):
+                picked[kind] = url
+                break
+    return picked
+
+
+def _json_ld_values(blocks: Iterable[object], keys: Tuple[str, ...]) -> Iterator:
+    """Every value under any of these keys, however deep in the JSON-LD."""
+    stack = list(blocks)
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key in keys:
+                    yield value
+                stack.append(value)
+        elif isinstance(node, list):
+            stack.extend(node)
+
+
+def _parse_date(raw: str) -> Optional[datetime]:
+    raw = raw.strip()
+    try:
+        parsed = datetime.fromisoformat(raw)
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(raw)  # HTTP-date, as in Last-Modified
+        except (TypeError, ValueError):
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _phones(parsed: _ParsedPage) -> set:
+    found = set(PHONE_RE.findall(parsed.text))
+    found.update(href[4:] for href, _ in parsed.parser.links if href.lower().startswith("tel:"))
+    found.update(str(v) for v in _json_ld_values(parsed.json_ld, ("telephone",)))
+    digits = {re.sub(r"\D", "", phone)[-10:] for phone in found}
+    return {d for d in digits if len(d) == 10}
+
+
+def _intent_terms(industry: Optional[str], niche: Optional[str]) -> List[str]:
+    words = re.findall(r"[a-z]{4,}", (niche or industry or "").lower())
+    # "plumbers" should match "plumbing" and vice versa, roughly
+    return [word[:-1] if word.endswith("s") else word for word in words]
+
+
+def derive_signals(
+    home: _ParsedPage,
+    extra: Dict[str, _ParsedPage],
+    *,
+    name: str,
+    city: Optional[str] = None,
+    industry: Optional[str] = None,
+    niche: Optional[str] = None,
+    fast_load_seconds: float = CRAWL_FAST_LOAD_SECONDS,
+    recent_days: int = CRAWL_RECENT_DAYS,
+    now: Optional[datetime] = None,
+) -> Dict[str, bool]:
+    pages = [home, *extra.values()]
+    links = [href.lower() for p in pages for href, _ in p.parser.links]
+    embeds = [src.lower() for p in pages for src in p.parser.embeds]
+    json_ld = [block for p in pages for block in p.json_ld]
+    text = " ".join(p.text for p in pages)
+
+    now = now or datetime.now(timezone.utc)
+    oldest = now - timedelta(days=recent_days)
+    raw_dates = [p.page.headers.get("last-modified", "") for p in pages]
+    raw_dates += [p.parser.meta.get(key, "") for p in pages for key in DATE_META]
+    raw_dates += [d for p in pages for d in p.parser.dates]
+    raw_dates += [str(v) for v in _json_ld_values(json_ld, ("dateModified", "datePublished"))]
+    dates = [d for d in (_parse_date(raw) for raw in raw_dates if raw) if d is not None]
+
+    phones = set().union(*(_phones(p) for p in pages))
+    terms = _intent_terms(industry, niche)
+    headline = " ".join(
+        [home.parser.title, home.parser.meta.get("description", ""), *home.parser.headings]
+    ).lower()
+
+    return {
+        CONTACT: "contact" in extra,
+        SERVICES: "services" in extra,
+        MAPS: any(host in url for url in links + embeds for host in MAPS_HOSTS)
+        or any(True for _ in _json_ld_values(json_ld, ("hasMap",))),
+        RECENT: any(oldest <= d <= now + timedelta(days=1) for d in dates),
+        REVIEWS: bool(REVIEW_RE.search(text))
+        or any(True for _ in _json_ld_values(json_ld, ("aggregateRating", "review"))),
+        BOOKING: any(p.parser.forms for p in pages)
+        or any(host in url for url in links for host in BOOKING_HOSTS),
+        SCHEMA: any(p.parser.microdata for p in pages)
+        or any(True for _ in _json_ld_values(json_ld, ("@type",))),
+        NAP: " ".join(name.lower().split()) in text
+        and len(phones) == 1
+        and (not city or city.strip().lower() in text),
+        FAST: home.page.seconds <= fast_load_seconds,
+        INTENT: bool(terms) and any(term in headline for term in terms),
+    }
+
+
+class Crawler:
+    """Shared fetch pool plus the crawl logic on top; aclose() when done."""
+
+    def __init__(
+        self,
+        *,
+        timeout: float = CRAWL_TIMEOUT_SECONDS,
+        connect_timeout: float = CRAWL_CONNECT_TIMEOUT_SECONDS,
+        max_connections: int = CRAWL_MAX_CONNECTIONS,
+        per_host: int = CRAWL_PER_HOST,
+        max_pages: int = CRAWL_MAX_PAGES,
+        max_bytes: int = CRAWL_MAX_BYTES,
+        cache_ttl: float = CRAWL_CACHE_TTL_SECONDS,
+        cache_max_entries: int = CRAWL_CACHE_MAX_ENTRIES,
+        fast_load_seconds: float = CRAWL_FAST_LOAD_SECONDS,
+    ) -> None:
+        self.deadline = timeout
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections, max_keepalive_connections=max_connections
+        )
+        self.per_host = per_host
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.cache_ttl = cache_ttl
+        self.cache_max_entries = cache_max_entries
+        self.fast_load_seconds = fast_load_seconds
+        self._cache: "OrderedDict[str, Tuple[float, Page]]" = OrderedDict()
+        self._client: Optional[httpx.AsyncClient] = None
+        # Only hosts with a fetch running or waiting have an entry; the last
+        # one out removes it, so a long-lived crawler doesn't keep one per
+        # site it has ever seen
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._host_users: Dict[str, int] = {}
+        self._in_flight: Dict[str, "asyncio.Future[Page]"] = {}
+
+    async def start(self) -> None:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                transport=_public_only_transport(self.limits),
+                follow_redirects=True,
+                max_redirects=CRAWL_MAX_REDIRECTS,
+                headers={"User-Agent": CRAWL_USER_AGENT},
+            )
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        # Semaphores and futures belong to one event loop; the next start
+        # may be on another
+        self._host_slots.clear()
+        self._host_users.clear()
+        self._in_flight.clear()
+
+    async def __aenter__(self) -> "Crawler":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+    @asynccontextmanager
+    async def _host_slot(self, url: str) -> AsyncIterator[None]:
+        host = urlsplit(url).netloc.lower()
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(self.per_host)
+        self._host_users[host] = self._host_users.get(host, 0) + 1
+        try:
+            async with slot:
+                yield
+        finally:
+            self._host_users[host] -= 1
+            if not self._host_users[host]:
+                del self._host_users[host], self._host_slots[host]
+
+    def _cached(self, url: str) -> Optional[Page]:
+        entry = self._cache.get(url)
+        if entry is None:
+            return None
+        expires_at, page = entry
+        if expires_at <= time.monotonic():
+            del self._cache[url]
+            return None
+        self._cache.move_to_end(url)
+        return page
+
+    def _remember(self, url: str, page: Page) -> None:
+        if self.cache_ttl <= 0 or self.cache_max_entries <= 0:
+            return
+        self._cache[url] = (time.monotonic() + self.cache_ttl, page)
+        self._cache.move_to_end(url)
+        while len(self._cache) > self.cache_max_entries:
+            self._cache.popitem(last=False)
+
+    async def fetch(self, url: str) -> Page:
+        """GET a URL through the cache; raises CrawlError on network trouble."""
+        page = self._cached(url)
+        if page is not None:
+            CRAWL_FETCHES.labels(result="cached").inc()
+            return page
+        pending = self._in_flight.get(url)
+        if pending is None:
+            pending = asyncio.ensure_future(self._fetch(url))
+            self._in_flight[url] = pending
+            pending.add_done_callback(lambda _: self._in_flight.pop(url, None))
+        else:
+            CRAWL_FETCHES.labels(result="shared").inc()
+        # shield: one caller giving up shouldn't cancel the others' fetch
+        return await asyncio.shield(pending)
+
+    async def _download(self, url: str) -> Tuple[httpx.Response, bytearray]:
+        async with self._client.stream("GET", url) as response:
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body += chunk
+                if len(body) >= self.max_bytes:
+                    break
+        return response, body
+
+    async def _fetch(self, url: str) -> Page:
+        await self.start()  # the pool opens on first use
+        try:
+            async with self._host_slot(url):
+                start = time.perf_counter()
+                response, body = await asyncio.wait_for(self._download(url), self.deadline)
+                seconds = time.perf_counter() - start
+        except asyncio.TimeoutError as exc:
+            CRAWL_FETCHES.labels(result="error").inc()
+            raise CrawlError(f"{url}: no complete answer within {self.deadline:g}s") from exc
+        except (httpx.HTTPError, httpx.InvalidURL) as exc:
+            CRAWL_FETCHES.labels(result="error").inc()
+            raise CrawlError(f"{url}: {exc.__class__.__name__} {exc}".strip()) from exc
+        except ValueError as exc:  # urlsplit on a URL it can't take apart
+            CRAWL_FETCHES.labels(result="error").inc()
+            raise CrawlError(f"{url}: invalid URL ({exc})") from exc
+        CRAWL_FETCHES.labels(result="fetched").inc()
+        page = Page(
+            url=str(response.url),
+            status=response.status_code,
+            headers={k.lower(): v for k, v in response.headers.items()},
+            text=bytes(body[: self.max_bytes]).decode(
+                response.encoding or "utf-8", errors="replace"
+            ),
+            seconds=seconds,
+        )
+        if page.status < 500:  # server hiccups are worth retrying soon
+            self._remember(url, page)
+        return page
+
+    async def _fetch_linked(self, url: str) -> Optional[Page]:
+        try:
+            page = await self.fetch(url)
+        except CrawlError:
+            return None  # a broken subpage just means that signal is missing
+        return page
+
+    async def crawl(
+        self,
+        website: str,
+        *,
+        name: str,
+        city: Optional[str] = None,
+        industry: Optional[str] = None,
+        niche: Optional[str] = None,
+    ) -> CrawlReport:
+        url = normalize_website(website)
+        home_page = await self.fetch(url)
+        if home_page.status >= 400:
+            raise CrawlError(f"{url}: HTTP {home_page.status}")
+        home = _parse(home_page)
+
+        targets = _pick_pages(home, self.max_pages - 1)
+        fetched = await asyncio.gather(*(self._fetch_linked(u) for u in targets.values()))
+        crawled = [CrawledPage("home", home_page.url, home_page.status, home_page.seconds)]
+        extra: Dict[str, _ParsedPage] = {}
+        for kind, page in zip(targets, fetched):
+            if page is None:
+                continue
+            crawled.append(CrawledPage(kind, page.url, page.status, page.seconds))
+            if 200 <= page.status < 300:
+                extra[kind] = _parse(page)
+
+        signals = derive_signals(
+            home,
+            extra,
+            name=name,
+            city=city,
+            industry=industry,
+            niche=niche,
+            fast_load_seconds=self.fast_load_seconds,
+        )
+        return CrawlReport(home_page.url, signals, crawled, home_page.seconds)
+
+
+async def _main(urls: List[str]) -> None:
+    async with Crawler() as crawler:
+        reports = await asyncio.gather(
+            *(crawler.crawl(url, name=urlsplit(normalize_website(url)).netloc) for url in urls),
+            return_exceptions=True,
+        )
+    for url, report in zip(urls, reports):
+        if isinstance(report, Exception):
+            print(json.dumps({"url": url, "error": str(report)}))
+        else:
+            summary = {"url": report.url, "signals": report.signals}
+            print(json.dumps({**summary, "load_seconds": round(report.load_seconds, 3)}))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit("usage: python crawler.py URL [URL ...]")
+    asyncio.run(_main(sys.argv[1:]))
@@ -223,6 +223,20 @@ document.addEventListener("DOMContentLoaded", () => {
     `;
   };
 
+  // One Idempotency-Key per distinct submission: retries and double clicks
+  // with the same form contents reuse it, so the API hands back the stored
+  // evaluation instead of writing a duplicate row.
+  let lastSubmission = null;
+  const idempotencyKeyFor = (fingerprint) => {
+    if (!lastSubmission || lastSubmission.fingerprint !== fingerprint) {
+      const key =
+        window.crypto?.randomUUID?.() ||
+        `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+      lastSubmission = { fingerprint, key };
+    }
+    return lastSubmission.key;
+  };
+
   form.addEventListener("submit", async (event) => {
     event.preventDefault();
 
@@ -263,7 +277,8 @@ document.addEventListener("DOMContentLoaded", () => {
     }, {});
 
     try {
-      const companyData = await fetchJson("/companies", {
+      // Reuses the company if the name already exists, so resubmits don't 409
+      const companyData = await fetchJson("/companies/get-or-create", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify(companyPayload),
@@ -275,10 +290,14 @@ document.addEventListener("DOMContentLoaded", () => {
         throw new Error("The backend did not return a company_id.");
       }
 
+      const evaluatePayload = JSON.stringify({ company_id: companyId, ...signalPayload });
       const evaluationData = await fetchJson("/evaluate", {
         method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ company_id: companyId, ...signalPayload }),
+        headers: {
+          "Content-Type": "application/json",
+          "Idempotency-Key": idempotencyKeyFor(evaluatePayload),
+        },
+        body: evaluatePayload,
       });
 
       renderResult({
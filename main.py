@@ -7,26 +7,104 @@ More brains coming later... for now, it's a friendly healthcheck.
 
 __version__ = "0.1.0"
 
+import asyncio
+import codecs
+import csv
+import hashlib
+import io
+import json
+import logging
+import operator
+import os
+import queue
+import random
+import re
+import sys
+import tempfile
+import threading
 import time
-from fastapi import FastAPI, Depends, HTTPException, Query, Response  # pyright: ignore[reportMissingImports]
+import numpy as np
+
+import crawler
+
+try:
+    import orjson
+except ImportError:  # optional; responses fall back to Pydantic's encoder
+    orjson = None
+from fastapi import FastAPI, Depends, Header, HTTPException, Query, Request, Response  # pyright: ignore[reportMissingImports]
 from fastapi.middleware.cors import CORSMiddleware
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
-from typing import List, Optional, Generator
-from datetime import datetime
-from pydantic import BaseModel, ConfigDict, field_validator
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.routing import APIRoute, request_response
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Generator,
+    Iterable,
+    Iterator,
+    Tuple,
+    TypeVar,
+    Union,
+)
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
 from sqlalchemy import (
     Column,
     DateTime,
     Integer,
     String,
     Float,
-    JSON,
+    SmallInteger,
+    Text,
     ForeignKey,
+    Index,
+    and_,
     create_engine,
+    make_url,
     func,
+    column,
     event,
+    insert,
+    literal_column,
+    inspect,
+    literal,
+    or_,
+    case,
+    cast,
+    select,
+    table,
+    text,
+    tuple_,
+    type_coerce,
+    update,
 )
-from sqlalchemy.orm import Session, declarative_base, sessionmaker, relationship
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import DATETIME as SQLITE_DATETIME, insert as sqlite_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, declarative_base, sessionmaker, relationship, validates
+from sqlalchemy.orm.interfaces import ORMOption
 
 
 app = FastAPI(
@@ -75,31 +153,435 @@ app.add_middleware(
     allow_methods=["*"],  # keep the demo flexible across GitHub Pages deploys
     allow_headers=["*"],  # Content-Type/Accept plus any extra GH Pages headers
     allow_credentials=False,
+    # So the browser can page through /companies and revalidate cached reads
+    expose_headers=["x-next-cursor", "etag"],
+)
+
+
+# Metrics get the route template ("/companies/{id}") as their path label, never
+# the raw URL, so series count stays bounded. Anything no route matched
+# (404 probes, scanners) shares one label.
+UNMATCHED_ROUTE_LABEL = "<unmatched>"
+
+
+def _route_label(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE_LABEL
+
+
+# --- Request profiling (opt-in: where inside a slow request did the time go?) ---
+# PROFILE_SPANS=1 splits every request into spans, each a Prometheus histogram
+# labelled like the request metrics:
+#   validation  body parsing, dependencies and parameter validation
+#   db_query    SQL statements on the wire (cursor execute events)
+#   db_commit   the COMMIT itself (what the fsync costs)
+#   scoring     compute_findability / compute_findability_batch
+#   encoding    response_model serialization, or rendering orjson bodies
+# PROFILE_SAMPLE_PERCENT=0..100 samples the stacks of that share of requests
+# every PROFILE_SAMPLE_INTERVAL_MS and writes them to PROFILE_DIR as collapsed
+# stacks ("frame;frame;frame count"), one file per request, ready for
+# flamegraph.pl or speedscope; only the newest PROFILE_MAX_FILES are kept.
+# Both are off by default; then all that's left is a context variable lookup
+# here and there.
+PROFILE_SPANS = os.getenv("PROFILE_SPANS", "").lower() in {"1", "true", "yes", "on"}
+PROFILE_SAMPLE_PERCENT = float(os.getenv("PROFILE_SAMPLE_PERCENT", "0"))
+PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "2"))
+PROFILE_DIR = os.getenv("PROFILE_DIR") or os.path.join(
+    tempfile.gettempdir(), "findability-profiles"
+)
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "500"))
+if not 0 <= PROFILE_SAMPLE_PERCENT <= 100:
+    raise RuntimeError(f"PROFILE_SAMPLE_PERCENT must be 0..100, not {PROFILE_SAMPLE_PERCENT}.")
+
+REQUEST_SPAN_LATENCY = Histogram(
+    "api_request_span_seconds",
+    "Time per request spent in each span (PROFILE_SPANS)",
+    ["method", "path", "span"],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+PROFILED_REQUESTS = Counter(
+    "api_profiled_requests", "Requests whose stacks were written to PROFILE_DIR"
+)
+
+
+class RequestSpans:
+    """Span totals for one request, shared by every thread that works on it."""
+
+    __slots__ = ("totals", "endpoint_started", "endpoint_finished", "commit_started")
+
+    def __init__(self) -> None:
+        self.totals: dict[str, float] = {}
+        self.endpoint_started: Optional[float] = None
+        self.endpoint_finished: Optional[float] = None
+        self.commit_started: Optional[float] = None
+
+    def add(self, span: str, seconds: float) -> None:
+        self.totals[span] = self.totals.get(span, 0.0) + seconds
+
+
+# Set per request by the middleware. Context variables follow the request into
+# the threadpool and into AsyncSession.run_sync, and are None everywhere else
+# (background jobs, the write-behind thread), so those are never counted.
+_request_spans: ContextVar[Optional[RequestSpans]] = ContextVar("request_spans", default=None)
+
+
+# Engine and Session class events, so every engine is covered (tests' too).
+# The cursor's start time rides on the execution context.
+def _span_query_start(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _request_spans.get() is not None and context is not None:
+        context._span_started = time.perf_counter()
+
+
+def _span_query_end(conn, cursor, statement, parameters, context, executemany) -> None:
+    spans = _request_spans.get()
+    started = getattr(context, "_span_started", None)
+    if spans is not None and started is not None:
+        spans.add("db_query", time.perf_counter() - started)
+
+
+def _span_commit_start(conn) -> None:
+    spans = _request_spans.get()
+    if spans is not None:
+        spans.commit_started = time.perf_counter()
+
+
+def _span_commit_end(session) -> None:
+    spans = _request_spans.get()
+    if spans is not None and spans.commit_started is not None:
+        spans.add("db_commit", time.perf_counter() - spans.commit_started)
+        spans.commit_started = None
+
+
+_SPAN_LISTENERS = (
+    (Engine, "before_cursor_execute", _span_query_start),
+    (Engine, "after_cursor_execute", _span_query_end),
+    (Engine, "commit", _span_commit_start),
+    (Session, "after_commit", _span_commit_end),
 )
 
 
-@app.middleware("http")
-async def add_version_header(request, call_next):
-    response = await call_next(request)
-    response.headers["x-app-version"] = __version__
-    return response
+def enable_profile_spans() -> None:
+    """Turn PROFILE_SPANS on, hooking the DB events and routes the first time.
+
+    Nothing is installed until then: with any listener at all, SQLAlchemy
+    dispatches an event for every statement, and a profiled route adds a
+    wrapper to every request. Routes declared later are covered at startup.
+    """
+    global PROFILE_SPANS
+    for target, name, listener in _SPAN_LISTENERS:
+        if not event.contains(target, name, listener):
+            event.listen(target, name, listener)
+    _profile_routes()
+    PROFILE_SPANS = True
+
+
+def disable_profile_spans() -> None:
+    """Turn PROFILE_SPANS off again, removing what enable_profile_spans() hooked.
+
+    Routes stay wrapped while PROFILE_SAMPLE_PERCENT is set: sampling follows
+    sync endpoints into the threadpool through the same wrapper.
+    """
+    global PROFILE_SPANS
+    PROFILE_SPANS = False
+    for target, name, listener in _SPAN_LISTENERS:
+        if event.contains(target, name, listener):
+            event.remove(target, name, listener)
+    if not PROFILE_SAMPLE_PERCENT:
+        _unprofile_routes()
+
+
+class SampledRequest:
+    """Stack samples for one profiled request.
+
+    Its event-loop task is sampled only while it's the task running on the
+    loop (otherwise we'd be sampling some other request), and threadpool
+    threads only while they run DB work for it (see traced()).
+    """
+
+    def __init__(self) -> None:
+        self.loop_thread = threading.get_ident()
+        self.loop = asyncio.get_running_loop()
+        self.task = asyncio.current_task()
+        self.threads: set[int] = set()
+        self.stacks: dict[str, int] = {}
+        # Fixed now: the file is written later, on the sampler thread
+        self.directory = PROFILE_DIR
+
+    def traced(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        def _traced(*args: Any, **kwargs: Any) -> Any:
+            ident = threading.get_ident()
+            self.threads.add(ident)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.threads.discard(ident)
+
+        return _traced
+
+    def take(self, frames: dict) -> None:
+        if asyncio.current_task(self.loop) is self.task:
+            self._record(frames.get(self.loop_thread))
+        for ident in tuple(self.threads):
+            self._record(frames.get(ident))
+
+    def _record(self, frame) -> None:
+        names = []
+        while frame is not None:
+            names.append(_frame_name(frame.f_code))
+            frame = frame.f_back
+        if names:
+            stack = ";".join(reversed(names))
+            self.stacks[stack] = self.stacks.get(stack, 0) + 1
+
+    def write(self, label: str, seconds: float) -> Optional[str]:
+        if not self.stacks:
+            return None  # over before the first sample
+        os.makedirs(self.directory, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", label).strip("_")
+        path = os.path.join(
+            self.directory,
+            f"{time.time_ns() // 1_000_000}-{os.getpid()}-{slug}-{seconds * 1000:.0f}ms.collapsed",
+        )
+        with open(path, "w") as out:
+            for stack, count in sorted(self.stacks.items()):
+                out.write(f"{stack} {count}\n")
+        return path
+
+
+_frame_names: dict = {}
+
+
+def _frame_name(code) -> str:
+    name = _frame_names.get(code)
+    if name is None:
+        name = f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+        _frame_names[code] = name
+    return name
+
+
+class StackSampler:
+    """One background thread per process that samples profiled requests' stacks.
+
+    It also writes each finished request's file, so the event loop never waits
+    on the disk, and a sample's stacks are only ever touched by this thread.
+    """
+
+    def __init__(self, interval_seconds: float) -> None:
+        self.interval_seconds = interval_seconds
+        self._active: set[SampledRequest] = set()
+        self._finished: List[Tuple[SampledRequest, str, float]] = []
+        # directory -> profile files there, oldest first (sampler thread only)
+        self._written: dict[str, deque] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def begin(self) -> SampledRequest:
+        sample = SampledRequest()
+        with self._lock:
+            self._active.add(sample)
+            self._wake.set()
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="stack-sampler", daemon=True
+                )
+                self._thread.start()
+        return sample
+
+    def finish(self, sample: SampledRequest, label: str, seconds: float) -> None:
+        """Stop sampling the request and queue its stacks to be written."""
+        with self._lock:
+            self._active.discard(sample)
+            self._finished.append((sample, label, seconds))
+            self._wake.set()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait()
+            with self._lock:
+                active = tuple(self._active)
+                finished, self._finished = self._finished, []
+                if not active and not finished:
+                    self._wake.clear()  # sleep until the next profiled request
+                    continue
+            if active:
+                frames = sys._current_frames()
+                for sample in active:
+                    sample.take(frames)
+            # Same thread as take(), so a finished sample's stacks can't
+            # change under the writer
+            for sample, label, seconds in finished:
+                try:
+                    path = sample.write(label, seconds)
+                    if path:
+                        PROFILED_REQUESTS.inc()
+                        self._prune(path, PROFILE_MAX_FILES)
+                except OSError:
+                    logger.exception("Couldn't write the stack profile for %s", label)
+            if active:
+                time.sleep(self.interval_seconds)
+
+    def _prune(self, path: str, keep: int) -> None:
+        """Note a newly written file and delete the oldest beyond keep."""
+        directory = os.path.dirname(path)
+        written = self._written.get(directory)
+        if written is None:
+            # Listed once, so files from earlier runs count too. Names start
+            # with a millisecond timestamp: sorted is oldest first.
+            names = sorted(name for name in os.listdir(directory) if name.endswith(".collapsed"))
+            written = self._written[directory] = deque(
+                os.path.join(directory, name) for name in names
+            )
+        else:
+            written.append(path)
+        while len(written) > keep:
+            try:
+                os.remove(written.popleft())
+            except FileNotFoundError:
+                pass  # deleted by hand, or by another worker
+
+
+stack_sampler = StackSampler(PROFILE_SAMPLE_INTERVAL_MS / 1000)
+_request_sample: ContextVar[Optional[SampledRequest]] = ContextVar("request_sample", default=None)
 
 
-@app.middleware("http")
-async def instrument_requests(request, call_next):
-    """Record a couple of lightweight Prometheus metrics per request."""
-    start_time = time.perf_counter()
-    response = await call_next(request)
-    elapsed = time.perf_counter() - start_time
+def _profile_route(route: APIRoute) -> None:
+    """Rebuild one route's handler so the request's spans know when the endpoint ran.
 
-    path = request.url.path
-    method = request.method
+    Everything before the endpoint function is validation, everything after
+    it is encoding. Sync endpoints are also followed into the threadpool when
+    their request is being sampled.
+    """
+    route.dependant.call = _profiled_endpoint(route.dependant.call)
+    handler = route.get_route_handler()
+
+    async def route_handler(request: Request) -> Response:
+        spans = _request_spans.get()
+        if spans is None:
+            return await handler(request)
+        started = time.perf_counter()
+        try:
+            return await handler(request)
+        finally:
+            finished = time.perf_counter()
+            if spans.endpoint_started is None:  # rejected before it ran
+                spans.add("validation", finished - started)
+            else:
+                spans.add("validation", spans.endpoint_started - started)
+                spans.add("encoding", finished - (spans.endpoint_finished or finished))
+
+    route.app = request_response(route_handler)
+
+
+def _profile_routes() -> None:
+    for route in app.router.routes:
+        if isinstance(route, APIRoute) and not getattr(route.dependant.call, "_profiled", False):
+            _profile_route(route)
+
+
+def _unprofile_routes() -> None:
+    for route in app.router.routes:
+        if isinstance(route, APIRoute) and getattr(route.dependant.call, "_profiled", False):
+            route.dependant.call = route.dependant.call._endpoint
+            route.app = request_response(route.get_route_handler())
+
+
+def _profiled_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    if asyncio.iscoroutinefunction(endpoint):
+
+        async def call(**values: Any) -> Any:
+            spans = _request_spans.get()
+            if spans is None:
+                return await endpoint(**values)
+            spans.endpoint_started = time.perf_counter()
+            try:
+                return await endpoint(**values)
+            finally:
+                spans.endpoint_finished = time.perf_counter()
+
+    else:
+
+        def call(**values: Any) -> Any:
+            spans = _request_spans.get()
+            sample = _request_sample.get()
+            target = sample.traced(endpoint) if sample is not None else endpoint
+            if spans is None:
+                return target(**values)
+            spans.endpoint_started = time.perf_counter()
+            try:
+                return target(**values)
+            finally:
+                spans.endpoint_finished = time.perf_counter()
+
+    call._profiled = True
+    call._endpoint = endpoint  # for _unprofile_routes()
+    return call
+
+
+@app.on_event("startup")
+def _profile_late_routes() -> None:
+    # Routes declared after the import-time enable_profile_spans() below
+    if PROFILE_SPANS or PROFILE_SAMPLE_PERCENT:
+        _profile_routes()
+
+
+if PROFILE_SPANS:
+    enable_profile_spans()
+
+
+class RequestInstrumentationMiddleware:
+    """Stamp x-app-version and record Prometheus metrics for every request.
+
+    Plain ASGI rather than @app.middleware("http"): no extra task hop or
+    response wrapping, we just peek at http.response.start on the way out.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
 
-    REQUEST_LATENCY.labels(method=method, path=path).observe(elapsed)
-    REQUEST_COUNT.labels(
-        method=method, path=path, status_code=str(response.status_code)
-    ).inc()
-    return response
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500  # if the app blows up before responding
+        spans = RequestSpans() if PROFILE_SPANS else None
+        spans_token = _request_spans.set(spans) if spans is not None else None
+        sample = None
+        if PROFILE_SAMPLE_PERCENT and random.random() * 100 < PROFILE_SAMPLE_PERCENT:
+            sample = stack_sampler.begin()
+        sample_token = _request_sample.set(sample) if sample is not None else None
+
+        async def send_with_version(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)["x-app-version"] = __version__
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_version)
+        finally:
+            elapsed = time.perf_counter() - start_time
+            path = _route_label(scope)
+            method = scope["method"]
+            REQUEST_LATENCY.labels(method=method, path=path).observe(elapsed)
+            REQUEST_COUNT.labels(
+                method=method, path=path, status_code=str(status_code)
+            ).inc()
+            if spans is not None:
+                _request_spans.reset(spans_token)
+                for span, seconds in spans.totals.items():
+                    REQUEST_SPAN_LATENCY.labels(method=method, path=path, span=span).observe(
+                        seconds
+                    )
+            if sample is not None:
+                _request_sample.reset(sample_token)
+                stack_sampler.finish(sample, f"{method} {path}", elapsed)
+
+
+app.add_middleware(RequestInstrumentationMiddleware)
 
 
 @app.get("/health")
@@ -107,26 +589,168 @@ def health() -> dict:
     return {"status": "ok"}
 
 
+# serve.py sets this when it runs several workers: each process writes its
+# metrics to files in there, and /metrics adds them all up so a scrape sees
+# the whole server no matter which worker answers it.
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+
+def _metrics_registry():
+    if not PROMETHEUS_MULTIPROC_DIR:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=PROMETHEUS_MULTIPROC_DIR)
+    return registry
+
+
 @app.get("/metrics")
 def metrics() -> Response:
     """Expose Prometheus metrics for scraping."""
-    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+    return Response(content=generate_latest(_metrics_registry()), media_type=CONTENT_TYPE_LATEST)
 
 
-# --- tiny SQLite setup (no migrations, just vibes) ---
-DATABASE_URL = "sqlite:///./gpt_findability.db"
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False},  # SQLite being SQLite
-)
+@app.on_event("shutdown")
+def _mark_metrics_process_dead() -> None:
+    # Lets the live-only gauges (queue depth) forget this worker
+    if PROMETHEUS_MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid(), PROMETHEUS_MULTIPROC_DIR)
+
+
+# --- Database setup (SQLite by default; schema comes from MIGRATIONS below) ---
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./gpt_findability.db")
+
+# Storage profile, picked with STORAGE_PROFILE:
+#   "tuned" (default): WAL so readers never wait on writers, plus pragmas that
+#       trade a little durability-on-power-loss for far fewer fsyncs
+#   "basic": stock SQLite settings (foreign keys only), what we shipped first
+STORAGE_PROFILE = os.getenv("STORAGE_PROFILE", "tuned")
+STORAGE_PROFILES: dict[str, dict[str, object]] = {
+    "basic": {},
+    "tuned": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",  # safe with WAL; only checkpoints fsync
+        "mmap_size": _env_int("SQLITE_MMAP_SIZE", 256 * 1024 * 1024),
+        "cache_size": -_env_int("SQLITE_CACHE_KB", 64_000),  # negative means KiB
+        "busy_timeout": _env_int("SQLITE_BUSY_TIMEOUT_MS", 5_000),
+        "temp_store": "MEMORY",
+        # Not a pragma: write transactions start with BEGIN IMMEDIATE, taking
+        # the write lock up front. A plain BEGIN that reads first and then
+        # writes can't wait on busy_timeout when another connection (or
+        # worker process) got there first; it fails with "database is locked".
+        "begin": "IMMEDIATE",
+    },
+}
+# Connection pools: writers, plus a separate read-only pool for GET endpoints
+DB_POOL_SIZE = _env_int("DB_POOL_SIZE", 5)
+DB_MAX_OVERFLOW = _env_int("DB_MAX_OVERFLOW", 10)
+DB_READ_POOL_SIZE = _env_int("DB_READ_POOL_SIZE", 10)
+DB_READ_MAX_OVERFLOW = _env_int("DB_READ_MAX_OVERFLOW", 20)
+
+
+# DB_MODE picks how requests talk to the database:
+#   "sync" (default): handlers hand their DB work to Starlette's threadpool
+#   "async": SQLAlchemy asyncio (aiosqlite, or asyncpg for Postgres URLs), so
+#       DB waits park on the event loop instead of holding a thread each
+DB_MODE = os.getenv("DB_MODE", "sync")
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def create_storage_engine(
+    url: str,
+    profile: str = STORAGE_PROFILE,
+    read_only: bool = False,
+    pool_size: int = DB_POOL_SIZE,
+    max_overflow: int = DB_MAX_OVERFLOW,
+    asynchronous: bool = False,
+):
+    """Build an engine with the storage profile's pragmas and pool sizing.
+
+    With asynchronous=True the URL is switched to the matching async driver
+    and an AsyncEngine comes back instead.
+    """
+    if profile not in STORAGE_PROFILES:
+        raise ValueError(
+            f"Unknown storage profile {profile!r}; pick one of {sorted(STORAGE_PROFILES)}."
+        )
+    pragmas = dict(STORAGE_PROFILES[profile])
+    url_info = make_url(url)
+    backend = url_info.get_backend_name()
+    kwargs: dict = {}
+    if backend == "sqlite":
+        kwargs["connect_args"] = {"check_same_thread": False}  # SQLite being SQLite
+    if backend != "sqlite" or url_info.database not in (None, "", ":memory:"):
+        kwargs.update(pool_size=pool_size, max_overflow=max_overflow)
+
+    if asynchronous:
+        if backend not in ASYNC_DRIVERS:
+            raise ValueError(f"No async driver configured for {backend!r} URLs.")
+        url_info = url_info.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+        new_engine = create_async_engine(url_info, **kwargs)
+        sync_engine = new_engine.sync_engine
+    else:
+        new_engine = sync_engine = create_engine(url_info, **kwargs)
 
-# Turn on SQLite foreign keys so cascade actually works
-@event.listens_for(engine, "connect")
-def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
-    cursor = dbapi_connection.cursor()
-    cursor.execute("PRAGMA foreign_keys=ON")
-    cursor.close()
+    if sync_engine.dialect.name == "sqlite":
+        begin = pragmas.pop("begin", None)
+        if read_only:
+            # journal_mode is the writer's call; readers just refuse to write
+            pragmas.pop("journal_mode", None)
+            pragmas["query_only"] = "ON"
+            begin = None
+
+        # Turn on SQLite foreign keys so cascade actually works, then the rest
+        @event.listens_for(sync_engine, "connect")
+        def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA foreign_keys=ON")
+            for pragma, value in pragmas.items():
+                cursor.execute(f"PRAGMA {pragma}={value}")
+            cursor.close()
+            if begin:
+                # Let SQLAlchemy's begin event below open transactions instead
+                # of the driver's own implicit BEGIN
+                dbapi_connection.isolation_level = None
+
+        if begin:
+
+            @event.listens_for(sync_engine, "begin")
+            def _begin_sqlite_transaction(connection):
+                connection.exec_driver_sql(f"BEGIN {begin}")
+
+    return new_engine
+
+
+def _build_engines(asynchronous: bool):
+    writer = create_storage_engine(DATABASE_URL, asynchronous=asynchronous)
+    if make_url(DATABASE_URL).get_backend_name() != "sqlite":
+        return writer, writer
+    reader = create_storage_engine(
+        DATABASE_URL,
+        read_only=True,
+        pool_size=DB_READ_POOL_SIZE,
+        max_overflow=DB_READ_MAX_OVERFLOW,
+        asynchronous=asynchronous,
+    )
+    return writer, reader
+
+
+engine, read_engine = _build_engines(asynchronous=False)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+ReadSessionLocal = sessionmaker(bind=read_engine, autocommit=False, autoflush=False)
+
+if DB_MODE == "async":
+    async_engine, async_read_engine = _build_engines(asynchronous=True)
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False)
+    AsyncReadSessionLocal = async_sessionmaker(bind=async_read_engine, autoflush=False)
+elif DB_MODE == "sync":
+    async_engine = async_read_engine = None
+    AsyncSessionLocal = AsyncReadSessionLocal = None
+else:
+    raise ValueError(f"DB_MODE must be 'sync' or 'async', not {DB_MODE!r}.")
 Base = declarative_base()
 
 
@@ -135,38 +759,290 @@ class Company(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
+    # Normalized name for exact, case-insensitive lookups (see company_name_key).
+    # Kept in step with name by the validator below. Only NULL for legacy
+    # duplicate names that predate the unique index.
+    name_key = Column(String, nullable=True, unique=True, index=True)
     website = Column(String, nullable=True)
-    country = Column(String, nullable=True)
-    state = Column(String, nullable=True)
-    city = Column(String, nullable=True)
-    industry = Column(String, nullable=True)
-    niche = Column(String, nullable=True)
+    # Indexed for the equality filters /stats takes on these
+    country = Column(String, nullable=True, index=True)
+    state = Column(String, nullable=True, index=True)
+    city = Column(String, nullable=True, index=True)
+    industry = Column(String, nullable=True, index=True)
+    niche = Column(String, nullable=True, index=True)
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
 
-    # Keep a handy backref to evaluations (lazy selectin keeps things snappy)
+    # Keep a handy backref to evaluations. Plain lazy loading: history can be
+    # big, so endpoints that actually return it ask for it via loader options.
+    # passive_deletes lets the FK's ON DELETE CASCADE do the work on delete.
     evaluations = relationship(
         "Evaluation",
         back_populates="company",
-        lazy="selectin",
+        lazy="select",
         cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    @validates("name")
+    def _sync_name_key(self, key: str, value: str) -> str:
+        self.name_key = company_name_key(value)
+        return value
+
+
+def company_name_key(name: str) -> str:
+    """Normalize a company name: trimmed, single-spaced, casefolded."""
+    return " ".join(name.split()).casefold()
+
+
+def ensure_company_name_key(connection) -> None:
+    """Add and backfill companies.name_key on DB files created before it existed.
+
+    When old data has the same name twice, the oldest row keeps the key (that's
+    the one lookups used to return) and the later ones stay NULL.
+    """
+    columns = {c["name"] for c in inspect(connection).get_columns("companies")}
+    if "name_key" in columns:
+        return
+    connection.exec_driver_sql("ALTER TABLE companies ADD COLUMN name_key VARCHAR")
+    seen: set = set()
+    updates = []
+    for company_id, name in connection.exec_driver_sql(
+        "SELECT id, name FROM companies ORDER BY id"
+    ):
+        key = company_name_key(name)
+        if key not in seen:
+            seen.add(key)
+            updates.append({"company_id": company_id, "name_key": key})
+    if updates:
+        connection.execute(
+            text("UPDATE companies SET name_key = :name_key WHERE id = :company_id"),
+            updates,
+        )
+    connection.exec_driver_sql(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_companies_name_key ON companies (name_key)"
+    )
+
+
+# --- Company search index (SQLite FTS5, trigram so substrings hit the index) ---
+# External-content table: it stores only the index, and triggers on companies
+# keep it in sync for every insert/update/delete, however the write happens.
+COMPANY_SEARCH_COLUMNS = ("name", "city", "industry", "niche")
+# bm25 weights per column above: a hit in the name counts most
+COMPANY_SEARCH_WEIGHTS = (10.0, 1.0, 1.0, 1.0)
+# Trigram needs at least 3 characters; shorter queries fall back to LIKE
+COMPANY_SEARCH_MIN_CHARS = 3
+
+_COMPANY_FTS_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS companies_fts USING fts5(
+        {", ".join(COMPANY_SEARCH_COLUMNS)},
+        content='companies', content_rowid='id', tokenize='trigram'
     )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS companies_fts_ai AFTER INSERT ON companies BEGIN
+        INSERT INTO companies_fts(rowid, {", ".join(COMPANY_SEARCH_COLUMNS)})
+        VALUES (new.id, {", ".join("new." + c for c in COMPANY_SEARCH_COLUMNS)});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS companies_fts_ad AFTER DELETE ON companies BEGIN
+        INSERT INTO companies_fts(companies_fts, rowid, {", ".join(COMPANY_SEARCH_COLUMNS)})
+        VALUES ('delete', old.id, {", ".join("old." + c for c in COMPANY_SEARCH_COLUMNS)});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS companies_fts_au
+    AFTER UPDATE OF {", ".join(COMPANY_SEARCH_COLUMNS)} ON companies BEGIN
+        INSERT INTO companies_fts(companies_fts, rowid, {", ".join(COMPANY_SEARCH_COLUMNS)})
+        VALUES ('delete', old.id, {", ".join("old." + c for c in COMPANY_SEARCH_COLUMNS)});
+        INSERT INTO companies_fts(rowid, {", ".join(COMPANY_SEARCH_COLUMNS)})
+        VALUES (new.id, {", ".join("new." + c for c in COMPANY_SEARCH_COLUMNS)});
+    END
+    """,
+]
+
+
+def ensure_company_search_index(connection) -> None:
+    """Create the FTS table and triggers if missing, indexing existing rows."""
+    if connection.dialect.name != "sqlite":
+        return
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='companies_fts'"
+    ).first()
+    for ddl in _COMPANY_FTS_DDL:
+        connection.exec_driver_sql(ddl)
+    if not exists:
+        # Pre-existing companies (older DB files) need indexing once
+        connection.exec_driver_sql(
+            "INSERT INTO companies_fts(companies_fts) VALUES ('rebuild')"
+        )
+
+
+@event.listens_for(Company.__table__, "after_create")
+def _create_company_search_index(target, connection, **kw) -> None:
+    ensure_company_search_index(connection)
+
+
+@event.listens_for(Company.__table__, "before_drop")
+def _drop_company_search_index(target, connection, **kw) -> None:
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql("DROP TABLE IF EXISTS companies_fts")
+
+
+_companies_fts = table("companies_fts", column("rowid"))
+
+
+def _fts_phrase(text_value: str) -> str:
+    # Quote as a single FTS5 phrase so user input can't inject query syntax
+    return '"' + text_value.replace('"', '""') + '"'
+
+
+# SQLite keeps DATETIME as text, and CURRENT_TIMESTAMP writes whole seconds
+# with no fraction. Datetimes bound from Python (write-behind stamps) are
+# stored the same way, or "12:00:00.000000" would sort after "12:00:00" and
+# the history keyset would mix up rows from the same second.
+_WHOLE_SECOND_DATETIME = DateTime().with_variant(
+    SQLITE_DATETIME(
+        storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+    ),
+    "sqlite",
+)
 
 
 class Evaluation(Base):
     __tablename__ = "evaluations"
 
     id = Column(Integer, primary_key=True, index=True)
+    # No single-column index here: ix_evaluations_company_created covers it
     company_id = Column(
-        Integer, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False, index=True
+        Integer, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False
     )
     score = Column(Float, nullable=False)
     badge = Column(String, nullable=False)  # "excellent"|"good"|"fair"|"poor"
-    # yes, this could have been JSON only, but we’re being grown-ups.
-    evidence = Column(JSON, nullable=False)  # list[str]
-    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    # Which SIGNALS were present, one bit each (bit i = SIGNALS[i]). Two bytes
+    # instead of a JSON list of strings; evidence is rebuilt from it on read.
+    signal_mask = Column(SmallInteger, nullable=False)
+    # The scoring model that turned signal_mask into score/badge
+    model_version = Column(String, nullable=False, server_default="v1")
+    created_at = Column(_WHOLE_SECOND_DATETIME, server_default=func.now(), nullable=False)
+    # Last time PATCH /evaluate found the signals unchanged; None until then
+    confirmed_at = Column(DateTime)
 
     company = relationship("Company", back_populates="evaluations")
 
+    @property
+    def evidence(self) -> List[str]:
+        # Same strings the API has always returned, from the precomputed table
+        return list(FINDABILITY_EVIDENCE[self.signal_mask])
+
+    # Have INSERT ... RETURNING hand back created_at too, so the summary
+    # upsert can use it without another round trip
+    __mapper_args__ = {"eager_defaults": True}
+    # Time-series reads ("company X, newest first / in a range", "badge Y in
+    # a range") walk these in order instead of sorting in memory
+    __table_args__ = (
+        # id breaks created_at ties the same way the history endpoint does
+        Index("ix_evaluations_company_created", "company_id", created_at.desc(), id.desc()),
+        Index("ix_evaluations_badge_created", "badge", "created_at"),
+    )
+
+
+class EvaluationSummary(Base):
+    """Per-company rollup of evaluation history, updated on every write.
+
+    Lets "latest score for these N companies" be a primary-key lookup
+    instead of an aggregate over the evaluations table.
+    """
+
+    __tablename__ = "evaluation_summaries"
+
+    company_id = Column(
+        Integer, ForeignKey("companies.id", ondelete="CASCADE"), primary_key=True
+    )
+    evaluation_count = Column(Integer, nullable=False)
+    score_sum = Column(Float, nullable=False)  # running mean = sum / count
+    score_min = Column(Float, nullable=False)
+    score_max = Column(Float, nullable=False)
+    latest_evaluation_id = Column(Integer, nullable=False)
+    latest_score = Column(Float, nullable=False)
+    latest_badge = Column(String, nullable=False)
+    latest_at = Column(DateTime, nullable=False)
+
+    @property
+    def score_mean(self) -> float:
+        return self.score_sum / self.evaluation_count
+
+
+class Job(Base):
+    """A background job (today: re-scoring) and how far it has got.
+
+    cursor is the last company id whose work is committed. Progress is
+    written in the same transaction as each chunk's rows, so a worker that
+    picks the job up again after a crash carries on from exactly there.
+    """
+
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String, nullable=False)
+    status = Column(String, nullable=False)  # "queued"|"running"|"done"|"failed"
+    total = Column(Integer, nullable=False)
+    processed = Column(Integer, nullable=False, default=0)
+    cursor = Column(Integer, nullable=False, default=0)
+    model_version = Column(String, nullable=False, server_default="v1")  # scores with this
+    attempts = Column(Integer, nullable=False, default=0)  # times a worker claimed it
+    error = Column(String)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    started_at = Column(DateTime)
+    # Throughput is measured over the current run, not across a crash gap
+    resumed_at = Column(DateTime)
+    processed_at_resume = Column(Integer, nullable=False, default=0)
+    heartbeat_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    __table_args__ = (Index("ix_jobs_status", "status", "id"),)
+
+
+class StoredScoringModel(Base):
+    """A ScoringModelSpec saved under its version. Never updated once stored."""
+
+    __tablename__ = "scoring_models"
+
+    version = Column(String(64), primary_key=True)
+    spec = Column(Text, nullable=False)  # ScoringModelSpec as JSON
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+
+def ensure_evaluation_summaries(connection) -> None:
+    """Build summaries from history when the table is empty but history isn't.
+
+    Covers DB files that had evaluations before the summary table existed.
+    """
+    has_summaries = connection.exec_driver_sql(
+        "SELECT 1 FROM evaluation_summaries LIMIT 1"
+    ).first()
+    has_history = connection.exec_driver_sql("SELECT 1 FROM evaluations LIMIT 1").first()
+    if has_summaries or not has_history:
+        return
+    connection.exec_driver_sql(
+        """
+        INSERT INTO evaluation_summaries (
+            company_id, evaluation_count, score_sum, score_min, score_max,
+            latest_evaluation_id, latest_score, latest_badge, latest_at
+        )
+        SELECT agg.company_id, agg.n, agg.total, agg.lo, agg.hi,
+               latest.id, latest.score, latest.badge, latest.created_at
+        FROM (
+            SELECT company_id, COUNT(*) AS n, SUM(score) AS total,
+                   MIN(score) AS lo, MAX(score) AS hi, MAX(id) AS latest_id
+            FROM evaluations
+            GROUP BY company_id
+        ) AS agg
+        JOIN evaluations AS latest ON latest.id = agg.latest_id
+        """
+    )
+
 
 # Pydantic schemas (input and output shapes)
 class CompanyCreate(BaseModel):
@@ -228,11 +1104,82 @@ class EvaluationOut(BaseModel):
     score: float
     badge: str
     evidence: List[str]
+    model_version: str
     created_at: datetime
+    confirmed_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class EvaluationSummaryOut(BaseModel):
+    company_id: int
+    evaluation_count: int
+    latest_evaluation_id: int
+    latest_score: float
+    latest_badge: str
+    latest_at: datetime
+    score_mean: float
+    score_min: float
+    score_max: float
 
     model_config = ConfigDict(from_attributes=True)
 
 
+# --- JSON responses ---
+# orjson: the read endpoints (company list/detail/export, evaluation history,
+# summaries) copy ORM columns straight into orjson and skip FastAPI's
+# response_model pass, which re-validates every row first. pydantic: leave it
+# all to response_model like the other endpoints. Same bytes either way.
+JSON_ENCODER = os.getenv("JSON_ENCODER", "orjson" if orjson is not None else "pydantic")
+
+if JSON_ENCODER not in {"orjson", "pydantic"}:
+    raise RuntimeError(f"Unknown JSON_ENCODER {JSON_ENCODER!r}; use 'orjson' or 'pydantic'.")
+if JSON_ENCODER == "orjson" and orjson is None:
+    raise RuntimeError("JSON_ENCODER=orjson needs orjson installed (pip install orjson).")
+
+FAST_JSON = JSON_ENCODER == "orjson"
+
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        spans = _request_spans.get()
+        if spans is None:
+            # Naive datetimes come out exactly like Pydantic's; UTC ones end in Z
+            return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+        started = time.perf_counter()
+        body = orjson.dumps(content, option=orjson.OPT_UTC_Z)
+        spans.add("encoding", time.perf_counter() - started)
+        return body
+
+
+def _row_dumper(model: type) -> Callable[[Any], dict]:
+    """Read a response model's fields off an ORM row into a plain dict.
+
+    No validation: only for rows whose columns already have the model's types.
+    """
+    fields = tuple(model.model_fields)
+    getter = operator.attrgetter(*fields)
+
+    def dump(row: Any) -> dict:
+        return dict(zip(fields, getter(row)))
+
+    return dump
+
+
+_company_dict = _row_dumper(CompanyOut)
+_evaluation_dict = _row_dumper(EvaluationOut)
+_summary_dict = _row_dumper(EvaluationSummaryOut)
+
+
+def _fast_json_response(content: Any, response: Optional[Response] = None) -> Response:
+    fast = ORJSONResponse(content)
+    if response is not None:
+        # FastAPI only copies headers set on the injected response into
+        # responses it builds itself
+        fast.headers.raw.extend(response.headers.raw)
+    return fast
+
+
 # --- Pure scoring helper: no AI, no network ---
 SIGNALS: List[str] = [
     "contact page",
@@ -248,45 +1195,94 @@ SIGNALS: List[str] = [
 ]
 
 
-def compute_findability(signals: dict[str, bool]) -> dict:
+class ScoringWeights(BaseModel):
+    presence: float = 0.6
+    rank: float = 0.3
+    confidence: float = 0.1
+
+
+class ScoringModelSpec(BaseModel):
+    """A scoring model, declared as data. The defaults are the original rules (v1).
+
+    The signal count is the sum of the present signals' weights (1 each
+    unless signal_weights says otherwise). Being "mentioned" takes
+    presence_min of it; rank_steps maps a count to a rank component (first
+    (min count, rank) pair that fits, else 0); confidence grows per signal
+    up to 1. The weighted sum of the three, clamped to 0..1, is the score,
+    and the first badge band whose cutoff it reaches is the badge (else poor).
+    """
+
+    version: str = Field(min_length=1, max_length=64, pattern=r"^[A-Za-z0-9._-]+$")
+    description: str = ""
+    signal_weights: dict[str, float] = Field(default_factory=dict)
+    presence_min: float = 2
+    rank_steps: List[Tuple[float, float]] = [(6, 1.0), (4, 0.9), (2, 0.8)]
+    confidence_base: float = 0.3
+    confidence_per_signal: float = 0.1
+    weights: ScoringWeights = ScoringWeights()
+    badge_bands: List[Tuple[str, float]] = [("excellent", 0.8), ("good", 0.6), ("fair", 0.4)]
+
+    @field_validator("signal_weights")
+    @classmethod
+    def validate_signal_weights(cls, value: dict[str, float]) -> dict[str, float]:
+        unknown = sorted(set(value) - set(SIGNALS))
+        if unknown:
+            raise ValueError(f"Unknown signals {unknown}; pick from {SIGNALS}.")
+        return value
+
+    @field_validator("rank_steps")
+    @classmethod
+    def validate_rank_steps(cls, value: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+        if [count for count, _ in value] != sorted((count for count, _ in value), reverse=True):
+            raise ValueError("rank_steps go from the highest signal count down.")
+        return value
+
+    @field_validator("badge_bands")
+    @classmethod
+    def validate_badge_bands(cls, value: List[Tuple[str, float]]) -> List[Tuple[str, float]]:
+        names = [name for name, _ in value]
+        if not set(names) <= set(BADGES) - {"poor"} or len(set(names)) != len(names):
+            raise ValueError("badge_bands name each of excellent/good/fair at most once.")
+        if [cutoff for _, cutoff in value] != sorted((c for _, c in value), reverse=True):
+            raise ValueError("badge_bands go from the highest cutoff down.")
+        return value
+
+
+def _compute_findability_reference(signals: dict[str, bool], spec: ScoringModelSpec) -> dict:
     """Turn simple boolean hints into a score, badge, and evidence.
 
     Why this exists: we want something deterministic and explainable
-    can read it without guessing hidden magic.
+    can read it without guessing hidden magic. This is the readable
+    version of the rules; the lookup tables below are built from it.
     """
     # Gather which signals are present, preserving our fixed order for sanity
     present_flags = [bool(signals.get(name, False)) for name in SIGNALS]
-    n_true = sum(1 for flag in present_flags if flag)
+    n_true = sum(
+        spec.signal_weights.get(name, 1.0) for name, flag in zip(SIGNALS, present_flags) if flag
+    )
 
-    mentioned = n_true >= 2
+    mentioned = n_true >= spec.presence_min
     presence = 1.0 if mentioned else 0.0
 
-    if n_true >= 6:
-        rank_component = 1.0
-    elif n_true >= 4:
-        rank_component = 0.9
-    elif n_true >= 2:
-        rank_component = 0.8
-    else:
-        rank_component = 0.0
+    rank_component = next(
+        (rank for min_count, rank in spec.rank_steps if n_true >= min_count), 0.0
+    )
 
     if n_true == 0:
         rank_confidence = 0.0
     else:
-        rank_confidence = min(1.0, 0.3 + 0.1 * n_true)
+        rank_confidence = min(1.0, spec.confidence_base + spec.confidence_per_signal * n_true)
 
-    overall = 0.6 * presence + 0.3 * rank_component + 0.1 * rank_confidence
+    weights = spec.weights
+    overall = (
+        weights.presence * presence
+        + weights.rank * rank_component
+        + weights.confidence * rank_confidence
+    )
     # Clamp for safety because float math can be spicy
     overall = max(0.0, min(1.0, overall))
 
-    if overall >= 0.8:
-        badge = "excellent"
-    elif overall >= 0.6:
-        badge = "good"
-    elif overall >= 0.4:
-        badge = "fair"
-    else:
-        badge = "poor"
+    badge = next((name for name, cutoff in spec.badge_bands if overall >= cutoff), "poor")
 
     evidence_list = [f"+ {name}" for name, flag in zip(SIGNALS, present_flags) if flag]
     if not evidence_list:
@@ -296,162 +1292,2814 @@ def compute_findability(signals: dict[str, bool]) -> dict:
     return {"score": overall, "badge": badge, "evidence": evidence_list}
 
 
-@app.on_event("startup")
-def on_startup() -> None:
-    """Create tables on boot. No migrations yet, keeping it breezy."""
-    Base.metadata.create_all(bind=engine)
+# Only 2**10 signal combinations exist, so score every one of them up front.
+# Bit i of a mask means SIGNALS[i] is present.
+SIGNAL_MASK_ALL = (1 << len(SIGNALS)) - 1
+BADGES: Tuple[str, ...] = ("poor", "fair", "good", "excellent")
 
 
-def get_db() -> Generator[Session, None, None]:
-    """Yield a DB session per request and clean up after ourselves."""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def signals_to_mask(signals: dict[str, bool]) -> int:
+    """Pack a name -> bool dict into a SIGNALS bitmask."""
+    mask = 0
+    for bit, name in enumerate(SIGNALS):
+        if signals.get(name, False):
+            mask |= 1 << bit
+    return mask
 
 
-# --- Companies API ---
-@app.post("/companies", response_model=CompanyOut, status_code=201)
-def create_company(
-    payload: CompanyCreate, db: Session = Depends(get_db)
-) -> CompanyOut:
-    # Keep it simple: hydrate the model straight from the payload
-    company = Company(**payload.model_dump())
-    db.add(company)
-    db.commit()
-    db.refresh(company)
-    return company
+def mask_to_signals(mask: int) -> dict[str, bool]:
+    return {name: bool(mask >> bit & 1) for bit, name in enumerate(SIGNALS)}
 
 
-@app.get("/companies", response_model=List[CompanyOut])
-def list_companies(
-    q: Optional[str] = Query(default=None, description="Filter by name contains"),
-    db: Session = Depends(get_db),
-) -> List[CompanyOut]:
-    query = db.query(Company)
-    if q:
-        q_normalized = q.strip().lower()
-        if q_normalized:
-            query = query.filter(func.lower(Company.name).like(f"%{q_normalized}%"))
-    return query.order_by(Company.id.asc()).all()
+class ScoringModel(NamedTuple):
+    """A ScoringModelSpec compiled to per-mask outcome tables."""
 
+    version: str
+    spec: ScoringModelSpec
+    score_table: "np.ndarray"  # float64, indexed by mask
+    badge_table: "np.ndarray"  # uint8 index into BADGES, indexed by mask
 
-@app.get("/companies/{id}", response_model=CompanyOut)
-def get_company(id: int, db: Session = Depends(get_db)) -> CompanyOut:
-    company = db.get(Company, id)
-    if not company:
-        # Friendly 404: helpful and a little human
-        raise HTTPException(
-            status_code=404,
-            detail={
-                "error": "company_not_found",
-                "message": f"No company with id {id} yet... try creating one first.",
-            },
-        )
-    return company
+
+def compile_scoring_model(spec: ScoringModelSpec) -> ScoringModel:
+    outcomes = [
+        _compute_findability_reference(mask_to_signals(mask), spec)
+        for mask in range(SIGNAL_MASK_ALL + 1)
+    ]
+    return ScoringModel(
+        version=spec.version,
+        spec=spec,
+        score_table=np.array([o["score"] for o in outcomes], dtype=np.float64),
+        badge_table=np.array([BADGES.index(o["badge"]) for o in outcomes], dtype=np.uint8),
+    )
+
+
+DEFAULT_SCORING_MODEL = compile_scoring_model(
+    ScoringModelSpec(version="v1", description="The original hand-tuned rules")
+)
+# Evidence depends only on which signals are present, not on the model.
+# Indexed by mask (so a row's evidence index is its mask).
+FINDABILITY_EVIDENCE: Tuple[Tuple[str, ...], ...] = tuple(
+    tuple(_compute_findability_reference(mask_to_signals(mask), DEFAULT_SCORING_MODEL.spec)["evidence"])
+    for mask in range(SIGNAL_MASK_ALL + 1)
+)
+# The default model's tables, for code that only ever wants v1
+_SCORE_TABLE = DEFAULT_SCORING_MODEL.score_table
+_BADGE_TABLE = DEFAULT_SCORING_MODEL.badge_table
+
+
+class ScoringModelRegistry:
+    """Compiled scoring models by version, plus the active one new evaluations use.
+
+    Built-in models are always here; stored ones (the scoring_models table)
+    are compiled the first time something asks for them. Versions never
+    change once stored, so a compiled model is good forever.
+    """
+
+    def __init__(self, builtins: Iterable[ScoringModel], active_version: str) -> None:
+        self._builtins = {model.version: model for model in builtins}
+        self._models = dict(self._builtins)
+        self._lock = threading.Lock()
+        self.active_version = active_version
+        # A stored model can only be looked up once the DB is there (startup)
+        self.active: ScoringModel = self._models.get(active_version, DEFAULT_SCORING_MODEL)
+
+    def is_builtin(self, version: str) -> bool:
+        return version in self._builtins
+
+    def add(self, model: ScoringModel) -> None:
+        with self._lock:
+            self._models[model.version] = model
+
+    def get(self, db, version: str) -> Optional[ScoringModel]:
+        """The compiled model for a version, from memory or the DB; None if unknown."""
+        model = self._models.get(version)
+        if model is not None:
+            return model
+        raw = db.execute(
+            select(StoredScoringModel.spec).where(StoredScoringModel.version == version)
+        ).scalar()
+        if raw is None:
+            return None
+        model = compile_scoring_model(ScoringModelSpec.model_validate_json(raw))
+        self.add(model)
+        return model
+
+    def activate(self, db) -> None:
+        model = self.get(db, self.active_version)
+        if model is None:
+            raise RuntimeError(
+                f"SCORING_MODEL={self.active_version!r} isn't a built-in or stored scoring model."
+            )
+        self.active = model
+
+    def reset(self) -> None:
+        """Forget stored models (tests start from an empty DB)."""
+        with self._lock:
+            self._models = dict(self._builtins)
+
+
+SCORING_MODEL = os.getenv("SCORING_MODEL", DEFAULT_SCORING_MODEL.version)
+scoring_models = ScoringModelRegistry([DEFAULT_SCORING_MODEL], SCORING_MODEL)
+
+
+class FindabilityBatch(NamedTuple):
+    """Batch scoring output; badge indexes BADGES, evidence indexes FINDABILITY_EVIDENCE."""
+
+    score: Any
+    badge: Any
+    evidence: Any
+
+
+def compute_findability(signals: dict[str, bool], model: Optional[ScoringModel] = None) -> dict:
+    """Turn simple boolean hints into a score, badge, and evidence.
+
+    Same answers as the readable rules above, served from the model's
+    precomputed tables (the active model unless you pass one).
+    """
+    spans = _request_spans.get()
+    started = time.perf_counter() if spans is not None else 0.0
+    model = model or scoring_models.active
+    mask = signals_to_mask(signals)
+    result = {
+        "score": float(model.score_table[mask]),
+        "badge": BADGES[model.badge_table[mask]],
+        "evidence": list(FINDABILITY_EVIDENCE[mask]),
+    }
+    if spans is not None:
+        spans.add("scoring", time.perf_counter() - started)
+    return result
+
+
+def compute_findability_batch(
+    masks: Union[int, "np.ndarray"], model: Optional[ScoringModel] = None
+) -> FindabilityBatch:
+    """Score SIGNALS bitmasks in bulk with a model (the active one by default).
+
+    Give it one int and you get plain Python values back; give it an array
+    (ideally uint16) and you get arrays of the same shape: float64 scores,
+    uint8 badge indexes and evidence indexes.
+    """
+    model = model or scoring_models.active
+    spans = _request_spans.get()
+    if spans is None:
+        return _lookup_findability(masks, model)
+    started = time.perf_counter()
+    try:
+        return _lookup_findability(masks, model)
+    finally:
+        spans.add("scoring", time.perf_counter() - started)
+
+
+def _lookup_findability(masks: Union[int, "np.ndarray"], model: ScoringModel) -> FindabilityBatch:
+    if isinstance(masks, (int, np.integer)):
+        mask = int(masks)
+        if not 0 <= mask <= SIGNAL_MASK_ALL:
+            raise ValueError(f"Signal mask {mask} is outside 0..{SIGNAL_MASK_ALL}.")
+        return FindabilityBatch(
+            score=float(model.score_table[mask]),
+            badge=int(model.badge_table[mask]),
+            evidence=mask,
+        )
+
+    masks = np.asarray(masks)
+    if masks.dtype.kind not in "iu":
+        raise ValueError("Signal masks must be integers.")
+    if masks.size and (masks.min() < 0 or masks.max() > SIGNAL_MASK_ALL):
+        raise ValueError(f"Signal masks must be within 0..{SIGNAL_MASK_ALL}.")
+    index = masks.astype(np.intp, copy=False)
+    return FindabilityBatch(
+        score=model.score_table.take(index),
+        badge=model.badge_table.take(index),
+        evidence=masks.astype(np.uint16, copy=False),
+    )
+
+
+# --- Schema migrations (tiny, ordered, recorded in schema_migrations) ---
+# The models always describe the current schema, so a brand-new DB gets
+# everything from step 1 and later steps find nothing to do. Older DB files
+# pick up just the steps they haven't recorded yet. Every step must be safe to
+# re-run. Add new steps at the end; never renumber or edit shipped ones.
+def _migrate_base_tables(connection) -> None:
+    Base.metadata.create_all(
+        bind=connection, tables=[Company.__table__, Evaluation.__table__]
+    )
+
+
+def _migrate_evaluation_summaries(connection) -> None:
+    Base.metadata.create_all(bind=connection, tables=[EvaluationSummary.__table__])
+    ensure_evaluation_summaries(connection)
+
+
+def _migrate_jobs(connection) -> None:
+    Base.metadata.create_all(bind=connection, tables=[Job.__table__])
+
+
+def _migrate_evaluation_time_series_indexes(connection) -> None:
+    for index in Evaluation.__table__.indexes:
+        if index.name in {"ix_evaluations_company_created", "ix_evaluations_badge_created"}:
+            index.create(bind=connection, checkfirst=True)
+    # The composite index starts with company_id, so this one is dead weight
+    connection.exec_driver_sql("DROP INDEX IF EXISTS ix_evaluations_company_id")
+
+
+def _migrate_evaluation_history_index(connection) -> None:
+    # Step 5 built the company index without the id tiebreak, so history
+    # pages (ORDER BY created_at DESC, id DESC) still sorted in a temp b-tree
+    for index in inspect(connection).get_indexes("evaluations"):
+        if index["name"] == "ix_evaluations_company_created" and "id" not in index["column_names"]:
+            connection.exec_driver_sql("DROP INDEX ix_evaluations_company_created")
+    for index in Evaluation.__table__.indexes:
+        if index.name == "ix_evaluations_company_created":
+            index.create(bind=connection, checkfirst=True)
+
+
+def _migrate_company_segment_indexes(connection) -> None:
+    segment_indexes = {f"ix_companies_{field}" for field in STATS_DIMENSIONS}
+    for index in Company.__table__.indexes:
+        if index.name in segment_indexes:
+            index.create(bind=connection, checkfirst=True)
+
+
+def _migrate_evaluation_created_at_format(connection) -> None:
+    # Write-behind rows used to be stored with a ".000000" fraction, which
+    # sorts after same-second rows stamped by CURRENT_TIMESTAMP
+    if connection.dialect.name != "sqlite":
+        return
+    connection.exec_driver_sql(
+        "UPDATE evaluations SET created_at = substr(created_at, 1, 19)"
+        " WHERE created_at LIKE '%.000000'"
+    )
+
+
+def _evidence_to_mask(raw: Optional[str]) -> int:
+    # Old rows list present signals as "+ <name>"; anything else means none
+    try:
+        evidence = json.loads(raw) if raw else []
+    except ValueError:
+        return 0
+    if not isinstance(evidence, list):
+        return 0
+    present = {str(line)[2:] for line in evidence if str(line).startswith("+ ")}
+    return signals_to_mask({name: True for name in present})
+
+
+def _migrate_evaluation_signal_mask(connection) -> None:
+    """Swap the JSON evidence column for the SIGNALS bitmask.
+
+    There are at most a few thousand distinct evidence lists however long the
+    history is, so decode each one once and backfill with a single UPDATE
+    against a small lookup table.
+    """
+    columns = {col["name"] for col in inspect(connection).get_columns("evaluations")}
+    if "evidence" not in columns:
+        return
+    if "signal_mask" not in columns:
+        connection.exec_driver_sql(
+            "ALTER TABLE evaluations ADD COLUMN signal_mask SMALLINT NOT NULL DEFAULT 0"
+        )
+    # Compare as text: Postgres has no equality operator for json
+    masks = [
+        {"evidence": raw, "signal_mask": _evidence_to_mask(raw)}
+        for raw in connection.exec_driver_sql(
+            "SELECT DISTINCT CAST(evidence AS VARCHAR) FROM evaluations"
+        ).scalars()
+    ]
+    masks = [row for row in masks if row["signal_mask"]]
+    if masks:
+        # Keyed lookup table: a long CASE would be scanned once per row
+        connection.exec_driver_sql(
+            "CREATE TEMPORARY TABLE evidence_masks"
+            " (evidence VARCHAR PRIMARY KEY, signal_mask INTEGER NOT NULL)"
+        )
+        connection.execute(
+            text("INSERT INTO evidence_masks VALUES (:evidence, :signal_mask)"), masks
+        )
+        connection.exec_driver_sql(
+            "UPDATE evaluations SET signal_mask = COALESCE(("
+            " SELECT m.signal_mask FROM evidence_masks AS m"
+            " WHERE m.evidence = CAST(evaluations.evidence AS VARCHAR)), 0)"
+        )
+        connection.exec_driver_sql("DROP TABLE evidence_masks")
+    connection.exec_driver_sql("ALTER TABLE evaluations DROP COLUMN evidence")
+
+
+def _migrate_scoring_models(connection) -> None:
+    Base.metadata.create_all(bind=connection, tables=[StoredScoringModel.__table__])
+    # Everything scored so far came from the original rules, i.e. v1
+    for table_name in ("evaluations", "jobs"):
+        columns = {col["name"] for col in inspect(connection).get_columns(table_name)}
+        if "model_version" not in columns:
+            connection.exec_driver_sql(
+                f"ALTER TABLE {table_name}"
+                " ADD COLUMN model_version VARCHAR NOT NULL DEFAULT 'v1'"
+            )
+
+
+def _migrate_evaluation_confirmed_at(connection) -> None:
+    columns = {col["name"] for col in inspect(connection).get_columns("evaluations")}
+    if "confirmed_at" not in columns:
+        connection.exec_driver_sql("ALTER TABLE evaluations ADD COLUMN confirmed_at TIMESTAMP")
+
+
+MIGRATIONS: List[Tuple[int, str, Callable[[Any], None]]] = [
+    (1, "base_tables", _migrate_base_tables),
+    (2, "company_name_key", ensure_company_name_key),
+    (3, "company_search_index", ensure_company_search_index),
+    (4, "evaluation_summaries", _migrate_evaluation_summaries),
+    (5, "evaluation_time_series_indexes", _migrate_evaluation_time_series_indexes),
+    (6, "evaluation_signal_mask", _migrate_evaluation_signal_mask),
+    (7, "jobs", _migrate_jobs),
+    (8, "scoring_models", _migrate_scoring_models),
+    (9, "evaluation_confirmed_at", _migrate_evaluation_confirmed_at),
+    (10, "evaluation_history_index", _migrate_evaluation_history_index),
+    (11, "evaluation_created_at_format", _migrate_evaluation_created_at_format),
+    (12, "company_segment_indexes", _migrate_company_segment_indexes),
+]
+
+
+def migrate(connection) -> List[int]:
+    """Apply pending migrations in order; returns the versions applied.
+
+    Runs inside the caller's transaction, so a failing step leaves the DB as
+    it was.
+    """
+    connection.exec_driver_sql(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        " version INTEGER PRIMARY KEY,"
+        " name VARCHAR NOT NULL,"
+        " applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+    )
+    applied = {
+        version
+        for (version,) in connection.exec_driver_sql("SELECT version FROM schema_migrations")
+    }
+    ran: List[int] = []
+    for version, name, step in MIGRATIONS:
+        if version in applied:
+            continue
+        step(connection)
+        connection.execute(
+            text("INSERT INTO schema_migrations (version, name) VALUES (:version, :name)"),
+            {"version": version, "name": name},
+        )
+        ran.append(version)
+    return ran
+
+
+@app.on_event("startup")
+async def on_startup() -> None:
+    """Bring the schema up to date on boot, then load the active scoring model."""
+    if async_engine is not None:
+        async with async_engine.begin() as connection:
+            await connection.run_sync(migrate)
+        async with AsyncSessionLocal() as db:
+            await db.run_sync(scoring_models.activate)
+    else:
+        with engine.begin() as connection:
+            migrate(connection)
+        with SessionLocal() as db:
+            scoring_models.activate(db)
+
+
+def get_db() -> Generator[Session, None, None]:
+    """Yield a DB session per request and clean up after ourselves."""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db() -> Generator[Session, None, None]:
+    """Like get_db, but from the read-only pool; for endpoints that never write."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Async twin of get_db for DB_MODE=async."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Async twin of get_read_db for DB_MODE=async."""
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+
+# What the routes actually depend on, picked by DB_MODE
+get_session = get_async_db if DB_MODE == "async" else get_db
+get_read_session = get_async_read_db if DB_MODE == "async" else get_read_db
+
+DbSession = Union[Session, AsyncSession]
+T = TypeVar("T")
+
+
+async def run_db(db: DbSession, fn: Callable[..., T], *args: Any) -> T:
+    """Run sync-style DB code fn(session, *args) the right way for the session.
+
+    Endpoint logic is written once against the plain Session API. In async
+    mode it runs via AsyncSession.run_sync (IO awaits on the event loop);
+    in sync mode it goes to the threadpool like a plain def endpoint would.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args)
+    sample = _request_sample.get()
+    if sample is not None:
+        fn = sample.traced(fn)
+    return await run_in_threadpool(fn, db, *args)
+
+
+def _company_not_found_detail(company_id: int) -> dict:
+    # Friendly 404: helpful and a little human
+    return {
+        "error": "company_not_found",
+        "message": f"No company with id {company_id} yet... try creating one first.",
+    }
+
+
+def _company_not_found(company_id: int) -> HTTPException:
+    return HTTPException(status_code=404, detail=_company_not_found_detail(company_id))
+
+
+def _load_company(db: Session, company_id: int, *options: ORMOption) -> Company:
+    """Fetch a company or 404.
+
+    Pass loader options (e.g. ``selectinload(Company.evaluations)``) only from
+    endpoints that return that data; by default nothing extra is loaded.
+    """
+    company = db.get(Company, company_id, options=options)
+    if not company:
+        raise _company_not_found(company_id)
+    return company
+
+
+def _company_name_taken(name: str) -> HTTPException:
+    return HTTPException(
+        status_code=409,
+        detail={
+            "error": "company_name_taken",
+            "message": f"We already have a company called {name!r}... use that one or pick another name.",
+        },
+    )
+
+
+def _ensure_company_exists(db: Session, company_id: int) -> None:
+    """Cheap primary-key probe for when we only need to know it's there."""
+    if db.scalar(select(Company.id).where(Company.id == company_id)) is None:
+        raise _company_not_found(company_id)
+
+
+# --- Company read cache (serialized GET /companies/{id} bodies) ---
+COMPANY_CACHE_SIZE = _env_int("COMPANY_CACHE_SIZE", 10_000)
+COMPANY_CACHE_TTL_SECONDS = _env_int("COMPANY_CACHE_TTL_SECONDS", 300)
+
+COMPANY_CACHE_HITS = Counter("company_cache_hits", "GET /companies/{id} served from cache")
+COMPANY_CACHE_MISSES = Counter("company_cache_misses", "GET /companies/{id} loaded from the DB")
+COMPANY_CACHE_EVICTIONS = Counter(
+    "company_cache_evictions", "Company cache entries pushed out by the size bound"
+)
+
+
+class CachedBody(NamedTuple):
+    expires_at: float
+    body: bytes
+    etag: str
+
+
+class CompanyCache:
+    """LRU + TTL cache of ready-to-send JSON bodies, keyed by company id.
+
+    Writers call invalidate() after they commit. Like StatsCache, a
+    generation counter keeps a read that raced a write from caching the
+    pre-write body.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[int, CachedBody]" = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, company_id: int) -> Optional[CachedBody]:
+        with self._lock:
+            entry = self._entries.get(company_id)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                del self._entries[company_id]
+                entry = None
+            if entry is None:
+                COMPANY_CACHE_MISSES.inc()
+                return None
+            self._entries.move_to_end(company_id)
+        COMPANY_CACHE_HITS.inc()
+        return entry
+
+    def put(self, company_id: int, body: bytes, generation: int) -> CachedBody:
+        entry = CachedBody(
+            expires_at=time.monotonic() + self.ttl_seconds,
+            body=body,
+            etag=_strong_etag(body),
+        )
+        if self.max_entries <= 0:
+            return entry
+        with self._lock:
+            if generation != self._generation:
+                return entry  # a write landed meanwhile; serve it, don't keep it
+            self._entries[company_id] = entry
+            self._entries.move_to_end(company_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                COMPANY_CACHE_EVICTIONS.inc()
+        return entry
+
+    def invalidate(self, company_id: int) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(company_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+company_cache = CompanyCache(COMPANY_CACHE_SIZE, COMPANY_CACHE_TTL_SECONDS)
+
+
+def _strong_etag(body: bytes) -> str:
+    # Same bytes, same tag; any field change gives a new one
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 asks for this header)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+# --- Companies API ---
+# Each route is a thin async wrapper; the DB work lives in a plain function
+# taking a Session so it runs unchanged in both DB modes (see run_db).
+def _create_company(db: Session, payload: CompanyCreate) -> Company:
+    # Keep it simple: hydrate the model straight from the payload
+    company = Company(**payload.model_dump())
+    db.add(company)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise _company_name_taken(payload.name)
+    db.refresh(company)
+    company_cache.invalidate(company.id)
+    return company
+
+
+@app.post("/companies", response_model=CompanyOut, status_code=201)
+async def create_company(
+    payload: CompanyCreate, db: DbSession = Depends(get_session)
+) -> CompanyOut:
+    return await run_db(db, _create_company, payload)
+
+
+def _get_or_create_company(
+    db: Session, payload: CompanyCreate
+) -> Tuple[Company, bool]:
+    by_key = select(Company).where(Company.name_key == company_name_key(payload.name))
+    company = db.scalar(by_key)
+    if company:
+        return company, False
+
+    company = Company(**payload.model_dump())
+    db.add(company)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Someone created it between our lookup and insert; theirs wins
+        db.rollback()
+        company = db.scalar(by_key)
+        if company is None:
+            raise
+        return company, False
+    db.refresh(company)
+    company_cache.invalidate(company.id)
+    return company, True
+
+
+@app.post("/companies/get-or-create", response_model=CompanyOut)
+async def get_or_create_company(
+    payload: CompanyCreate, response: Response, db: DbSession = Depends(get_session)
+) -> CompanyOut:
+    """Return the company with this name, creating it first if needed.
+
+    Names match case- and whitespace-insensitively. 200 means it already
+    existed (other fields are left alone), 201 means we just made it.
+    """
+    company, created = await run_db(db, _get_or_create_company, payload)
+    if created:
+        response.status_code = 201
+    return company
+
+
+# Page sizes for GET /companies; big enough to be useful, small enough to stay cheap
+COMPANY_PAGE_DEFAULT = 100
+COMPANY_PAGE_MAX = 1000
+# Rows pulled per fetch while streaming NDJSON
+COMPANY_STREAM_CHUNK = 500
+
+
+def _companies_ndjson(chunk: List[Company]) -> Union[str, bytes]:
+    if FAST_JSON:
+        return b"".join(orjson.dumps(_company_dict(company)) + b"\n" for company in chunk)
+    return "".join(
+        CompanyOut.model_validate(company).model_dump_json() + "\n" for company in chunk
+    )
+
+
+def _stream_companies(
+    bind,
+    statement,
+    encode: Callable[[List[Company]], Union[str, bytes]] = _companies_ndjson,
+    head: str = "",
+) -> Iterator[Union[str, bytes]]:
+    """Yield companies as text, one chunk of rows at a time (NDJSON by default).
+
+    Uses its own session because the request-scoped one can be closed
+    before the client finishes reading the body.
+    """
+    if head:
+        yield head
+    with Session(bind=bind) as stream_db:
+        result = stream_db.execute(
+            statement.execution_options(yield_per=COMPANY_STREAM_CHUNK)
+        )
+        for chunk in result.scalars().partitions():
+            yield encode(chunk)
+
+
+async def _stream_companies_async(
+    bind: AsyncEngine,
+    statement,
+    encode: Callable[[List[Company]], Union[str, bytes]] = _companies_ndjson,
+    head: str = "",
+) -> AsyncIterator[Union[str, bytes]]:
+    """Async twin of _stream_companies for DB_MODE=async."""
+    if head:
+        yield head
+    async with AsyncSession(bind=bind) as stream_db:
+        result = await stream_db.stream_scalars(
+            statement.execution_options(yield_per=COMPANY_STREAM_CHUNK)
+        )
+        async for chunk in result.partitions():
+            yield encode(chunk)
+
+
+def _search_companies(statement, q_normalized: str, bind):
+    """Add the q filter; returns (statement, bm25 rank expression or None)."""
+    if bind.dialect.name == "sqlite" and len(q_normalized) >= COMPANY_SEARCH_MIN_CHARS:
+        fts = literal_column("companies_fts")
+        statement = statement.join(
+            _companies_fts, _companies_fts.c.rowid == Company.id
+        ).where(fts.op("MATCH")(_fts_phrase(q_normalized)))
+        return statement, func.bm25(fts, *COMPANY_SEARCH_WEIGHTS)
+
+    pattern = f"%{q_normalized}%"
+    return (
+        statement.where(
+            or_(
+                *(
+                    func.lower(getattr(Company, name)).like(pattern)
+                    for name in COMPANY_SEARCH_COLUMNS
+                )
+            )
+        ),
+        None,
+    )
+
+
+def _list_company_page(db: Session, statement, limit: int) -> List[Company]:
+    # Grab one extra row so we know whether another page exists
+    return db.scalars(statement.limit(limit + 1)).all()
+
+
+@app.get("/companies", response_model=List[CompanyOut])
+async def list_companies(
+    response: Response,
+    q: Optional[str] = Query(
+        default=None,
+        description="Substring search over name, city, industry and niche",
+    ),
+    order: Literal["id", "rank"] = Query(
+        default="id",
+        description="id: stable keyset order; rank: best search matches first (needs q)",
+    ),
+    after_id: Optional[int] = Query(
+        default=None, ge=0, description="Keyset cursor: only ids greater than this"
+    ),
+    limit: int = Query(
+        default=COMPANY_PAGE_DEFAULT, ge=1, le=COMPANY_PAGE_MAX, description="Page size"
+    ),
+    stream: bool = Query(
+        default=False, description="Stream every match as NDJSON (ignores limit)"
+    ),
+    db: DbSession = Depends(get_read_session),
+) -> List[CompanyOut]:
+    if order == "rank" and after_id is not None:
+        raise HTTPException(
+            status_code=422,
+            detail={
+                "error": "cursor_not_supported",
+                "message": "after_id only works with order=id; ranked results are a single page.",
+            },
+        )
+
+    statement = select(Company)
+    rank = None
+    if q:
+        q_normalized = q.strip().lower()
+        if q_normalized:
+            statement, rank = _search_companies(statement, q_normalized, db.get_bind())
+    if after_id is not None:
+        statement = statement.where(Company.id > after_id)
+    if order == "rank" and rank is not None:
+        statement = statement.order_by(rank, Company.id.asc())
+    else:
+        statement = statement.order_by(Company.id.asc())
+
+    if stream:
+        rows = (
+            _stream_companies_async(db.bind, statement)
+            if isinstance(db, AsyncSession)
+            else _stream_companies(db.get_bind(), statement)
+        )
+        return StreamingResponse(rows, media_type="application/x-ndjson")
+
+    companies = await run_db(db, _list_company_page, statement, limit)
+    if len(companies) > limit:
+        companies = companies[:limit]
+        if order == "id":
+            response.headers["x-next-cursor"] = str(companies[-1].id)
+    if FAST_JSON:
+        return _fast_json_response([_company_dict(c) for c in companies], response)
+    return companies
+
+
+# --- Bulk import / export (NDJSON or CSV, streamed both ways) ---
+# Rows validated and inserted per transaction during an import
+COMPANY_IMPORT_BATCH = _env_int("COMPANY_IMPORT_BATCH", 1000)
+# Per-row errors reported back; past this we just count them
+COMPANY_IMPORT_MAX_ERRORS = 1000
+COMPANY_EXPORT_FIELDS: Tuple[str, ...] = tuple(CompanyOut.model_fields)
+CompanyFileFormat = Literal["ndjson", "csv"]
+
+
+class CompanyImportError(BaseModel):
+    # 1-based record number in the upload (a CSV header doesn't count)
+    row: int
+    error: str
+    message: str
+
+
+class CompanyImportOut(BaseModel):
+    received: int
+    created: int
+    failed: int
+    errors: List[CompanyImportError]
+    errors_truncated: bool = False
+
+
+def _upload_format(request: Request, format: Optional[str]) -> str:
+    if format:
+        return format
+    content_type = request.headers.get("content-type", "")
+    return "csv" if "csv" in content_type else "ndjson"
+
+
+async def _upload_lines(request: Request) -> AsyncIterator[List[str]]:
+    """Decode the request body as it arrives; yields the complete lines of each chunk."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    async for chunk in request.stream():
+        pending += decoder.decode(chunk)
+        lines = pending.split("\n")
+        pending = lines.pop()
+        if lines:
+            yield lines
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield [pending]
+
+
+async def _ndjson_records(request: Request) -> AsyncIterator[Union[dict, str]]:
+    """Yield each NDJSON object, or an error message for a line that isn't one."""
+    async for lines in _upload_lines(request):
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                yield f"Not valid JSON: {exc}."
+                continue
+            yield record if isinstance(record, dict) else "Each line should be a JSON object."
+
+
+async def _csv_records(request: Request) -> AsyncIterator[Union[dict, str]]:
+    """Yield each CSV row as a dict keyed by the header row; blanks become None.
+
+    Quoted fields may contain newlines, so lines are glued back together
+    until their quotes balance before handing them to the csv module.
+    """
+    header: Optional[List[str]] = None
+    partial = ""
+    async for lines in _upload_lines(request):
+        records = []
+        for line in lines:
+            partial = f"{partial}\n{line}" if partial else line
+            if partial.count('"') % 2 == 0:
+                records.append(partial.rstrip("\r"))
+                partial = ""
+        for values in csv.reader(records):
+            if not values:
+                continue
+            if header is None:
+                header = [name.strip() for name in values]
+                continue
+            if len(values) != len(header):
+                yield f"Expected {len(header)} columns, got {len(values)}."
+                continue
+            yield {name: (value or None) for name, value in zip(header, values)}
+    if partial:
+        yield "Unterminated quoted field at the end of the file."
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+def _import_company_batch(
+    db: Session, rows: List[Tuple[int, dict]]
+) -> Tuple[List[int], List[CompanyImportError]]:
+    """Insert one batch of validated rows in a single transaction.
+
+    Core inserts skip Company's @validates hook, so name_key is set here.
+    Names already taken (or repeated within the batch) are reported, not
+    fatal: ON CONFLICT DO NOTHING lets the rest of the batch through.
+    """
+    errors: List[CompanyImportError] = []
+    first_row_for_key: dict[str, int] = {}
+    fresh: List[Tuple[int, dict]] = []
+    for row, values in rows:
+        key = company_name_key(values["name"])
+        if key in first_row_for_key:
+            errors.append(
+                CompanyImportError(
+                    row=row,
+                    error="duplicate_in_upload",
+                    message=f"Same name as row {first_row_for_key[key]}.",
+                )
+            )
+            continue
+        first_row_for_key[key] = row
+        fresh.append((row, {**values, "name_key": key}))
+    if not fresh:
+        return [], errors
+
+    statement = (
+        _upsert(db, Company)
+        .on_conflict_do_nothing(index_elements=[Company.name_key])
+        .returning(Company.id, Company.name_key)
+    )
+    inserted = {
+        name_key: company_id
+        for company_id, name_key in db.execute(statement, [values for _, values in fresh])
+    }
+    db.commit()
+
+    for row, values in fresh:
+        if values["name_key"] not in inserted:
+            errors.append(
+                CompanyImportError(
+                    row=row,
+                    error="company_name_taken",
+                    message=f"We already have a company called {values['name']!r}.",
+                )
+            )
+    return list(inserted.values()), errors
+
+
+@app.post("/companies/import", response_model=CompanyImportOut)
+async def import_companies(
+    request: Request,
+    format: Optional[CompanyFileFormat] = Query(
+        default=None, description="Defaults from Content-Type (text/csv → csv, else ndjson)"
+    ),
+    db: DbSession = Depends(get_session),
+) -> CompanyImportOut:
+    """Bulk-create companies from an NDJSON or CSV upload.
+
+    The body is read as a stream and committed every COMPANY_IMPORT_BATCH
+    rows, so a big file never sits in memory and a bad row only costs itself.
+    """
+    records = (
+        _csv_records(request)
+        if _upload_format(request, format) == "csv"
+        else _ndjson_records(request)
+    )
+    summary = CompanyImportOut(received=0, created=0, failed=0, errors=[])
+
+    def _fail(error: CompanyImportError) -> None:
+        summary.failed += 1
+        if len(summary.errors) < COMPANY_IMPORT_MAX_ERRORS:
+            summary.errors.append(error)
+        else:
+            summary.errors_truncated = True
+
+    async def _flush(batch: List[Tuple[int, dict]]) -> None:
+        created_ids, errors = await run_db(db, _import_company_batch, batch)
+        summary.created += len(created_ids)
+        for company_id in created_ids:
+            company_cache.invalidate(company_id)
+        for error in errors:
+            _fail(error)
+
+    batch: List[Tuple[int, dict]] = []
+    async for record in records:
+        summary.received += 1
+        if isinstance(record, str):
+            _fail(CompanyImportError(row=summary.received, error="bad_record", message=record))
+            continue
+        try:
+            company = CompanyCreate.model_validate(record)
+        except ValidationError as exc:
+            _fail(
+                CompanyImportError(
+                    row=summary.received, error="invalid_row", message=_validation_message(exc)
+                )
+            )
+            continue
+        batch.append((summary.received, company.model_dump()))
+        if len(batch) >= COMPANY_IMPORT_BATCH:
+            await _flush(batch)
+            batch = []
+    if batch:
+        await _flush(batch)
+    return summary
+
+
+def _companies_csv(chunk: List[Company]) -> str:
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator="\n")
+    for company in chunk:
+        values = CompanyOut.model_validate(company).model_dump(mode="json")
+        writer.writerow(
+            ["" if values[field] is None else values[field] for field in COMPANY_EXPORT_FIELDS]
+        )
+    return out.getvalue()
+
+
+@app.get("/companies/export")
+async def export_companies(
+    format: CompanyFileFormat = Query(default="ndjson"),
+    db: DbSession = Depends(get_read_session),
+) -> StreamingResponse:
+    """Every company, streamed from a server-side cursor in id order.
+
+    The CSV has a header row and imports straight back (id and created_at
+    are ignored on the way in).
+    """
+    statement = select(Company).order_by(Company.id.asc())
+    encode, head, media_type = _companies_ndjson, "", "application/x-ndjson"
+    if format == "csv":
+        encode, media_type = _companies_csv, "text/csv"
+        head = ",".join(COMPANY_EXPORT_FIELDS) + "\n"
+    rows = (
+        _stream_companies_async(db.bind, statement, encode, head)
+        if isinstance(db, AsyncSession)
+        else _stream_companies(db.get_bind(), statement, encode, head)
+    )
+    return StreamingResponse(
+        rows,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="companies.{format}"'},
+    )
+
+
+def _load_company_body(db: Session, id: int) -> bytes:
+    company = _load_company(db, id)
+    if FAST_JSON:
+        return orjson.dumps(_company_dict(company))
+    return CompanyOut.model_validate(company).model_dump_json().encode()
+
+
+@app.get(
+    "/companies/{id}",
+    response_model=CompanyOut,
+    responses={304: {"description": "Unchanged since the ETag in If-None-Match"}},
+)
+async def get_company(
+    id: int, request: Request, db: DbSession = Depends(get_read_session)
+) -> Response:
+    """One company, from the read cache when we can; supports If-None-Match."""
+    entry = company_cache.get(id)
+    if entry is None:
+        generation = company_cache.generation
+        body = await run_db(db, _load_company_body, id)
+        entry = company_cache.put(id, body, generation)
+
+    headers = {"ETag": entry.etag}
+    if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(entry.body, media_type="application/json", headers=headers)
+
+
+def _update_company(db: Session, id: int, payload: CompanyUpdate) -> Company:
+    company = _load_company(db, id)
+
+    # Only change what's explicitly sent; leave the rest alone
+    updates = payload.model_dump(exclude_unset=True)
+    if not updates:
+        return company  # nothing to do, nothing to change
+
+    old_segment = _company_segment(company)
+    # Small, readable loop beats clever one-liners here
+    for field_name, field_value in updates.items():
+        if field_name in {"id", "created_at"}:
+            continue  # keep identity and timestamps untouched
+        setattr(company, field_name, field_value)
+    new_segment = _company_segment(company)
+
+    db.add(company)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise _company_name_taken(updates["name"])
+    if new_segment != old_segment:
+        # Its evaluations now count towards a different segment in /stats
+        stats_cache.invalidate([old_segment, new_segment])
+    db.refresh(company)
+    company_cache.invalidate(id)
+    return company
+
+
+@app.patch("/companies/{id}", response_model=CompanyOut)
+async def update_company(
+    id: int, payload: CompanyUpdate, db: DbSession = Depends(get_session)
+) -> CompanyOut:
+    return await run_db(db, _update_company, id, payload)
+
+
+def _delete_company(db: Session, id: int) -> None:
+    company = _load_company(db, id)
+    segment = _company_segment(company)
+    db.delete(company)
+    db.commit()
+    company_cache.invalidate(id)
+    stats_cache.invalidate([segment])
+    evaluation_dedupe.forget_company(id)
+
+
+@app.delete("/companies/{id}", status_code=204)
+async def delete_company(id: int, db: DbSession = Depends(get_session)) -> None:
+    await run_db(db, _delete_company, id)
+    # 204 No Content... nothing to return and that's okay
+
+
+# --- Evaluation history + rollups ---
+def _upsert(db: Session, model):
+    """INSERT ... ON CONFLICT for whichever backend we're on."""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql_insert(model)
+    return sqlite_insert(model)
+
+
+def _update_evaluation_summaries(db: Session, evaluations: List[dict]) -> None:
+    """Fold freshly inserted evaluations (in id order) into the per-company rollups.
+
+    One upsert row per company, however many evaluations it got, so a batch
+    costs a single executemany.
+    """
+    per_company: dict[int, dict] = {}
+    for ev in evaluations:
+        agg = per_company.get(ev["company_id"])
+        if agg is None:
+            per_company[ev["company_id"]] = {
+                "company_id": ev["company_id"],
+                "evaluation_count": 1,
+                "score_sum": ev["score"],
+                "score_min": ev["score"],
+                "score_max": ev["score"],
+                "latest_evaluation_id": ev["id"],
+                "latest_score": ev["score"],
+                "latest_badge": ev["badge"],
+                "latest_at": ev["created_at"],
+            }
+            continue
+        agg["evaluation_count"] += 1
+        agg["score_sum"] += ev["score"]
+        agg["score_min"] = min(agg["score_min"], ev["score"])
+        agg["score_max"] = max(agg["score_max"], ev["score"])
+        agg["latest_evaluation_id"] = ev["id"]
+        agg["latest_score"] = ev["score"]
+        agg["latest_badge"] = ev["badge"]
+        agg["latest_at"] = ev["created_at"]
+    if not per_company:
+        return
+
+    current = EvaluationSummary.__table__.c
+    statement = _upsert(db, EvaluationSummary)
+    new = statement.excluded
+    statement = statement.on_conflict_do_update(
+        index_elements=[current.company_id],
+        set_={
+            "evaluation_count": current.evaluation_count + new.evaluation_count,
+            "score_sum": current.score_sum + new.score_sum,
+            "score_min": case(
+                (new.score_min < current.score_min, new.score_min),
+                else_=current.score_min,
+            ),
+            "score_max": case(
+                (new.score_max > current.score_max, new.score_max),
+                else_=current.score_max,
+            ),
+            "latest_evaluation_id": new.latest_evaluation_id,
+            "latest_score": new.latest_score,
+            "latest_badge": new.latest_badge,
+            "latest_at": new.latest_at,
+        },
+    )
+    db.execute(statement, list(per_company.values()))
+
+
+EVALUATION_PAGE_DEFAULT = 50
+EVALUATION_PAGE_MAX = 500
+
+
+# Cursors carry created_at exactly as the DB stored it: SQLite keeps it as
+# text, and re-rendering a parsed datetime can change the format (fractional
+# seconds), which would break ties at the same timestamp.
+def _parse_evaluation_cursor(cursor: str) -> Tuple[str, int]:
+    try:
+        created_at, evaluation_id = cursor.rsplit(",", 1)
+        return created_at, int(evaluation_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=422,
+            detail={
+                "error": "bad_cursor",
+                "message": "That cursor doesn't look like one we handed out... use x-next-cursor as-is.",
+            },
+        )
+
+
+def _list_evaluation_page(
+    db: Session, company_id: int, before: Optional[Tuple[str, int]], limit: int
+) -> List[Tuple[Evaluation, str]]:
+    _ensure_company_exists(db, company_id)
+    created_at_raw = type_coerce(Evaluation.created_at, String).label("created_at_raw")
+    statement = select(Evaluation, created_at_raw).where(
+        Evaluation.company_id == company_id
+    )
+    if before is not None:
+        statement = statement.where(
+            tuple_(Evaluation.created_at, Evaluation.id)
+            < tuple_(literal(before[0], String), literal(before[1]))
+        )
+    statement = statement.order_by(
+        Evaluation.created_at.desc(), Evaluation.id.desc()
+    ).limit(limit + 1)
+    return db.execute(statement).all()
+
+
+@app.get("/companies/{id}/evaluations", response_model=List[EvaluationOut])
+async def list_company_evaluations(
+    id: int,
+    response: Response,
+    before: Optional[str] = Query(
+        default=None, description="Keyset cursor from x-next-cursor (newest first)"
+    ),
+    limit: int = Query(
+        default=EVALUATION_PAGE_DEFAULT, ge=1, le=EVALUATION_PAGE_MAX, description="Page size"
+    ),
+    db: DbSession = Depends(get_read_session),
+) -> List[EvaluationOut]:
+    """A company's evaluation history, newest first."""
+    position = _parse_evaluation_cursor(before) if before else None
+    rows = await run_db(db, _list_evaluation_page, id, position, limit)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last, last_created_at = rows[-1]
+        response.headers["x-next-cursor"] = f"{last_created_at},{last.id}"
+    if FAST_JSON:
+        return _fast_json_response([_evaluation_dict(e) for e, _ in rows], response)
+    return [evaluation for evaluation, _ in rows]
+
+
+def _load_summary(db: Session, company_id: int) -> EvaluationSummary:
+    summary = db.get(EvaluationSummary, company_id)
+    if summary is None:
+        _ensure_company_exists(db, company_id)
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": "no_evaluations",
+                "message": f"Company {company_id} hasn't been evaluated yet... POST /evaluate first.",
+            },
+        )
+    return summary
+
+
+@app.get("/companies/{id}/summary", response_model=EvaluationSummaryOut)
+async def get_company_summary(
+    id: int, db: DbSession = Depends(get_read_session)
+) -> EvaluationSummaryOut:
+    """Latest score/badge plus running count, mean, min and max."""
+    summary = await run_db(db, _load_summary, id)
+    if FAST_JSON:
+        return _fast_json_response(_summary_dict(summary))
+    return summary
+
+
+def _list_summaries(db: Session, company_ids: List[int]) -> List[EvaluationSummary]:
+    statement = (
+        select(EvaluationSummary)
+        .where(EvaluationSummary.company_id.in_(company_ids))
+        .order_by(EvaluationSummary.company_id)
+    )
+    return db.scalars(statement).all()
+
+
+@app.get("/evaluations/summaries", response_model=List[EvaluationSummaryOut])
+async def list_evaluation_summaries(
+    company_id: List[int] = Query(
+        ..., max_length=COMPANY_PAGE_MAX, description="Repeat for each company"
+    ),
+    db: DbSession = Depends(get_read_session),
+) -> List[EvaluationSummaryOut]:
+    """Summaries for many companies at once; ids never evaluated are just absent."""
+    summaries = await run_db(db, _list_summaries, company_id)
+    if FAST_JSON:
+        return _fast_json_response([_summary_dict(s) for s in summaries])
+    return summaries
+
+
+# --- Evaluate endpoint (turn booleans into a persisted Evaluation) ---
+class EvaluateIn(BaseModel):
+    company_id: int
+    has_contact_page: bool
+    has_clear_services_page: bool
+    has_gmb_or_maps_listing: bool
+    has_recent_updates: bool
+    has_reviews_or_testimonials: bool
+    has_online_booking_or_form: bool
+    uses_basic_schema_markup: bool
+    has_consistent_name_address_phone: bool
+    has_fast_load_time_claim: bool
+    content_matches_intent: bool
+
+
+# EvaluateIn field for each signal name; fields are declared in SIGNALS order
+SIGNAL_FIELDS: dict[str, str] = dict(zip(SIGNALS, list(EvaluateIn.model_fields)[1:]))
+
+
+def _signals_from_payload(payload: EvaluateIn) -> dict[str, bool]:
+    # Map inputs to our fixed signal names so the scoring stays predictable
+    return {
+        "contact page": payload.has_contact_page,
+        "clear services page": payload.has_clear_services_page,
+        "maps/GMB listing": payload.has_gmb_or_maps_listing,
+        "recent updates": payload.has_recent_updates,
+        "reviews/testimonials": payload.has_reviews_or_testimonials,
+        "online booking/form": payload.has_online_booking_or_form,
+        "basic schema markup": payload.uses_basic_schema_markup,
+        "NAP consistent": payload.has_consistent_name_address_phone,
+        "loads fast": payload.has_fast_load_time_claim,
+        "content matches intent": payload.content_matches_intent,
+    }
+
+
+# --- Evaluate dedupe (retries and double-submits get the first answer back) ---
+EVALUATE_DEDUPE_WINDOW_SECONDS = _env_int("EVALUATE_DEDUPE_WINDOW_SECONDS", 30)
+IDEMPOTENCY_KEY_TTL_SECONDS = _env_int("IDEMPOTENCY_KEY_TTL_SECONDS", 24 * 3600)
+EVALUATE_DEDUPE_MAX_ENTRIES = _env_int("EVALUATE_DEDUPE_MAX_ENTRIES", 10_000)
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+
+class StoredEvaluation(NamedTuple):
+    expires_at: float
+    company_id: int
+    signal_mask: int
+    evaluation: EvaluationOut
+
+
+def _idempotency_key_reused(key: str) -> HTTPException:
+    return HTTPException(
+        status_code=422,
+        detail={
+            "error": "idempotency_key_reused",
+            "message": f"Idempotency-Key {key!r} was already used for a different evaluation... pick a fresh key.",
+        },
+    )
+
+
+class EvaluationDedupe:
+    """Recent /evaluate results, found by Idempotency-Key or by (company, signals).
+
+    Both lookups are LRU-bounded and expire (keys after
+    IDEMPOTENCY_KEY_TTL_SECONDS, signal vectors after the dedupe window), so
+    memory stays flat however much traffic comes through.
+    """
+
+    def __init__(self, window_seconds: float, key_ttl_seconds: float, max_entries: int) -> None:
+        self.window_seconds = window_seconds
+        self.key_ttl_seconds = key_ttl_seconds
+        self.max_entries = max_entries
+        self._by_key: "OrderedDict[str, StoredEvaluation]" = OrderedDict()
+        self._by_signals: "OrderedDict[Tuple[int, int], StoredEvaluation]" = OrderedDict()
+        # Requests still being written, so a concurrent duplicate can wait for
+        # the answer instead of racing it into the DB. Event-loop only.
+        self._in_flight: dict[tuple, asyncio.Event] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _fresh(entries: OrderedDict, lookup: Any, now: float) -> Optional[StoredEvaluation]:
+        stored = entries.get(lookup)
+        if stored is None:
+            return None
+        if stored.expires_at <= now:
+            del entries[lookup]
+            return None
+        entries.move_to_end(lookup)
+        return stored
+
+    def find(self, key: Optional[str], company_id: int, mask: int) -> Optional[EvaluationOut]:
+        """The evaluation to replay, if any; a key reused for other input is a 422."""
+        now = time.monotonic()
+        with self._lock:
+            if key is not None:
+                stored = self._fresh(self._by_key, key, now)
+                if stored is not None:
+                    if (stored.company_id, stored.signal_mask) != (company_id, mask):
+                        raise _idempotency_key_reused(key)
+                    return stored.evaluation
+            stored = self._fresh(self._by_signals, (company_id, mask), now)
+            return stored.evaluation if stored is not None else None
+
+    def remember(
+        self, key: Optional[str], company_id: int, mask: int, evaluation: EvaluationOut
+    ) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if key is not None and self.key_ttl_seconds > 0:
+                self._by_key[key] = StoredEvaluation(
+                    now + self.key_ttl_seconds, company_id, mask, evaluation
+                )
+                self._by_key.move_to_end(key)
+            if self.window_seconds > 0:
+                self._by_signals[(company_id, mask)] = StoredEvaluation(
+                    now + self.window_seconds, company_id, mask, evaluation
+                )
+                self._by_signals.move_to_end((company_id, mask))
+            for entries in (self._by_key, self._by_signals):
+                while len(entries) > self.max_entries:
+                    entries.popitem(last=False)
+
+    def supersede(self, company_ids: Iterable[int]) -> None:
+        """Stop deduping against these companies' stored signal vectors.
+
+        Called whenever a newer evaluation lands (however it got written), so
+        a repeat of an older payload scores again instead of replaying an
+        evaluation that's no longer the latest. Idempotency keys stay: a retry
+        of that exact request still gets its original answer.
+        """
+        company_ids = set(company_ids)
+        with self._lock:
+            for lookup in [k for k in self._by_signals if k[0] in company_ids]:
+                del self._by_signals[lookup]
+
+    def forget_company(self, company_id: int) -> None:
+        # Deleted companies shouldn't have evaluations replayed for them
+        with self._lock:
+            for entries in (self._by_key, self._by_signals):
+                for lookup in [k for k, v in entries.items() if v.company_id == company_id]:
+                    del entries[lookup]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._by_key.clear()
+            self._by_signals.clear()
+
+    @asynccontextmanager
+    async def claim(
+        self, key: Optional[str], company_id: int, mask: int
+    ) -> AsyncIterator[Optional[EvaluationOut]]:
+        """Yield a stored evaluation to replay, or None once this request owns the write.
+
+        Duplicates that arrive while the first copy is still writing wait for
+        it and then replay its result.
+        """
+        tokens = [("signals", company_id, mask)] + ([("key", key)] if key else [])
+        while True:
+            stored = self.find(key, company_id, mask)
+            if stored is not None:
+                yield stored
+                return
+            busy = next((self._in_flight[t] for t in tokens if t in self._in_flight), None)
+            if busy is None:
+                break
+            await busy.wait()
+
+        done = asyncio.Event()
+        for token in tokens:
+            self._in_flight[token] = done
+        try:
+            yield None
+        finally:
+            for token in tokens:
+                self._in_flight.pop(token, None)
+            done.set()
+
+
+evaluation_dedupe = EvaluationDedupe(
+    EVALUATE_DEDUPE_WINDOW_SECONDS, IDEMPOTENCY_KEY_TTL_SECONDS, EVALUATE_DEDUPE_MAX_ENTRIES
+)
+
+
+# --- Write-behind evaluations (optional: answer now, group-commit right after) ---
+# "sync" commits every /evaluate before answering. "write_behind" scores,
+# answers 202 and lets a background thread insert queued rows in group
+# commits, so bursts pay for one fsync per batch instead of one per request.
+EVALUATE_WRITE_MODE = os.getenv("EVALUATE_WRITE_MODE", "sync").lower()
+EVALUATE_QUEUE_MAX = _env_int("EVALUATE_QUEUE_MAX", 10_000)
+EVALUATE_FLUSH_MS = _env_int("EVALUATE_FLUSH_MS", 50)
+EVALUATE_FLUSH_ROWS = _env_int("EVALUATE_FLUSH_ROWS", 500)
+
+if EVALUATE_WRITE_MODE not in {"sync", "write_behind"}:
+    raise RuntimeError(
+        f"Unknown EVALUATE_WRITE_MODE {EVALUATE_WRITE_MODE!r}; use 'sync' or 'write_behind'."
+    )
+
+EVALUATION_QUEUE_DEPTH = Gauge(
+    "evaluation_queue_depth",
+    "Evaluations waiting for a write-behind group commit",
+    # Summed over the workers that are still alive when serve.py runs several
+    multiprocess_mode="livesum",
+)
+EVALUATION_COMMIT_BATCH = Histogram(
+    "evaluation_commit_batch_size",
+    "Evaluations per write-behind group commit",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000),
+)
+EVALUATION_QUEUE_REJECTED = Counter(
+    "evaluation_queue_rejected", "Evaluations turned away with 429 because the queue was full"
+)
+
+logger = logging.getLogger(__name__)
+
+
+class QueuedEvaluationOut(EvaluationOut):
+    # No id until the background group commit lands
+    id: Optional[int] = None
+    queued: bool = True
+
+
+class QueuedEvaluation(NamedTuple):
+    row: dict  # Evaluation column values, created_at included
+    segment: dict  # for /stats invalidation once it's committed
+
+
+class EvaluationWriter:
+    """Background thread that group-commits queued evaluations.
+
+    A batch closes after flush_rows rows or flush_ms since its first row,
+    whichever comes first. The queue is bounded; submit() says no when it's
+    full so the API can push back instead of buffering without limit.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        max_queue: int,
+        flush_ms: int,
+        flush_rows: int,
+    ) -> None:
+        self.session_factory = session_factory
+        self.flush_seconds = flush_ms / 1000
+        self.flush_rows = flush_rows
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="evaluation-writer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Commit everything still queued, then stop the thread."""
+        if self._thread is None:
+            return
+        self._queue.put(self._STOP)  # blocks only while the queue is full
+        self._thread.join()
+        self._thread = None
+
+    def submit(self, item: QueuedEvaluation) -> bool:
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            return False
+        # Set, not set_function: the multi-worker metrics files can't call back
+        EVALUATION_QUEUE_DEPTH.set(self.depth)
+        return True
+
+    def flush(self) -> None:
+        """Block until everything queued so far is committed."""
+        self._queue.join()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is self._STOP:
+                self._queue.task_done()
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.flush_seconds
+            while len(batch) < self.flush_rows:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(item)
+            try:
+                self._commit(batch)
+            except Exception:
+                # Keep the writer alive; these rows are lost, so say so loudly
+                logger.exception("Write-behind commit of %d evaluations failed", len(batch))
+            finally:
+                EVALUATION_QUEUE_DEPTH.set(self.depth)
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _commit(self, batch: List[QueuedEvaluation]) -> None:
+        rows = [item.row for item in batch]
+        with self.session_factory() as db:
+            try:
+                _insert_evaluations(db, rows)
+            except IntegrityError:
+                # A company was deleted while its evaluation sat in the queue;
+                # drop those rows and commit the rest
+                db.rollback()
+                known = _load_company_segments(db, (row["company_id"] for row in rows))
+                rows = [row for row in rows if row["company_id"] in known]
+                if rows:
+                    _insert_evaluations(db, rows)
+        EVALUATION_COMMIT_BATCH.observe(len(rows))
+        stats_cache.invalidate([item.segment for item in batch])
+
+
+evaluation_writer = EvaluationWriter(
+    SessionLocal, EVALUATE_QUEUE_MAX, EVALUATE_FLUSH_MS, EVALUATE_FLUSH_ROWS
+)
+
+
+def _evaluation_queue_full() -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail={
+            "error": "evaluation_queue_full",
+            "message": "We're a little swamped writing evaluations... try again in a moment.",
+        },
+        headers={"Retry-After": "1"},
+    )
+
+
+def _queue_evaluation(
+    payload: EvaluateIn, mask: int, segment: dict
+) -> QueuedEvaluationOut:
+    model = scoring_models.active
+    result = compute_findability(mask_to_signals(mask), model)
+    # Stamp it now (UTC, whole seconds like the DB default) so the answer and
+    # the row we write later agree
+    created_at = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+    row = {
+        "company_id": payload.company_id,
+        "score": result["score"],
+        "badge": result["badge"],
+        "signal_mask": mask,
+        "model_version": model.version,
+        "created_at": created_at,
+    }
+    if not evaluation_writer.submit(QueuedEvaluation(row=row, segment=segment)):
+        EVALUATION_QUEUE_REJECTED.inc()
+        raise _evaluation_queue_full()
+    return QueuedEvaluationOut(
+        company_id=payload.company_id,
+        score=result["score"],
+        badge=result["badge"],
+        evidence=result["evidence"],
+        model_version=model.version,
+        created_at=created_at,
+    )
+
+
+@app.on_event("startup")
+async def start_evaluation_writer() -> None:
+    if EVALUATE_WRITE_MODE == "write_behind":
+        evaluation_writer.start()
+
+
+@app.on_event("shutdown")
+async def stop_evaluation_writer() -> None:
+    # Drain off the event loop; the last group commit can take a moment
+    await run_in_threadpool(evaluation_writer.stop)
+
+
+def _evaluate_company(db: Session, payload: EvaluateIn) -> Evaluation:
+    # First, make sure we're scoring a real company (and note its segment)
+    segment = _load_company_segment(db, payload.company_id)
+
+    # Pure function, pure vibes — no AI, no network calls
+    mask = signals_to_mask(_signals_from_payload(payload))
+    model = scoring_models.active
+    result = compute_findability_batch(mask, model)
+
+    evaluation = Evaluation(
+        company_id=payload.company_id,
+        score=result.score,
+        badge=BADGES[result.badge],
+        signal_mask=mask,
+        model_version=model.version,
+    )
+    db.add(evaluation)
+    db.flush()  # assigns id and created_at for the summary
+    _update_evaluation_summaries(
+        db,
+        [
+            {
+                "id": evaluation.id,
+                "company_id": evaluation.company_id,
+                "score": evaluation.score,
+                "badge": evaluation.badge,
+                "created_at": evaluation.created_at,
+            }
+        ],
+    )
+    db.commit()
+    stats_cache.invalidate([segment])
+    evaluation_dedupe.supersede([payload.company_id])
+    db.refresh(evaluation)
+    return evaluation
+
+
+@app.post(
+    "/evaluate",
+    response_model=EvaluationOut,
+    status_code=201,
+    responses={
+        202: {"model": QueuedEvaluationOut, "description": "Scored; queued for write-behind"},
+        429: {"description": "Write-behind queue is full; retry shortly"},
+    },
+)
+async def evaluate_company(
+    payload: EvaluateIn,
+    idempotency_key: Optional[str] = Header(
+        default=None, max_length=IDEMPOTENCY_KEY_MAX_LENGTH
+    ),
+    db: DbSession = Depends(get_session),
+    read_db: DbSession = Depends(get_read_session),
+) -> Any:
+    """Score and store an evaluation.
+
+    A retry with the same Idempotency-Key, or the same signals for the same
+    company within the dedupe window, gets the stored evaluation back (200,
+    idempotent-replayed: true) instead of a new row. In write-behind mode the
+    answer is a 202 with no id yet; the row lands with the next group commit.
+    """
+    mask = signals_to_mask(_signals_from_payload(payload))
+    async with evaluation_dedupe.claim(idempotency_key, payload.company_id, mask) as stored:
+        if stored is not None:
+            return JSONResponse(
+                stored.model_dump(mode="json"),
+                status_code=200,
+                headers={"idempotent-replayed": "true"},
+            )
+        if evaluation_writer.running:
+            # Only an existence probe: on the read pool it never takes the
+            # write lock the flusher needs (sessions connect lazily, so the
+            # unused one costs nothing)
+            segment = await run_db(read_db, _load_company_segment, payload.company_id)
+            queued = _queue_evaluation(payload, mask, segment)
+            evaluation_dedupe.supersede([payload.company_id])
+            evaluation_dedupe.remember(idempotency_key, payload.company_id, mask, queued)
+            return JSONResponse(queued.model_dump(mode="json"), status_code=202)
+        evaluation = await run_db(db, _evaluate_company, payload)
+        result = EvaluationOut.model_validate(evaluation)
+        evaluation_dedupe.remember(idempotency_key, payload.company_id, mask, result)
+        return result
+
+
+# --- Crawl: derive the signals from the company's own website ---
+class CrawledPageOut(BaseModel):
+    kind: str
+    url: str
+    status: int
+    seconds: float
 
 
-@app.patch("/companies/{id}", response_model=CompanyOut)
-def update_company(
-    id: int, payload: CompanyUpdate, db: Session = Depends(get_db)
-) -> CompanyOut:
-    company = db.get(Company, id)
-    if not company:
+class CrawlOut(BaseModel):
+    url: str
+    signals: dict[str, bool]
+    pages: List[CrawledPageOut]
+    load_seconds: float
+    evaluation: EvaluationOut
+
+
+# One fetch pool (and response cache) for every crawl this process runs; the
+# pool opens on the first crawl
+site_crawler = crawler.Crawler()
+
+
+@app.on_event("shutdown")
+async def stop_site_crawler() -> None:
+    await site_crawler.aclose()
+
+
+def _load_crawl_target(db: Session, company_id: int) -> Company:
+    # Detached with its columns loaded and the transaction over: the crawl
+    # that follows can take seconds and mustn't hold a connection (let alone
+    # a write lock) open meanwhile
+    company = _load_company(db, company_id)
+    db.expunge(company)
+    db.rollback()
+    return company
+
+
+@app.post(
+    "/companies/{id}/crawl",
+    response_model=CrawlOut,
+    status_code=201,
+    responses={
+        422: {"description": "No website, or one that isn't an http(s) URL"},
+        502: {"description": "The website couldn't be fetched"},
+    },
+)
+async def crawl_company(
+    id: int,
+    db: DbSession = Depends(get_session),
+    read_db: DbSession = Depends(get_read_session),
+) -> CrawlOut:
+    """Fetch the company's website, derive the signals, and store an evaluation.
+
+    Unlike /evaluate there's no dedupe or write-behind here: every crawl is
+    a fresh look at the site and gets its own row. The company is read from
+    the read pool; the writer session is only used afterwards, for one short
+    transaction that stores the evaluation.
+    """
+    company = await run_db(read_db, _load_crawl_target, id)
+    if not company.website:
         raise HTTPException(
-            status_code=404,
+            status_code=422,
             detail={
-                "error": "company_not_found",
-                "message": f"No company with id {id} yet... try creating one first.",
+                "error": "no_website",
+                "message": f"Company {id} has no website to crawl... PATCH one in first.",
             },
         )
+    try:
+        report = await site_crawler.crawl(
+            company.website,
+            name=company.name,
+            city=company.city,
+            industry=company.industry,
+            niche=company.niche,
+        )
+    except crawler.BadWebsiteError as exc:
+        raise HTTPException(
+            status_code=422,
+            detail={"error": "bad_website", "message": f"Can't crawl the website: {exc}"},
+        )
+    except crawler.CrawlError as exc:
+        raise HTTPException(
+            status_code=502,
+            detail={"error": "crawl_failed", "message": f"Couldn't crawl the website: {exc}"},
+        )
 
-    # Only change what's explicitly sent; leave the rest alone
-    updates = payload.model_dump(exclude_unset=True)
-    if not updates:
-        return company  # nothing to do, nothing to change
+    payload = EvaluateIn(
+        company_id=id,
+        **{SIGNAL_FIELDS[signal]: present for signal, present in report.signals.items()},
+    )
+    evaluation = await run_db(db, _evaluate_company, payload)
+    return CrawlOut(
+        url=report.url,
+        signals=report.signals,
+        pages=[CrawledPageOut(**page._asdict()) for page in report.pages],
+        load_seconds=report.load_seconds,
+        evaluation=EvaluationOut.model_validate(evaluation),
+    )
 
-    # Small, readable loop beats clever one-liners here
-    for field_name, field_value in updates.items():
-        if field_name in {"id", "created_at"}:
-            continue  # keep identity and timestamps untouched
-        setattr(company, field_name, field_value)
 
-    db.add(company)
+# --- Batch evaluate (nightly re-scoring without ten thousand round trips) ---
+EVALUATE_BATCH_MAX = 10_000
+
+
+class EvaluateBatchIn(BaseModel):
+    items: List[EvaluateIn] = Field(min_length=1, max_length=EVALUATE_BATCH_MAX)
+
+
+class EvaluateBatchItemOut(BaseModel):
+    # Position in the request so callers can line results back up
+    index: int
+    evaluation: Optional[EvaluationOut] = None
+    error: Optional[dict] = None
+
+
+class EvaluateBatchOut(BaseModel):
+    created: int
+    failed: int
+    results: List[EvaluateBatchItemOut]
+
+
+def _load_company_segments(db: Session, company_ids: Iterable[int]) -> dict[int, dict]:
+    """Segments (see /stats) for whichever of these companies exist, by id."""
+    segment_columns = [getattr(Company, field) for field in STATS_DIMENSIONS]
+    return {
+        row.id: _company_segment(row)
+        for row in db.execute(
+            select(Company.id, *segment_columns).where(Company.id.in_(set(company_ids)))
+        )
+    }
+
+
+def _insert_evaluations(db: Session, rows: List[dict]) -> list:
+    """Bulk-insert evaluation rows, fold them into the summaries and commit.
+
+    Returns (id, created_at) per row, in row order.
+    """
+    # Single executemany with RETURNING, kept in parameter order. Plain
+    # columns (not ORM objects) so nothing needs re-loading after commit.
+    inserted = db.execute(
+        insert(Evaluation).returning(
+            Evaluation.id, Evaluation.created_at, sort_by_parameter_order=True
+        ),
+        rows,
+    ).all()
+    _update_evaluation_summaries(
+        db,
+        [
+            {"id": evaluation_id, "created_at": created_at, **row}
+            for row, (evaluation_id, created_at) in zip(rows, inserted)
+        ],
+    )
     db.commit()
-    db.refresh(company)
-    return company
+    return inserted
 
 
-@app.delete("/companies/{id}", status_code=204)
-def delete_company(id: int, db: Session = Depends(get_db)) -> None:
-    company = db.get(Company, id)
-    if not company:
+def _evaluate_batch(db: Session, payload: EvaluateBatchIn) -> EvaluateBatchOut:
+    segments = _load_company_segments(db, (item.company_id for item in payload.items))
+
+    model = scoring_models.active
+    results: List[EvaluateBatchItemOut] = []
+    rows: List[dict] = []
+    for index, item in enumerate(payload.items):
+        if item.company_id not in segments:
+            results.append(
+                EvaluateBatchItemOut(
+                    index=index, error=_company_not_found_detail(item.company_id)
+                )
+            )
+            continue
+        mask = signals_to_mask(_signals_from_payload(item))
+        result = compute_findability_batch(mask, model)
+        rows.append(
+            {
+                "company_id": item.company_id,
+                "score": result.score,
+                "badge": BADGES[result.badge],
+                "signal_mask": mask,
+                "model_version": model.version,
+            }
+        )
+        results.append(EvaluateBatchItemOut(index=index))
+
+    if rows:
+        inserted = _insert_evaluations(db, rows)
+        company_ids = {row["company_id"] for row in rows}
+        stats_cache.invalidate([segments[company_id] for company_id in company_ids])
+        evaluation_dedupe.supersede(company_ids)
+        successes = iter(zip(rows, inserted))
+        for item_result in results:
+            if item_result.error is None:
+                row, (evaluation_id, created_at) = next(successes)
+                item_result.evaluation = EvaluationOut(
+                    id=evaluation_id,
+                    company_id=row["company_id"],
+                    score=row["score"],
+                    badge=row["badge"],
+                    evidence=list(FINDABILITY_EVIDENCE[row["signal_mask"]]),
+                    model_version=model.version,
+                    created_at=created_at,
+                )
+
+    return EvaluateBatchOut(
+        created=len(rows), failed=len(results) - len(rows), results=results
+    )
+
+
+@app.post("/evaluate/batch", response_model=EvaluateBatchOut)
+async def evaluate_batch(
+    payload: EvaluateBatchIn, db: DbSession = Depends(get_session)
+) -> EvaluateBatchOut:
+    """Score many payloads in one request: one IN lookup, one bulk insert."""
+    return await run_db(db, _evaluate_batch, payload)
+
+
+# --- Delta evaluate (re-checks send only what changed) ---
+class EvaluateDeltaIn(BaseModel):
+    """Signals that changed since the company's last evaluation; leave out the rest."""
+
+    company_id: int
+    has_contact_page: Optional[bool] = None
+    has_clear_services_page: Optional[bool] = None
+    has_gmb_or_maps_listing: Optional[bool] = None
+    has_recent_updates: Optional[bool] = None
+    has_reviews_or_testimonials: Optional[bool] = None
+    has_online_booking_or_form: Optional[bool] = None
+    uses_basic_schema_markup: Optional[bool] = None
+    has_consistent_name_address_phone: Optional[bool] = None
+    has_fast_load_time_claim: Optional[bool] = None
+    content_matches_intent: Optional[bool] = None
+
+    # A misspelled signal would otherwise read as "nothing changed"
+    model_config = ConfigDict(extra="forbid")
+
+
+class EvaluateDeltaOut(BaseModel):
+    changed: bool  # False: nothing new to store, the latest evaluation was confirmed
+    signals: dict[str, bool]  # the merged vector that was scored
+    evaluation: EvaluationOut
+
+
+EVALUATION_DELTAS = Counter(
+    "evaluation_deltas", "PATCH /evaluate outcomes", ["result"]  # written|confirmed
+)
+
+
+def _delta_masks(payload: EvaluateDeltaIn) -> Tuple[int, int]:
+    """(bits the payload mentions, bits it sets), in SIGNALS bit order."""
+    known = present = 0
+    for bit, field in enumerate(SIGNAL_FIELDS.values()):
+        value = getattr(payload, field)
+        if value is None:
+            continue
+        known |= 1 << bit
+        if value:
+            present |= 1 << bit
+    return known, present
+
+
+def _evaluate_delta(db: Session, payload: EvaluateDeltaIn) -> EvaluateDeltaOut:
+    segment = _load_company_segment(db, payload.company_id)
+    known, present = _delta_masks(payload)
+    latest = db.scalar(
+        select(Evaluation)
+        .join(EvaluationSummary, EvaluationSummary.latest_evaluation_id == Evaluation.id)
+        .where(EvaluationSummary.company_id == payload.company_id)
+    )
+    if latest is None and known != SIGNAL_MASK_ALL:
+        missing = [field for bit, field in enumerate(SIGNAL_FIELDS.values()) if not known >> bit & 1]
         raise HTTPException(
-            status_code=404,
+            status_code=422,
             detail={
-                "error": "company_not_found",
-                "message": f"No company with id {id} yet... try creating one first.",
+                "error": "no_previous_evaluation",
+                "message": "Nothing to merge with yet... send every signal the first time.",
+                "missing": missing,
             },
         )
-    db.delete(company)
-    db.commit()
-    # 204 No Content... nothing to return and that's okay
 
+    base = latest.signal_mask if latest is not None else 0
+    mask = (base & ~known) | present
+    model = scoring_models.active
+    result = compute_findability_batch(mask, model)
+    score, badge = result.score, BADGES[result.badge]
+    signals = mask_to_signals(mask)
 
-# --- Evaluate endpoint (turn booleans into a persisted Evaluation) ---
-class EvaluateIn(BaseModel):
-    company_id: int
-    has_contact_page: bool
-    has_clear_services_page: bool
-    has_gmb_or_maps_listing: bool
-    has_recent_updates: bool
-    has_reviews_or_testimonials: bool
-    has_online_booking_or_form: bool
-    uses_basic_schema_markup: bool
-    has_consistent_name_address_phone: bool
-    has_fast_load_time_claim: bool
-    content_matches_intent: bool
+    # Same evidence, same score, same badge: another row would say nothing
+    # new. (Whichever model scored it; the outcome is what's compared.)
+    if latest is not None and (latest.signal_mask, latest.score, latest.badge) == (mask, score, badge):
+        latest.confirmed_at = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+        db.commit()
+        db.refresh(latest)
+        return EvaluateDeltaOut(
+            changed=False, signals=signals, evaluation=EvaluationOut.model_validate(latest)
+        )
+
+    row = {
+        "company_id": payload.company_id,
+        "score": score,
+        "badge": badge,
+        "signal_mask": mask,
+        "model_version": model.version,
+    }
+    ((evaluation_id, created_at),) = _insert_evaluations(db, [row])
+    stats_cache.invalidate([segment])
+    evaluation_dedupe.supersede([payload.company_id])
+    return EvaluateDeltaOut(
+        changed=True,
+        signals=signals,
+        evaluation=EvaluationOut(
+            id=evaluation_id,
+            evidence=list(FINDABILITY_EVIDENCE[mask]),
+            created_at=created_at,
+            **row,
+        ),
+    )
 
 
-@app.post("/evaluate", response_model=EvaluationOut, status_code=201)
-def evaluate_company(payload: EvaluateIn, db: Session = Depends(get_db)) -> EvaluationOut:
-    # First, make sure we're scoring a real company
-    company = db.get(Company, payload.company_id)
-    if not company:
+@app.patch(
+    "/evaluate",
+    response_model=EvaluateDeltaOut,
+    status_code=201,
+    responses={200: {"description": "Nothing changed; the latest evaluation was confirmed"}},
+)
+async def evaluate_delta(
+    payload: EvaluateDeltaIn, response: Response, db: DbSession = Depends(get_session)
+) -> EvaluateDeltaOut:
+    """Merge changed signals into the company's last evaluation and score the result.
+
+    Writes a new evaluation (201) only when the score, badge or evidence
+    would differ; otherwise stamps confirmed_at on the latest one (200).
+    Always a direct write: no dedupe store, no write-behind queue.
+    """
+    out = await run_db(db, _evaluate_delta, payload)
+    EVALUATION_DELTAS.labels("written" if out.changed else "confirmed").inc()
+    if not out.changed:
+        response.status_code = 200
+    return out
+
+
+# --- Segment stats (badge counts + score histograms per country/industry/...) ---
+STATS_DIMENSIONS: Tuple[str, ...] = ("country", "state", "city", "industry", "niche")
+StatsDimension = Literal["country", "state", "city", "industry", "niche"]
+STATS_CACHE_TTL_SECONDS = _env_int("STATS_CACHE_TTL_SECONDS", 60)
+STATS_CACHE_MAX_ENTRIES = _env_int("STATS_CACHE_MAX_ENTRIES", 256)
+STATS_BINS_DEFAULT = 10
+STATS_BINS_MAX = 100
+
+
+class StatsSegmentOut(BaseModel):
+    # Group-by values for this segment (null when a company left it blank)
+    key: dict[str, Optional[str]]
+    companies: int
+    score_mean: float
+    badges: dict[str, int]
+    # Company counts per equal-width score bin over [0, 1]
+    histogram: List[int]
+
+
+class StatsOut(BaseModel):
+    group_by: List[str]
+    filters: dict[str, str]
+    bins: int
+    companies: int
+    segments: List[StatsSegmentOut]
+
+
+class StatsCache:
+    """Small TTL cache for /stats answers, dropped per segment on writes.
+
+    Each entry remembers its filters, so a write for a company in, say,
+    country=US only drops entries whose filters that company matches. A
+    generation counter stops a query that raced with a write from caching
+    what it read before the write landed.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: dict[tuple, Tuple[float, dict, StatsOut]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: tuple) -> Optional[StatsOut]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            return entry[2]
+
+    def put(self, key: tuple, filters: dict, value: StatsOut, generation: int) -> None:
+        with self._lock:
+            if generation != self._generation:
+                return  # a write landed while we were computing; don't keep it
+            if key not in self._entries and len(self._entries) >= self.max_entries:
+                # Dicts keep insertion order, so this drops the oldest entry
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, filters, value)
+
+    def invalidate(self, segments: List[dict]) -> None:
+        """Drop every entry whose filters match any of these company segments."""
+        with self._lock:
+            self._generation += 1
+            stale = [
+                key
+                for key, (_, filters, _) in self._entries.items()
+                if any(
+                    all(segment.get(field) == value for field, value in filters.items())
+                    for segment in segments
+                )
+            ]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+stats_cache = StatsCache(STATS_CACHE_TTL_SECONDS, STATS_CACHE_MAX_ENTRIES)
+
+
+def _company_segment(company: Any) -> dict:
+    return {field: getattr(company, field) for field in STATS_DIMENSIONS}
+
+
+def _load_company_segment(db: Session, company_id: int) -> dict:
+    """Existence probe that also returns the fields /stats groups on."""
+    columns = [getattr(Company, field) for field in STATS_DIMENSIONS]
+    row = db.execute(select(Company.id, *columns).where(Company.id == company_id)).first()
+    if row is None:
+        raise _company_not_found(company_id)
+    return _company_segment(row)
+
+
+def _compute_stats(
+    db: Session, group_by: List[str], filters: dict, bins: int
+) -> StatsOut:
+    # Every company's latest evaluation is already one row in the summary
+    # table, so this is a join + GROUP BY, not a "latest per company" scan.
+    # Grouping by (badge, bin) too keeps the result tiny; fold it up in Python.
+    score = EvaluationSummary.latest_score
+    score_bin = case((score >= 1.0, bins - 1), else_=cast(score * bins, Integer))
+    group_columns = [getattr(Company, field) for field in group_by]
+    statement = (
+        select(
+            *group_columns,
+            EvaluationSummary.latest_badge,
+            score_bin.label("score_bin"),
+            func.count(),
+            func.sum(score),
+        )
+        .select_from(EvaluationSummary)
+        .join(Company, Company.id == EvaluationSummary.company_id)
+        .where(*(getattr(Company, field) == value for field, value in filters.items()))
+        .group_by(*group_columns, EvaluationSummary.latest_badge, score_bin)
+    )
+
+    segments: dict[tuple, dict] = {}
+    for row in db.execute(statement):
+        key = tuple(row[: len(group_by)])
+        badge, bin_index, count, score_sum = row[len(group_by) :]
+        segment = segments.get(key)
+        if segment is None:
+            segment = segments[key] = {
+                "key": dict(zip(group_by, key)),
+                "companies": 0,
+                "score_sum": 0.0,
+                "badges": dict.fromkeys(BADGES, 0),
+                "histogram": [0] * bins,
+            }
+        segment["companies"] += count
+        segment["score_sum"] += score_sum
+        segment["badges"][badge] = segment["badges"].get(badge, 0) + count
+        segment["histogram"][min(max(int(bin_index), 0), bins - 1)] += count
+
+    # Biggest segments first; ties (and null keys) in a stable order
+    ordered = sorted(
+        segments.values(),
+        key=lambda s: (-s["companies"], [(v is None, v or "") for v in s["key"].values()]),
+    )
+    return StatsOut(
+        group_by=group_by,
+        filters=filters,
+        bins=bins,
+        companies=sum(s["companies"] for s in ordered),
+        segments=[
+            StatsSegmentOut(
+                key=s["key"],
+                companies=s["companies"],
+                score_mean=s["score_sum"] / s["companies"],
+                badges=s["badges"],
+                histogram=s["histogram"],
+            )
+            for s in ordered
+        ],
+    )
+
+
+@app.get("/stats", response_model=StatsOut)
+async def company_stats(
+    group_by: List[StatsDimension] = Query(
+        default=[], description="Repeat to group by several fields"
+    ),
+    country: Optional[str] = None,
+    state: Optional[str] = None,
+    city: Optional[str] = None,
+    industry: Optional[str] = None,
+    niche: Optional[str] = None,
+    bins: int = Query(default=STATS_BINS_DEFAULT, ge=1, le=STATS_BINS_MAX),
+    db: DbSession = Depends(get_read_session),
+) -> StatsOut:
+    """Badge counts and score histograms over each company's latest evaluation."""
+    # Dedupe but keep the caller's order; it decides the key layout
+    group_by = list(dict.fromkeys(group_by))
+    candidates = {
+        "country": country,
+        "state": state,
+        "city": city,
+        "industry": industry,
+        "niche": niche,
+    }
+    filters = {field: value for field, value in candidates.items() if value is not None}
+    cache_key = (tuple(group_by), tuple(sorted(filters.items())), bins)
+
+    cached = stats_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    generation = stats_cache.generation
+    stats = await run_db(db, _compute_stats, group_by, filters, bins)
+    stats_cache.put(cache_key, filters, stats, generation)
+    return stats
+
+
+# --- Scoring models (versioned rules; compare before rescoring with one) ---
+class ScoringModelOut(BaseModel):
+    version: str
+    builtin: bool
+    active: bool  # what new evaluations are scored with (SCORING_MODEL)
+    spec: ScoringModelSpec
+    created_at: Optional[datetime] = None
+
+
+class BadgeTransitionOut(BaseModel):
+    from_badge: str
+    to_badge: str
+    companies: int
+
+
+class ScoringModelComparisonOut(BaseModel):
+    base: str
+    candidate: str
+    companies: int  # companies with at least one evaluation
+    companies_rebadged: int
+    mean_score_delta: float  # candidate minus base, over those companies
+    combinations_changed: int  # of the 1024 signal combinations
+    badge_transitions: List[BadgeTransitionOut]
+
+
+def _scoring_model_out(model: ScoringModel, created_at: Optional[datetime] = None) -> ScoringModelOut:
+    return ScoringModelOut(
+        version=model.version,
+        builtin=scoring_models.is_builtin(model.version),
+        active=model.version == scoring_models.active.version,
+        spec=model.spec,
+        created_at=created_at,
+    )
+
+
+def _load_scoring_model(db: Session, version: str) -> ScoringModel:
+    model = scoring_models.get(db, version)
+    if model is None:
         raise HTTPException(
             status_code=404,
             detail={
-                "error": "company_not_found",
-                "message": f"No company with id {payload.company_id} yet... try creating one first.",
+                "error": "scoring_model_not_found",
+                "message": f"No scoring model {version!r}... GET /scoring-models lists them.",
             },
         )
+    return model
 
-    # Map inputs to our fixed signal names so the scoring stays predictable
-    signals = {
-        "contact page": payload.has_contact_page,
-        "clear services page": payload.has_clear_services_page,
-        "maps/GMB listing": payload.has_gmb_or_maps_listing,
-        "recent updates": payload.has_recent_updates,
-        "reviews/testimonials": payload.has_reviews_or_testimonials,
-        "online booking/form": payload.has_online_booking_or_form,
-        "basic schema markup": payload.uses_basic_schema_markup,
-        "NAP consistent": payload.has_consistent_name_address_phone,
-        "loads fast": payload.has_fast_load_time_claim,
-        "content matches intent": payload.content_matches_intent,
-    }
 
-    # Pure function, pure vibes — no AI, no network calls
-    result = compute_findability(signals)
+def _list_scoring_models(db: Session) -> List[ScoringModelOut]:
+    models = [_scoring_model_out(scoring_models.get(db, DEFAULT_SCORING_MODEL.version))]
+    for version, created_at in db.execute(
+        select(StoredScoringModel.version, StoredScoringModel.created_at).order_by(
+            StoredScoringModel.created_at, StoredScoringModel.version
+        )
+    ):
+        models.append(_scoring_model_out(scoring_models.get(db, version), created_at))
+    return models
 
-    evaluation = Evaluation(
-        company_id=payload.company_id,
-        score=float(result["score"]),
-        badge=str(result["badge"]),
-        evidence=list(result["evidence"]),
+
+def _create_scoring_model(db: Session, spec: ScoringModelSpec) -> ScoringModelOut:
+    conflict = HTTPException(
+        status_code=409,
+        detail={
+            "error": "scoring_model_exists",
+            "message": f"Scoring model {spec.version!r} exists and versions never change... pick a new one.",
+        },
     )
-    db.add(evaluation)
+    if scoring_models.is_builtin(spec.version):
+        raise conflict
+    model = compile_scoring_model(spec)
+    stored = StoredScoringModel(version=spec.version, spec=spec.model_dump_json())
+    db.add(stored)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise conflict
+    db.refresh(stored)
+    scoring_models.add(model)
+    return _scoring_model_out(model, stored.created_at)
+
+
+def _compare_scoring_models(
+    db: Session, base_version: str, candidate_version: str
+) -> ScoringModelComparisonOut:
+    base = _load_scoring_model(db, base_version)
+    candidate = _load_scoring_model(db, candidate_version)
+    # How many companies currently sit on each signal combination; the
+    # tables say what each model makes of it, so that's all we need to read
+    counts = np.zeros(SIGNAL_MASK_ALL + 1, dtype=np.int64)
+    for mask, n in db.execute(
+        select(Evaluation.signal_mask, func.count())
+        .join(EvaluationSummary, EvaluationSummary.latest_evaluation_id == Evaluation.id)
+        .group_by(Evaluation.signal_mask)
+    ):
+        counts[mask] = n
+    companies = int(counts.sum())
+    delta = candidate.score_table - base.score_table
+    transitions = np.zeros((len(BADGES), len(BADGES)), dtype=np.int64)
+    np.add.at(transitions, (base.badge_table, candidate.badge_table), counts)
+    changed = (delta != 0) | (base.badge_table != candidate.badge_table)
+    return ScoringModelComparisonOut(
+        base=base.version,
+        candidate=candidate.version,
+        companies=companies,
+        companies_rebadged=int(transitions.sum() - np.trace(transitions)),
+        mean_score_delta=float(counts @ delta / companies) if companies else 0.0,
+        combinations_changed=int(np.count_nonzero(changed)),
+        badge_transitions=[
+            BadgeTransitionOut(from_badge=BADGES[a], to_badge=BADGES[b], companies=int(n))
+            for (a, b), n in np.ndenumerate(transitions)
+            if a != b and n
+        ],
+    )
+
+
+@app.get("/scoring-models", response_model=List[ScoringModelOut])
+async def list_scoring_models(db: DbSession = Depends(get_read_session)) -> List[ScoringModelOut]:
+    """Built-in and stored scoring models, oldest first."""
+    return await run_db(db, _list_scoring_models)
+
+
+@app.post("/scoring-models", response_model=ScoringModelOut, status_code=201)
+async def create_scoring_model(
+    spec: ScoringModelSpec, db: DbSession = Depends(get_session)
+) -> ScoringModelOut:
+    """Store a new scoring model version.
+
+    It's available to compare and to rescore jobs right away; new
+    evaluations switch to it when SCORING_MODEL names it (on restart).
+    """
+    return await run_db(db, _create_scoring_model, spec)
+
+
+@app.get("/scoring-models/compare", response_model=ScoringModelComparisonOut)
+async def compare_scoring_models(
+    base: str = Query(..., description="Version to compare from"),
+    candidate: str = Query(..., description="Version to compare to"),
+    db: DbSession = Depends(get_read_session),
+) -> ScoringModelComparisonOut:
+    """What switching every company's latest signals from base to candidate would do."""
+    return await run_db(db, _compare_scoring_models, base, candidate)
+
+
+@app.get("/scoring-models/{version}", response_model=ScoringModelOut)
+async def get_scoring_model(
+    version: str, db: DbSession = Depends(get_read_session)
+) -> ScoringModelOut:
+    def _get(db: Session) -> ScoringModelOut:
+        model = _load_scoring_model(db, version)
+        created_at = db.scalar(
+            select(StoredScoringModel.created_at).where(StoredScoringModel.version == version)
+        )
+        return _scoring_model_out(model, created_at)
+
+    return await run_db(db, _get)
+
+
+# --- Background jobs (re-scoring every company without HTTP in the loop) ---
+# Threads per process that run jobs; 0 leaves them for another process
+JOB_WORKERS = _env_int("JOB_WORKERS", 1)
+# Companies re-scored per transaction
+JOB_CHUNK_SIZE = _env_int("JOB_CHUNK_SIZE", 1000)
+# How often idle workers look for jobs queued by other processes
+JOB_POLL_SECONDS = _env_int("JOB_POLL_SECONDS", 2)
+# A running job whose worker has been quiet this long is presumed crashed
+JOB_STALE_SECONDS = _env_int("JOB_STALE_SECONDS", 60)
+# Tries per chunk before the job is marked failed
+JOB_CHUNK_RETRIES = 3
+
+JOB_ROWS = Counter("job_rescored_companies", "Companies re-scored by background jobs")
+
+
+class JobOut(BaseModel):
+    id: int
+    kind: str
+    status: str
+    total: int
+    processed: int
+    progress: float  # 0..1
+    throughput_per_second: Optional[float] = None
+    eta_seconds: Optional[float] = None
+    model_version: str
+    attempts: int
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class RescoreJobIn(BaseModel):
+    # None means the active model (SCORING_MODEL)
+    model_version: Optional[str] = None
+
+
+def _utcnow() -> datetime:
+    # Naive UTC, same as the CURRENT_TIMESTAMP defaults
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _job_out(job: Job, now: Optional[datetime] = None) -> JobOut:
+    throughput = eta = None
+    if job.resumed_at is not None:
+        elapsed = ((job.finished_at or now or _utcnow()) - job.resumed_at).total_seconds()
+        done_this_run = job.processed - job.processed_at_resume
+        if elapsed > 0 and done_this_run > 0:
+            throughput = done_this_run / elapsed
+    if job.status == "done":
+        eta, progress = 0.0, 1.0
+    else:
+        if job.status == "running" and throughput:
+            eta = max(job.total - job.processed, 0) / throughput
+        # Companies evaluated after the job was queued can push processed past total
+        progress = min(job.processed / job.total, 1.0) if job.total else 0.0
+    return JobOut(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        total=job.total,
+        processed=job.processed,
+        progress=progress,
+        throughput_per_second=throughput,
+        eta_seconds=eta,
+        model_version=job.model_version,
+        attempts=job.attempts,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+def _claimable_jobs(now: datetime, stale_seconds: float):
+    stale_before = now - timedelta(seconds=stale_seconds)
+    return or_(
+        Job.status == "queued",
+        and_(Job.status == "running", Job.heartbeat_at < stale_before),
+    )
+
+
+def _has_claimable_job(db: Session, stale_seconds: float) -> bool:
+    claimable = _claimable_jobs(_utcnow(), stale_seconds)
+    return db.scalar(select(Job.id).where(claimable).limit(1)) is not None
+
+
+def _claim_job(db: Session, stale_seconds: float) -> Optional[int]:
+    """Take the oldest queued (or abandoned) job; None when there's nothing to do."""
+    now = _utcnow()
+    claimable = _claimable_jobs(now, stale_seconds)
+    job_id = db.scalar(select(Job.id).where(claimable).order_by(Job.id).limit(1))
+    if job_id is None:
+        db.rollback()
+        return None
+    # Re-checked in the UPDATE so two workers can't both win the same job
+    claimed = db.execute(
+        update(Job)
+        .where(Job.id == job_id, claimable)
+        .values(
+            status="running",
+            attempts=Job.attempts + 1,
+            started_at=func.coalesce(Job.started_at, now),
+            resumed_at=now,
+            processed_at_resume=Job.processed,
+            heartbeat_at=now,
+        )
+    ).rowcount
     db.commit()
-    db.refresh(evaluation)
-    return evaluation
+    return job_id if claimed else None
+
+
+def _rescore_chunk(db: Session, job_id: int, chunk_size: int) -> bool:
+    """Re-score the next chunk of companies; False once the job is done.
+
+    Each company's latest signals go through the job's scoring model and
+    come out as a new evaluation row.
+    """
+    cursor, model_version = db.execute(
+        select(Job.cursor, Job.model_version).where(Job.id == job_id)
+    ).one()
+    model = scoring_models.get(db, model_version)
+    if model is None:
+        raise LookupError(f"Scoring model {model_version!r} is gone")
+    rows = db.execute(
+        select(EvaluationSummary.company_id, Evaluation.signal_mask)
+        .join(Evaluation, Evaluation.id == EvaluationSummary.latest_evaluation_id)
+        .where(EvaluationSummary.company_id > cursor)
+        .order_by(EvaluationSummary.company_id)
+        .limit(chunk_size)
+    ).all()
+    now = _utcnow()
+    if not rows:
+        db.execute(
+            update(Job)
+            .where(Job.id == job_id)
+            .values(status="done", finished_at=now, heartbeat_at=now)
+        )
+        db.commit()
+        return False
+
+    masks = np.fromiter((mask for _, mask in rows), dtype=np.uint16, count=len(rows))
+    result = compute_findability_batch(masks, model)
+    evaluations = [
+        {
+            "company_id": company_id,
+            "score": score,
+            "badge": BADGES[badge],
+            "signal_mask": mask,
+            "model_version": model.version,
+        }
+        for (company_id, mask), score, badge in zip(
+            rows, result.score.tolist(), result.badge.tolist()
+        )
+    ]
+    # Progress rides in the same transaction as the rows it describes
+    db.execute(
+        update(Job)
+        .where(Job.id == job_id)
+        .values(cursor=rows[-1][0], processed=Job.processed + len(rows), heartbeat_at=now)
+    )
+    _insert_evaluations(db, evaluations)
+    evaluation_dedupe.supersede(company_id for company_id, _ in rows)
+    JOB_ROWS.inc(len(rows))
+    return True
+
+
+def _finish_job(db: Session, job_id: int, status: str, error: Optional[str] = None) -> None:
+    db.rollback()
+    values: dict = {"status": status, "error": error}
+    if status == "failed":
+        values["finished_at"] = _utcnow()
+    db.execute(update(Job).where(Job.id == job_id, Job.status == "running").values(**values))
+    db.commit()
+
+
+class JobRunner:
+    """Worker threads that claim jobs from the jobs table and run them chunk by chunk.
+
+    Claims go through the table, so several processes (serve.py workers) can
+    run these side by side. A job whose heartbeat goes quiet for
+    stale_seconds is picked up again from its cursor; one stopped cleanly
+    goes straight back to the queue. Idle polls look on read_session_factory
+    first, so they don't take the write lock when there's nothing to claim.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        workers: int,
+        chunk_size: int,
+        poll_seconds: float,
+        stale_seconds: float,
+        read_session_factory: Optional[Callable[[], Session]] = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.read_session_factory = read_session_factory or session_factory
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.poll_seconds = poll_seconds
+        self.stale_seconds = stale_seconds
+        self._threads: List[threading.Thread] = []
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._threads)
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stopping.clear()
+        for n in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"job-worker-{n}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        """Finish the chunk in hand, hand unfinished jobs back, stop the threads."""
+        self._stopping.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def run_pending(self) -> int:
+        """Run every claimable job to the end on this thread; returns how many."""
+        ran = 0
+        while (job_id := self._claim()) is not None:
+            self._work(job_id)
+            ran += 1
+        return ran
+
+    def _claim(self) -> Optional[int]:
+        # With BEGIN IMMEDIATE the writer's first query takes the write lock,
+        # and every worker process polls; most polls find nothing
+        with self.read_session_factory() as db:
+            if not _has_claimable_job(db, self.stale_seconds):
+                return None
+        with self.session_factory() as db:
+            return _claim_job(db, self.stale_seconds)
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                job_id = self._claim()
+            except Exception:
+                logger.exception("Couldn't check the jobs table")
+                job_id = None
+            if job_id is None:
+                self._wake.wait(self.poll_seconds)
+                self._wake.clear()
+                continue
+            self._work(job_id)
+
+    def _work(self, job_id: int) -> None:
+        failures = 0
+        with self.session_factory() as db:
+            while True:
+                if self._stopping.is_set():
+                    _finish_job(db, job_id, "queued")
+                    return
+                try:
+                    more = _rescore_chunk(db, job_id, self.chunk_size)
+                except Exception as exc:
+                    failures += 1
+                    logger.exception("Job %d chunk failed (try %d)", job_id, failures)
+                    if failures >= JOB_CHUNK_RETRIES:
+                        _finish_job(db, job_id, "failed", f"{type(exc).__name__}: {exc}")
+                        return
+                    db.rollback()
+                    continue
+                failures = 0
+                # Every company's latest score may have moved
+                stats_cache.clear()
+                if not more:
+                    return
+
+
+job_runner = JobRunner(
+    SessionLocal,
+    JOB_WORKERS,
+    JOB_CHUNK_SIZE,
+    JOB_POLL_SECONDS,
+    JOB_STALE_SECONDS,
+    read_session_factory=ReadSessionLocal,
+)
+
+
+@app.on_event("startup")
+async def start_job_runner() -> None:
+    if JOB_WORKERS > 0:
+        job_runner.start()
+
+
+@app.on_event("shutdown")
+async def stop_job_runner() -> None:
+    # Waits for the chunk in hand to commit
+    await run_in_threadpool(job_runner.stop)
+
+
+def _create_rescore_job(db: Session, model_version: Optional[str] = None) -> Tuple[Job, bool]:
+    model = _load_scoring_model(db, model_version or scoring_models.active.version)
+    active = db.scalar(
+        select(Job)
+        .where(
+            Job.kind == "rescore",
+            Job.status.in_(("queued", "running")),
+            Job.model_version == model.version,
+        )
+        .order_by(Job.id)
+        .limit(1)
+    )
+    if active is not None:
+        return active, False
+    job = Job(
+        kind="rescore",
+        status="queued",
+        model_version=model.version,
+        # Companies with at least one evaluation; the rest have no signals to re-score
+        total=db.scalar(select(func.count()).select_from(EvaluationSummary)),
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job, True
+
+
+def _load_job(db: Session, job_id: int) -> Job:
+    job = db.get(Job, job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail={"error": "job_not_found", "message": f"No job {job_id}... check the id?"},
+        )
+    return job
+
+
+@app.post(
+    "/jobs/rescore",
+    response_model=JobOut,
+    status_code=202,
+    responses={200: {"description": "A re-score is already queued or running; here it is"}},
+)
+async def start_rescore_job(
+    response: Response,
+    payload: Optional[RescoreJobIn] = None,
+    db: DbSession = Depends(get_session),
+) -> JobOut:
+    """Queue a re-score of every company's latest signals with a scoring model.
+
+    The active model unless the body names another (stored) version.
+    """
+    model_version = payload.model_version if payload is not None else None
+    job, created = await run_db(db, _create_rescore_job, model_version)
+    if created:
+        job_runner.wake()
+    else:
+        response.status_code = 200
+    return _job_out(job)
+
 
+@app.get("/jobs/{id}", response_model=JobOut)
+async def get_job(id: int, db: DbSession = Depends(get_read_session)) -> JobOut:
+    """Job status with progress, throughput over the current run, and ETA."""
+    return _job_out(await run_db(db, _load_job, id))
@@ -0,0 +1,135 @@
+"""Run the API with one uvicorn worker per usable CPU, sharing Prometheus metrics.
+
+    python serve.py
+
+- `WEB_CONCURRENCY` picks the number of worker processes (default: the CPUs
+  this process may actually use, i.e. its CPU affinity capped by a container
+  CPU quota, so a small container doesn't fork one worker per host CPU).
+- `HOST` / `PORT` set where it listens (default `0.0.0.0:8000`).
+
+Migrations run once here in the parent before any worker starts, so workers
+don't race each other through them on a fresh DB. With more than one worker,
+each process writes its metrics to `PROMETHEUS_MULTIPROC_DIR` (default: a
+`prometheus-multiproc` dir under the system temp dir, wiped on every start)
+and `/metrics` adds them up. The in-process caches live in each worker, so
+their TTLs default shorter here unless you set them yourself.
+"""
+
+import asyncio
+import os
+import shutil
+import tempfile
+from typing import Optional, Tuple
+
+import uvicorn
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Another worker may have changed a company or its stats; this bounds how long
+# a worker can serve the old copy
+MULTI_WORKER_CACHE_TTL_SECONDS = "5"
+
+# Where Linux puts the container's CPU quota (cgroup v2, then v1)
+CGROUP_V2_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+CGROUP_V1_CPU_DIR = "/sys/fs/cgroup/cpu"
+
+
+def _read_cpu_quota() -> Tuple[int, int]:
+    try:
+        # v2: "<quota> <period>", or "max <period>" when unlimited
+        with open(CGROUP_V2_CPU_MAX) as f:
+            quota, period = f.read().split()[:2]
+        return (-1 if quota == "max" else int(quota)), int(period)
+    except (OSError, ValueError):
+        pass
+    # v1: quota is -1 when unlimited
+    with open(os.path.join(CGROUP_V1_CPU_DIR, "cpu.cfs_quota_us")) as f:
+        quota = int(f.read())
+    with open(os.path.join(CGROUP_V1_CPU_DIR, "cpu.cfs_period_us")) as f:
+        period = int(f.read())
+    return quota, period
+
+
+def cgroup_cpu_limit() -> Optional[int]:
+    """Whole CPUs the container's quota allows (at least 1), or None if there's no quota."""
+    try:
+        quota, period = _read_cpu_quota()
+    except (OSError, ValueError):
+        return None
+    if quota <= 0 or period <= 0:
+        return None
+    return max(1, quota // period)
+
+
+def usable_cpus() -> int:
+    # os.cpu_count() is the host's count; a container sees the same number
+    # however few CPUs it's actually allowed
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    limit = cgroup_cpu_limit()
+    return min(cpus, limit) if limit is not None else cpus
+
+
+def worker_count() -> int:
+    configured = os.getenv("WEB_CONCURRENCY")
+    if configured:
+        return max(1, int(configured))
+    return usable_cpus()
+
+
+def _prepare_multiprocess_metrics() -> str:
+    path = os.getenv("PROMETHEUS_MULTIPROC_DIR") or os.path.join(
+        tempfile.gettempdir(), "prometheus-multiproc"
+    )
+    # Files left by the last run would be added into this one's totals
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+    return path
+
+
+async def _migrate_async(app_module) -> None:
+    async with app_module.async_engine.begin() as connection:
+        await connection.run_sync(app_module.migrate)
+    await app_module.async_engine.dispose()
+
+
+def _migrate() -> None:
+    import main as app_module
+
+    if app_module.async_engine is not None:
+        asyncio.run(_migrate_async(app_module))
+    else:
+        with app_module.engine.begin() as connection:
+            app_module.migrate(connection)
+    app_module.engine.dispose()
+
+
+def main() -> None:
+    workers = worker_count()
+    multiproc_dir = None
+    if workers > 1 or os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        # Before importing main: with the variable already set, even this
+        # process's metrics go to files, so the dir has to exist
+        multiproc_dir = _prepare_multiprocess_metrics()
+    _migrate()
+
+    if multiproc_dir:
+        # Workers are fresh interpreters that inherit this env
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = multiproc_dir
+    if workers > 1:
+        for name in ("COMPANY_CACHE_TTL_SECONDS", "STATS_CACHE_TTL_SECONDS"):
+            os.environ.setdefault(name, MULTI_WORKER_CACHE_TTL_SECONDS)
+
+    uvicorn.run(
+        "main:app",
+        app_dir=APP_DIR,
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+        workers=workers,
+    )
+
+
+if __name__ == "__main__":
+    main()
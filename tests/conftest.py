@@ -1,21 +1,42 @@
+import os
+import tempfile
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
+
+# One throwaway directory for the test session. The app's own engine (which
+# startup still migrates) points in here too, so running the suite never
+# leaves a gpt_findability.db behind in the working directory.
+TEST_DB_DIR = tempfile.mkdtemp(prefix="findability-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(TEST_DB_DIR, 'app.db')}")
+# Background job threads would poll the real DB; job tests bring their own
+os.environ.setdefault("JOB_WORKERS", "0")
+
+import main  # noqa: E402
 
-import main
 
+# The test DB file, shared by a sync and an async engine so every test can
+# run in both DB modes and still peek at the data with plain sync helpers.
+TEST_DB_PATH = os.path.join(TEST_DB_DIR, "test.db")
 
-# One engine for the test session; in-memory + StaticPool so it persists
 test_engine = create_engine(
-    "sqlite://",
+    f"sqlite:///{TEST_DB_PATH}",
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
+# NullPool: each TestClient runs its own event loop, so don't keep async
+# connections around between tests
+test_async_engine = create_async_engine(
+    f"sqlite+aiosqlite:///{TEST_DB_PATH}", poolclass=NullPool
+)
 
 
 @event.listens_for(test_engine, "connect")
+@event.listens_for(test_async_engine.sync_engine, "connect")
 def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
     cursor = dbapi_connection.cursor()
     cursor.execute("PRAGMA foreign_keys=ON")
@@ -25,29 +46,97 @@ def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
 TestingSessionLocal = sessionmaker(
     autocommit=False, autoflush=False, bind=test_engine
 )
+TestingAsyncSessionLocal = async_sessionmaker(bind=test_async_engine, autoflush=False)
+
+# For background threads (job runners) that write while the tests keep making
+# requests. test_engine's StaticPool shares one connection, so a request
+# closing its session would roll back whatever a worker hadn't committed yet.
+worker_engine = create_engine(f"sqlite:///{TEST_DB_PATH}")
+WorkerSessionLocal = sessionmaker(bind=worker_engine, autocommit=False, autoflush=False)
+
+
+def _get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def _get_async_db():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
 
 
 @pytest.fixture(scope="session", autouse=True)
 def _override_dependency() -> None:
     # Swap the app's DB dependency to our test session; keep prod DB untouched
-    def _get_db():
-        db = TestingSessionLocal()
-        try:
-            yield db
-        finally:
-            db.close()
-
-    main.app.dependency_overrides[main.get_db] = _get_db
+    main.app.dependency_overrides[main.get_session] = _get_db
+    main.app.dependency_overrides[main.get_read_session] = _get_db
     yield
     main.app.dependency_overrides.clear()
+    test_engine.dispose()
+    worker_engine.dispose()
+
+
+@pytest.fixture(params=["sync", "async"])
+def db_mode(request):
+    """Run the test against both DB modes (plain Session vs AsyncSession)."""
+    session_dependency = _get_async_db if request.param == "async" else _get_db
+    main.app.dependency_overrides[main.get_session] = session_dependency
+    main.app.dependency_overrides[main.get_read_session] = session_dependency
+    yield request.param
+    main.app.dependency_overrides[main.get_session] = _get_db
+    main.app.dependency_overrides[main.get_read_session] = _get_db
 
 
 @pytest.fixture()
-def client():
+def client(db_mode):
     # Fresh tables each test — clean slate, calm mind
     main.Base.metadata.drop_all(bind=test_engine)
     main.Base.metadata.create_all(bind=test_engine)
+    main.stats_cache.clear()
+    main.company_cache.clear()
+    main.evaluation_dedupe.clear()
+    main.scoring_models.reset()
     with TestClient(main.app) as c:
         yield c
 
 
+@pytest.fixture()
+def query_counter():
+    """Count SQL statements hitting the test DB (either engine) while the block runs."""
+    statements: list = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engines = (test_engine, test_async_engine.sync_engine)
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", _record)
+
+
+# --- Helpers the test modules share (import them from conftest) ---
+def evaluate_body(company_id: int, n_true: int = 3) -> dict:
+    """An /evaluate payload with the first n_true signals present, the rest absent."""
+    body = {"company_id": company_id}
+    for i, field in enumerate(main.SIGNAL_FIELDS.values()):
+        body[field] = i < n_true
+    return body
+
+
+def make_company(client, name: str = "Test Co", **fields) -> int:
+    r = client.post("/companies", json={"name": name, **fields})
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+def evaluate(client, company_id: int, n_true: int = 3) -> dict:
+    r = client.post("/evaluate", json=evaluate_body(company_id, n_true))
+    assert r.status_code == 201, r.text
+    return r.json()
@@ -13,8 +13,9 @@ import cli_client
 class DummyResponse:
     """Minimal response stub with the methods cli_client expects."""
 
-    def __init__(self, payload):
+    def __init__(self, payload, status_code=200):
         self._payload = payload
+        self.status_code = status_code
         self.text = str(payload)
 
     def json(self):
@@ -47,24 +48,26 @@ def _http_error(response_text: str) -> requests.HTTPError:
     return err
 
 
-def test_cli_find_or_create_company_reuses_existing(monkeypatch):
+def test_cli_find_or_create_company_reuses_existing(monkeypatch, capsys):
     responses = ["Acme Co", *_blank_optional_prompts()]
     monkeypatch.setattr(builtins, "input", _fake_input_factory(responses))
 
     existing_id = 7
 
-    def fake_get(url, *_, **__):
-        assert url == f"{cli_client.API}/companies"
-        return DummyResponse([{"id": existing_id, "name": "Acme Co"}])
+    def fake_get(*_, **__):
+        pytest.fail("Should not download the company list")
 
-    def fake_post(*_, **__):
-        pytest.fail("Should not POST when company already exists")
+    def fake_post(url, *, json=None, **__):
+        assert url == f"{cli_client.API}/companies/get-or-create"
+        assert json == {"name": "Acme Co"}
+        return DummyResponse({"id": existing_id, "name": "Acme Co"}, status_code=200)
 
     monkeypatch.setattr(cli_client.requests, "get", fake_get)
     monkeypatch.setattr(cli_client.requests, "post", fake_post)
 
     company_id = cli_client.find_or_create_company()
     assert company_id == existing_id
+    assert "Reusing company id 7 (Acme Co)." in capsys.readouterr().out
 
 
 def test_cli_find_or_create_company_creates_new(monkeypatch):
@@ -79,18 +82,13 @@ def test_cli_find_or_create_company_creates_new(monkeypatch):
     ]
     monkeypatch.setattr(builtins, "input", _fake_input_factory(responses))
 
-    def fake_get(url, *_, **__):
-        assert url == f"{cli_client.API}/companies"
-        return DummyResponse([])
-
     captured_payload = {}
 
     def fake_post(url, *, json=None, **__):
-        assert url == f"{cli_client.API}/companies"
+        assert url == f"{cli_client.API}/companies/get-or-create"
         captured_payload.update(json or {})
-        return DummyResponse({"id": 42})
+        return DummyResponse({"id": 42, "name": "Rocket Co"}, status_code=201)
 
-    monkeypatch.setattr(cli_client.requests, "get", fake_get)
     monkeypatch.setattr(cli_client.requests, "post", fake_post)
 
     company_id = cli_client.find_or_create_company()
@@ -117,17 +115,13 @@ def test_cli_main_happy_path(monkeypatch, capsys):
     responses = ["CLI Co", *_blank_optional_prompts(), *signal_inputs]
     monkeypatch.setattr(builtins, "input", _fake_input_factory(responses))
 
-    def fake_get(url, *_, **__):
-        assert url == f"{cli_client.API}/companies"
-        return DummyResponse([])
-
     company_posts: List[dict] = []
     evaluate_posts: List[dict] = []
 
     def fake_post(url, *, json=None, **__):
-        if url == f"{cli_client.API}/companies":
+        if url == f"{cli_client.API}/companies/get-or-create":
             company_posts.append(json or {})
-            return DummyResponse({"id": 1})
+            return DummyResponse({"id": 1, "name": "CLI Co"}, status_code=201)
         if url == f"{cli_client.API}/evaluate":
             evaluate_posts.append(json or {})
             return DummyResponse(
@@ -140,7 +134,6 @@ def test_cli_main_happy_path(monkeypatch, capsys):
             )
         pytest.fail(f"Unexpected POST to {url}")
 
-    monkeypatch.setattr(cli_client.requests, "get", fake_get)
     monkeypatch.setattr(cli_client.requests, "post", fake_post)
 
     cli_client.main()
@@ -200,32 +193,26 @@ def test_cli_prompt_yes_no_reprompts_on_invalid(monkeypatch, capsys):
     assert "Please answer y/yes or n/no." in captured.out
 
 
-def test_cli_find_or_create_company_handles_list_failure(monkeypatch, capsys):
+def test_cli_find_or_create_company_handles_connection_failure(monkeypatch, capsys):
     responses = ["Retry Co", *_blank_optional_prompts()]
     monkeypatch.setattr(builtins, "input", _fake_input_factory(responses))
 
     def _boom(*_, **__):
         raise requests.ConnectionError("boom")
 
-    monkeypatch.setattr(cli_client.requests, "get", _boom)
+    monkeypatch.setattr(cli_client.requests, "post", _boom)
 
     with pytest.raises(SystemExit):
         cli_client.find_or_create_company()
 
     captured = capsys.readouterr()
-    assert "Couldn't list companies: boom" in captured.err
+    assert "Couldn't find or create company: boom" in captured.err
 
 
 def test_cli_find_or_create_company_handles_post_http_error(monkeypatch, capsys):
     responses = ["Fresh Co", *_blank_optional_prompts()]
     monkeypatch.setattr(builtins, "input", _fake_input_factory(responses))
 
-    monkeypatch.setattr(
-        cli_client.requests,
-        "get",
-        lambda url, *_, **__: DummyResponse([]),
-    )
-
     def _fail_post(*_, **__):
         raise _http_error("bad payload")
 
@@ -1,5 +1,11 @@
+import json
 from typing import Any, Dict, List
 
+from sqlalchemy import text
+
+import main
+from conftest import test_engine
+
 
 def test_create_company_happy_path(client) -> None:
     payload = {"name": "Acme Co", "website": "https://acme.example"}
@@ -99,3 +105,83 @@ def test_update_company_missing_returns_404(client) -> None:
     detail = r.json()["detail"]
     assert detail["error"] == "company_not_found"
 
+
+def test_list_companies_keyset_pagination(client) -> None:
+    for i in range(5):
+        assert client.post("/companies", json={"name": f"Page Co {i}"}).status_code == 201
+
+    r = client.get("/companies?limit=2")
+    assert r.status_code == 200
+    assert [c["name"] for c in r.json()] == ["Page Co 0", "Page Co 1"]
+    cursor = r.headers["x-next-cursor"]
+
+    seen: List[str] = [c["name"] for c in r.json()]
+    while cursor:
+        r = client.get(f"/companies?limit=2&after_id={cursor}")
+        assert r.status_code == 200
+        seen.extend(c["name"] for c in r.json())
+        cursor = r.headers.get("x-next-cursor")
+
+    # Every company exactly once, and the last page has no cursor
+    assert seen == [f"Page Co {i}" for i in range(5)]
+
+
+def test_list_companies_rejects_oversized_limit(client) -> None:
+    r = client.get("/companies?limit=100000")
+    assert r.status_code == 422
+
+
+def test_list_companies_stream_ndjson(client) -> None:
+    for name in ["Acme Co", "Beta Labs", "Acme Widgets"]:
+        assert client.post("/companies", json={"name": name}).status_code == 201
+
+    r = client.get("/companies?stream=true&q=acme")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    rows: List[Dict[str, Any]] = [json.loads(line) for line in r.text.splitlines()]
+    assert [row["name"] for row in rows] == ["Acme Co", "Acme Widgets"]
+
+
+def test_create_company_rejects_duplicate_name(client) -> None:
+    assert client.post("/companies", json={"name": "Acme Co"}).status_code == 201
+    r = client.post("/companies", json={"name": "  ACME   co "})
+    assert r.status_code == 409
+    assert r.json()["detail"]["error"] == "company_name_taken"
+
+
+def test_update_company_rejects_taken_name(client) -> None:
+    client.post("/companies", json={"name": "Taken Co"})
+    cid = client.post("/companies", json={"name": "Free Co"}).json()["id"]
+    r = client.patch(f"/companies/{cid}", json={"name": "taken co"})
+    assert r.status_code == 409
+    assert client.get(f"/companies/{cid}").json()["name"] == "Free Co"
+
+
+def test_get_or_create_company_is_idempotent(client) -> None:
+    r = client.post("/companies/get-or-create", json={"name": "Rocket Co", "city": "LA"})
+    assert r.status_code == 201
+    created = r.json()
+
+    r = client.post("/companies/get-or-create", json={"name": " rocket  CO", "city": "SF"})
+    assert r.status_code == 200
+    assert r.json() == created  # existing row returned untouched
+
+    assert len(client.get("/companies").json()) == 1
+
+
+def test_name_key_backfill_keeps_oldest_duplicate(client) -> None:
+    with test_engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_companies_name_key"))
+        connection.execute(text("ALTER TABLE companies DROP COLUMN name_key"))
+        connection.execute(
+            text(
+                "INSERT INTO companies (name, created_at) VALUES "
+                "('Dup Co', CURRENT_TIMESTAMP), ('dup co', CURRENT_TIMESTAMP)"
+            )
+        )
+        main.ensure_company_name_key(connection)
+
+    first_id = client.get("/companies").json()[0]["id"]
+    r = client.post("/companies/get-or-create", json={"name": "DUP CO"})
+    assert r.status_code == 200
+    assert r.json()["id"] == first_id
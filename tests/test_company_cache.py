@@ -0,0 +1,78 @@
+from typing import List
+
+from prometheus_client import REGISTRY
+
+import main
+
+
+def _sample(name: str) -> float:
+    return REGISTRY.get_sample_value(name) or 0.0
+
+
+def test_company_reads_are_cached(client, query_counter: List[str]) -> None:
+    cid = client.post("/companies", json={"name": "Cache Co"}).json()["id"]
+    hits, misses = _sample("company_cache_hits_total"), _sample("company_cache_misses_total")
+
+    first = client.get(f"/companies/{cid}")
+    assert first.status_code == 200
+    query_counter.clear()
+    second = client.get(f"/companies/{cid}")
+
+    assert query_counter == []  # straight from the cache
+    assert first.json()["name"] == "Cache Co"
+    assert second.json() == first.json()
+    assert second.headers["etag"] == first.headers["etag"]
+    assert second.headers["content-type"] == "application/json"
+    assert _sample("company_cache_misses_total") == misses + 1
+    assert _sample("company_cache_hits_total") == hits + 1
+
+
+def test_if_none_match_returns_304(client) -> None:
+    cid = client.post("/companies", json={"name": "Etag Co"}).json()["id"]
+    etag = client.get(f"/companies/{cid}").headers["etag"]
+    assert etag.startswith('"') and etag.endswith('"')
+
+    for header in (etag, f"W/{etag}", f'"nope", {etag}', "*"):
+        r = client.get(f"/companies/{cid}", headers={"If-None-Match": header})
+        assert r.status_code == 304
+        assert r.content == b""
+        assert r.headers["etag"] == etag
+
+    r = client.get(f"/companies/{cid}", headers={"If-None-Match": '"stale"'})
+    assert r.status_code == 200
+
+
+def test_writes_invalidate_cached_company(client) -> None:
+    cid = client.post("/companies", json={"name": "Moving Co"}).json()["id"]
+    old_etag = client.get(f"/companies/{cid}").headers["etag"]
+
+    client.patch(f"/companies/{cid}", json={"city": "Austin"})
+    r = client.get(f"/companies/{cid}", headers={"If-None-Match": old_etag})
+    assert r.status_code == 200
+    assert r.json()["city"] == "Austin"
+    assert r.headers["etag"] != old_etag
+
+    client.delete(f"/companies/{cid}")
+    assert client.get(f"/companies/{cid}").status_code == 404
+
+
+def test_company_cache_bounds_and_expiry() -> None:
+    evictions = _sample("company_cache_evictions_total")
+    cache = main.CompanyCache(max_entries=2, ttl_seconds=60)
+    for company_id in (1, 2):
+        cache.put(company_id, b"{}", cache.generation)
+    cache.get(1)  # 1 is now the most recently used
+    cache.put(3, b"{}", cache.generation)
+    assert cache.get(2) is None
+    assert cache.get(1) is not None
+    assert _sample("company_cache_evictions_total") == evictions + 1
+
+    expired = main.CompanyCache(max_entries=2, ttl_seconds=0)
+    expired.put(1, b"{}", expired.generation)
+    assert expired.get(1) is None
+
+    # A write between starting a load and storing it keeps the stale body out
+    generation = cache.generation
+    cache.invalidate(5)
+    cache.put(5, b"old", generation)
+    assert cache.get(5) is None
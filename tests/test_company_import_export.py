@@ -0,0 +1,105 @@
+import csv
+import io
+import json
+
+import main
+
+
+def _ndjson(rows) -> bytes:
+    return "".join(json.dumps(row) + "\n" for row in rows).encode()
+
+
+def test_import_ndjson_reports_per_row_errors(client, monkeypatch) -> None:
+    monkeypatch.setattr(main, "COMPANY_IMPORT_BATCH", 2)  # several transactions
+    client.post("/companies", json={"name": "Already Here"})
+    body = _ndjson(
+        [
+            {"name": "Alpha", "city": "Austin"},
+            {"name": "x"},
+            {"name": "already here"},
+            {"name": "Bravo", "country": "US"},
+            {"name": "ALPHA "},
+            {"city": "No Name"},
+        ]
+    ) + b"not json\n[1, 2]\n\n"
+
+    r = client.post(
+        "/companies/import", content=body, headers={"content-type": "application/x-ndjson"}
+    )
+    assert r.status_code == 200
+    summary = r.json()
+    assert summary["received"] == 8
+    assert summary["created"] == 2
+    assert summary["failed"] == 6
+    errors = {e["row"]: e["error"] for e in summary["errors"]}
+    assert errors == {
+        2: "invalid_row",
+        3: "company_name_taken",
+        5: "company_name_taken",  # Alpha landed in an earlier batch
+        6: "invalid_row",
+        7: "bad_record",
+        8: "bad_record",
+    }
+
+    names = {c["name"] for c in client.get("/companies").json()}
+    assert names == {"Already Here", "Alpha", "Bravo"}
+    # name_key is filled in, so get-or-create finds imported rows
+    r = client.post("/companies/get-or-create", json={"name": "alpha"})
+    assert r.status_code == 200
+
+
+def test_import_csv_with_quotes_and_duplicates(client) -> None:
+    body = (
+        "name,city,industry,unused\r\n"
+        'Alpha,Austin,dental,x\r\n'
+        '"Bravo, Inc.","New\nYork",legal,\r\n'
+        "alpha,Dallas,,\r\n"
+        "Short,row\r\n"
+    ).encode()
+    r = client.post("/companies/import", content=body, headers={"content-type": "text/csv"})
+    summary = r.json()
+    assert summary["created"] == 2
+    assert {e["row"]: e["error"] for e in summary["errors"]} == {
+        3: "duplicate_in_upload",
+        4: "bad_record",
+    }
+
+    bravo = client.get("/companies", params={"q": "bravo"}).json()[0]
+    assert bravo["name"] == "Bravo, Inc."
+    assert bravo["city"] == "New\nYork"
+    assert bravo["niche"] is None
+
+
+def test_export_round_trips_through_import(client) -> None:
+    for i in range(3):
+        client.post("/companies", json={"name": f"Export Co {i}", "niche": "a,b"})
+
+    r = client.get("/companies/export", params={"format": "csv"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert [row["name"] for row in rows] == ["Export Co 0", "Export Co 1", "Export Co 2"]
+    assert rows[0]["niche"] == "a,b"
+    assert rows[0]["website"] == ""
+
+    ndjson = client.get("/companies/export")
+    assert ndjson.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line)["name"] for line in ndjson.text.splitlines()] == [
+        row["name"] for row in rows
+    ]
+
+    # Importing the export again only finds names we already have
+    summary = client.post(
+        "/companies/import", content=r.content, headers={"content-type": "text/csv"}
+    ).json()
+    assert summary["created"] == 0
+    assert {e["error"] for e in summary["errors"]} == {"company_name_taken"}
+
+
+def test_import_caps_reported_errors(client, monkeypatch) -> None:
+    monkeypatch.setattr(main, "COMPANY_IMPORT_MAX_ERRORS", 2)
+    body = b"nope\n" * 5
+    summary = client.post("/companies/import", content=body).json()
+    assert summary["failed"] == 5
+    assert len(summary["errors"]) == 2
+    assert summary["errors_truncated"] is True
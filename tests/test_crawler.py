@@ -0,0 +1,371 @@
+"""Crawler tests against a stub website served from a local thread."""
+
+import asyncio
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, Tuple
+
+import pytest
+from sqlalchemy import event
+
+import crawler
+import main
+from conftest import TestingSessionLocal, evaluate_body
+
+RECENT = (datetime.now(timezone.utc) - timedelta(days=20)).strftime("%Y-%m-%d")
+
+RICH_HOME = f"""<!doctype html>
+<html><head>
+  <title>Acme Plumbing | Emergency plumber in Springfield</title>
+  <meta name="description" content="Family plumbing since 1990">
+  <meta property="article:modified_time" content="{RECENT}T09:00:00+00:00">
+  <script type="application/ld+json">
+    {{"@context": "https://schema.org", "@type": "Plumber", "name": "Acme Plumbing",
+      "telephone": "+1 (555) 010-2030",
+      "aggregateRating": {{"@type": "AggregateRating", "ratingValue": 4.8}}}}
+  </script>
+  <script>var tracking = "call 555-999-0000";</script>
+</head><body>
+  <h1>Acme Plumbing</h1>
+  <nav>
+    <a href="/contact">Contact us</a>
+    <a href="/services">Our services</a>
+    <a href="https://calendly.com/acme/visit">Book a visit</a>
+    <a href="https://elsewhere.example/contact">Partner contact</a>
+  </nav>
+  <p>Serving Springfield. Call 555-010-2030.</p>
+  <iframe src="https://www.google.com/maps/embed?pb=acme"></iframe>
+</body></html>
+"""
+CONTACT_PAGE = """<html><body><h1>Contact</h1>
+<form action="/send"><input type="email" name="email"><textarea name="msg"></textarea></form>
+<a href="tel:+15550102030">(555) 010-2030</a></body></html>"""
+SERVICES_PAGE = "<html><body><h2>Drain cleaning</h2><p>What our customers say</p></body></html>"
+RICH_SITE = {
+    "/": (200, RICH_HOME, 0),
+    "/contact": (200, CONTACT_PAGE, 0),
+    "/services": (200, SERVICES_PAGE, 0),
+}
+BARE_HOME = """<html><head><title>Welcome</title></head><body>
+<form role="search"><input type="search" name="q"></form>
+<p>Call 555-111-2222 or 555-333-4444</p></body></html>"""
+
+
+class _StubSite:
+    """Routes: path -> (status, body, delay seconds). Counts hits and concurrency.
+
+    Drips: path -> (body, seconds between bytes), for servers that answer
+    slowly but never go quiet for long.
+    """
+
+    def __init__(self) -> None:
+        self.routes: Dict[str, Tuple[int, str, float]] = {}
+        self.drips: Dict[str, Tuple[str, float]] = {}
+        self.redirects: Dict[str, str] = {}  # path -> Location
+        self.hits: Counter = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+
+def _allow_stub_address(monkeypatch) -> None:
+    # Crawls refuse loopback; let just the stub's own address through
+    real_is_public = crawler._is_public
+    monkeypatch.setattr(
+        crawler, "_is_public", lambda address: address == "127.0.0.1" or real_is_public(address)
+    )
+
+
+@pytest.fixture
+def stub_site(monkeypatch) -> Iterator[Tuple[_StubSite, str]]:
+    site = _StubSite()
+    _allow_stub_address(monkeypatch)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 (http.server naming)
+            with site.lock:
+                site.hits[self.path] += 1
+                site.in_flight += 1
+                site.max_in_flight = max(site.max_in_flight, site.in_flight)
+            try:
+                if self.path in site.redirects:
+                    self.send_response(302)
+                    self.send_header("Location", site.redirects[self.path])
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                status, body, delay = site.routes.get(self.path, (404, "nope", 0))
+                body, interval = site.drips.get(self.path, (body, 0))
+                time.sleep(delay)
+                payload = body.encode()
+                self.send_response(200 if interval else status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                if interval:
+                    for i in range(len(payload)):
+                        self.wfile.write(payload[i : i + 1])
+                        self.wfile.flush()
+                        time.sleep(interval)
+                else:
+                    self.wfile.write(payload)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # the crawler timed out and hung up
+            finally:
+                with site.lock:
+                    site.in_flight -= 1
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    try:
+        yield site, f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _crawl(website: str, site_crawler: crawler.Crawler = None, **company) -> crawler.CrawlReport:
+    async def _go() -> crawler.CrawlReport:
+        async with (site_crawler or crawler.Crawler()) as active:
+            return await active.crawl(website, **company)
+
+    return asyncio.run(_go())
+
+
+def test_signal_names_line_up_with_scoring() -> None:
+    assert crawler.SIGNAL_NAMES == tuple(main.SIGNALS)
+    assert set(main.SIGNAL_FIELDS) == set(main.SIGNALS)
+
+
+def test_rich_site_lights_up_every_signal(stub_site) -> None:
+    site, base = stub_site
+    site.routes.update(RICH_SITE)
+    report = _crawl(
+        base, name="Acme Plumbing", city="Springfield", industry="Home services", niche="Plumbers"
+    )
+    assert report.signals == {name: True for name in crawler.SIGNAL_NAMES}
+    assert {page.kind for page in report.pages} == {"home", "contact", "services"}
+    # The off-site link and the booking host were never fetched
+    assert set(site.hits) == {"/", "/contact", "/services"}
+
+
+def test_bare_site_lights_up_nothing(stub_site) -> None:
+    site, base = stub_site
+    site.routes["/"] = (200, BARE_HOME, 0.3)
+    report = _crawl(
+        base,
+        site_crawler=crawler.Crawler(fast_load_seconds=0.1),
+        name="Bare Co",
+        city="Springfield",
+        industry="Bakery",
+    )
+    # Two different phone numbers and no name on the page: NAP isn't consistent
+    assert report.signals == {name: False for name in crawler.SIGNAL_NAMES}
+    assert report.load_seconds >= 0.3
+
+
+def test_broken_subpages_only_cost_their_signal(stub_site) -> None:
+    site, base = stub_site
+    site.routes.update({"/": (200, RICH_HOME, 0), "/services": (500, "oops", 0)})
+    report = _crawl(base, name="Acme Plumbing")
+    assert not report.signals[crawler.CONTACT]  # 404
+    assert not report.signals[crawler.SERVICES]  # 500
+    assert report.signals[crawler.SCHEMA]
+
+
+def test_per_host_limit_and_response_cache(stub_site) -> None:
+    site, base = stub_site
+    site.routes.update(
+        {
+            "/": (200, RICH_HOME, 0.05),
+            "/contact": (200, CONTACT_PAGE, 0.1),
+            "/services": (200, SERVICES_PAGE, 0.1),
+        }
+    )
+    one_at_a_time = crawler.Crawler(per_host=1)
+
+    async def _crawl_a_lot() -> None:
+        async with one_at_a_time:
+            await asyncio.gather(*(one_at_a_time.crawl(base, name="Acme") for _ in range(5)))
+            await one_at_a_time.crawl(base, name="Acme")
+            # Nothing in flight any more, so no per-host state is left behind
+            assert one_at_a_time._host_slots == {} and one_at_a_time._host_users == {}
+
+    asyncio.run(_crawl_a_lot())
+    assert site.max_in_flight == 1
+    # Six crawls, concurrent ones sharing fetches, later ones from the cache
+    assert site.hits == {"/": 1, "/contact": 1, "/services": 1}
+
+
+def test_timeouts_and_error_statuses_raise_crawl_error(stub_site) -> None:
+    site, base = stub_site
+    site.routes["/slow"] = (200, RICH_HOME, 1.0)
+    with pytest.raises(crawler.CrawlError):
+        _crawl(f"{base}/slow", site_crawler=crawler.Crawler(timeout=0.2), name="Slow Co")
+    with pytest.raises(crawler.CrawlError):
+        _crawl(f"{base}/missing", name="Missing Co")
+
+
+def test_slow_drip_hits_the_fetch_deadline(stub_site) -> None:
+    site, base = stub_site
+    # Every byte within the per-operation timeout, the whole body well past it
+    site.drips["/drip"] = ("x" * 40, 0.05)
+    start = time.monotonic()
+    with pytest.raises(crawler.CrawlError, match="within 0.3s"):
+        _crawl(f"{base}/drip", site_crawler=crawler.Crawler(timeout=0.3), name="Drip Co")
+    assert time.monotonic() - start < 1.5
+
+
+def test_malformed_links_are_skipped(stub_site) -> None:
+    site, base = stub_site
+    home = RICH_HOME.replace(
+        '<a href="/contact">', '<a href="http://[oops/about">About</a><a href="/contact">'
+    )
+    site.routes.update({**RICH_SITE, "/": (200, home, 0)})
+    report = _crawl(base, name="Acme Plumbing")
+    assert {page.kind for page in report.pages} == {"home", "contact", "services"}
+    assert set(site.hits) == {"/", "/contact", "/services"}
+
+
+@pytest.mark.parametrize("website", ["http://[::1", "ftp://example.com", "https://", "ex.com:http"])
+def test_bad_websites_are_refused_before_fetching(website) -> None:
+    with pytest.raises(crawler.BadWebsiteError):
+        crawler.normalize_website(website)
+    with pytest.raises(crawler.BadWebsiteError):
+        _crawl(website, name="Bad Co")
+
+
+@pytest.mark.parametrize("url", ["http://[::1", "http://example.com/\x7f"])
+def test_unfetchable_urls_raise_crawl_error(url) -> None:
+    async def _fetch() -> None:
+        async with crawler.Crawler() as active:
+            await active.fetch(url)
+
+    with pytest.raises(crawler.CrawlError, match="URL"):
+        asyncio.run(_fetch())
+
+
+@pytest.mark.parametrize(
+    "address",
+    ["127.0.0.1", "10.0.0.7", "192.168.1.1", "169.254.169.254", "100.64.0.1", "0.0.0.0",
+     "::1", "fe80::1", "fd00::1", "::ffff:127.0.0.1", "224.0.0.1"],
+)
+def test_non_public_addresses_are_refused(address) -> None:
+    assert not crawler._is_public(address)
+
+
+def test_public_addresses_are_fine() -> None:
+    assert crawler._is_public("93.184.216.34")
+    assert crawler._is_public("2606:4700::1111")
+
+
+def test_crawler_refuses_loopback(stub_site, monkeypatch) -> None:
+    site, base = stub_site
+    site.routes.update(RICH_SITE)
+    monkeypatch.undo()  # drop the stub's exemption: this is what prod sees
+    with pytest.raises(crawler.CrawlError, match="non-public address 127.0.0.1"):
+        _crawl(base, name="Acme")
+    localhost = base.replace("127.0.0.1", "localhost")
+    with pytest.raises(crawler.CrawlError, match="non-public address"):
+        _crawl(localhost, name="Acme")
+    assert site.hits == {}
+
+
+def test_redirects_to_private_addresses_are_refused(stub_site) -> None:
+    site, base = stub_site
+    site.routes.update(RICH_SITE)
+    site.redirects["/moved"] = "/"
+    assert _crawl(f"{base}/moved", name="Acme").url == f"{base}/"
+
+    site.redirects["/metadata"] = "http://169.254.169.254/latest/meta-data/"
+    with pytest.raises(crawler.CrawlError, match="non-public address 169.254.169.254"):
+        _crawl(f"{base}/metadata", name="Acme")
+
+
+def test_crawl_endpoint_scores_and_stores(client, stub_site) -> None:
+    site, base = stub_site
+    site.routes.update(RICH_SITE)
+    main.site_crawler.clear_cache()
+    cid = client.post(
+        "/companies",
+        json={"name": "Acme Plumbing", "website": base, "city": "Springfield", "niche": "Plumbing"},
+    ).json()["id"]
+
+    before = evaluate_body(cid, 3)
+    assert client.post("/evaluate", json=before).status_code == 201
+
+    r = client.post(f"/companies/{cid}/crawl")
+    assert r.status_code == 201, r.text
+    data = r.json()
+    assert all(data["signals"].values())
+    assert data["evaluation"]["badge"] == "excellent"
+    assert data["evaluation"]["company_id"] == cid
+    with TestingSessionLocal() as db:
+        stored = db.get(main.Evaluation, data["evaluation"]["id"])
+        assert stored.signal_mask == 0b11_1111_1111
+    # The crawl is the latest word now, so the older payload scores afresh
+    assert client.post("/evaluate", json=before).status_code == 201
+
+
+def test_crawl_holds_no_transaction_while_fetching(client, stub_site, monkeypatch) -> None:
+    site, base = stub_site
+    site.routes.update(RICH_SITE)
+    main.site_crawler.clear_cache()
+    cid = client.post("/companies", json={"name": "Acme Plumbing", "website": base}).json()["id"]
+    writer_begun = []
+    open_during_crawl = []
+
+    def _watched_writer_db():
+        db = TestingSessionLocal()
+        event.listen(db, "after_begin", lambda *args: writer_begun.append(True))
+        try:
+            yield db
+        finally:
+            db.close()
+
+    real_crawl = main.site_crawler.crawl
+
+    async def _crawl(*args, **kwargs):
+        # Under BEGIN IMMEDIATE an open writer transaction here would hold
+        # the SQLite write lock for the whole crawl
+        open_during_crawl.extend(writer_begun)
+        return await real_crawl(*args, **kwargs)
+
+    # db_mode puts the usual override back afterwards
+    main.app.dependency_overrides[main.get_session] = _watched_writer_db
+    monkeypatch.setattr(main.site_crawler, "crawl", _crawl)
+    r = client.post(f"/companies/{cid}/crawl")
+    assert r.status_code == 201, r.text
+    assert open_during_crawl == []
+    assert writer_begun  # the evaluation itself still went through the writer
+
+
+def test_crawl_endpoint_errors(client, stub_site) -> None:
+    site, base = stub_site
+    main.site_crawler.clear_cache()
+    no_site = client.post("/companies", json={"name": "Offline Co"}).json()["id"]
+    r = client.post(f"/companies/{no_site}/crawl")
+    assert r.status_code == 422
+    assert r.json()["detail"]["error"] == "no_website"
+
+    bad = client.post("/companies", json={"name": "Typo Co", "website": "http://[::1"}).json()
+    r = client.post(f"/companies/{bad['id']}/crawl")
+    assert r.status_code == 422
+    assert r.json()["detail"]["error"] == "bad_website"
+
+    broken = client.post(
+        "/companies", json={"name": "Broken Co", "website": f"{base}/gone"}
+    ).json()["id"]
+    r = client.post(f"/companies/{broken}/crawl")
+    assert r.status_code == 502
+    assert r.json()["detail"]["error"] == "crawl_failed"
+
+    assert client.post("/companies/99999/crawl").status_code == 404
@@ -0,0 +1,125 @@
+import asyncio
+
+import httpx
+from sqlalchemy import text
+
+import main
+from conftest import evaluate_body, make_company, test_engine
+
+
+def _evaluation_rows(company_id: int) -> int:
+    with test_engine.connect() as conn:
+        return conn.execute(
+            text("SELECT count(*) FROM evaluations WHERE company_id = :cid"), {"cid": company_id}
+        ).scalar_one()
+
+
+def test_idempotency_key_replays_stored_evaluation(client) -> None:
+    cid = make_company(client)
+    headers = {"Idempotency-Key": "submit-1"}
+
+    first = client.post("/evaluate", json=evaluate_body(cid), headers=headers)
+    again = client.post("/evaluate", json=evaluate_body(cid), headers=headers)
+
+    assert first.status_code == 201
+    assert again.status_code == 200
+    assert again.headers["idempotent-replayed"] == "true"
+    assert again.json() == first.json()
+    assert _evaluation_rows(cid) == 1
+
+
+def test_idempotency_key_reused_for_other_input_is_rejected(client) -> None:
+    cid = make_company(client)
+    headers = {"Idempotency-Key": "submit-2"}
+    assert client.post("/evaluate", json=evaluate_body(cid, 3), headers=headers).status_code == 201
+
+    r = client.post("/evaluate", json=evaluate_body(cid, 5), headers=headers)
+    assert r.status_code == 422
+    assert r.json()["detail"]["error"] == "idempotency_key_reused"
+    assert _evaluation_rows(cid) == 1
+
+
+def test_same_signals_within_window_are_deduped(client) -> None:
+    cid = make_company(client)
+    other = make_company(client, "Other Co")
+
+    first = client.post("/evaluate", json=evaluate_body(cid)).json()
+    repeat = client.post("/evaluate", json=evaluate_body(cid))
+    assert repeat.status_code == 200
+    assert repeat.json()["id"] == first["id"]
+
+    # Different signals or a different company are new evaluations
+    assert client.post("/evaluate", json=evaluate_body(cid, 4)).status_code == 201
+    assert client.post("/evaluate", json=evaluate_body(other)).status_code == 201
+    assert _evaluation_rows(cid) == 2
+
+
+def test_newer_evaluations_retire_the_stored_vectors(client) -> None:
+    cid = make_company(client)
+    first = client.post("/evaluate", json=evaluate_body(cid, 3), headers={"Idempotency-Key": "k"})
+    client.post("/evaluate", json=evaluate_body(cid, 4))
+
+    # 3 signals again: the 3-signal evaluation isn't the latest any more
+    again = client.post("/evaluate", json=evaluate_body(cid, 3))
+    assert again.status_code == 201
+    assert again.json()["id"] != first.json()["id"]
+    # A retry under the original key still gets its original answer
+    retry = client.post("/evaluate", json=evaluate_body(cid, 3), headers={"Idempotency-Key": "k"})
+    assert (retry.status_code, retry.json()["id"]) == (200, first.json()["id"])
+
+    # Same for evaluations written through PATCH /evaluate and the batch endpoint
+    delta = {"company_id": cid, "has_contact_page": False}
+    assert client.patch("/evaluate", json=delta).status_code == 201
+    assert client.post("/evaluate", json=evaluate_body(cid, 3)).status_code == 201
+    assert client.post("/evaluate/batch", json={"items": [evaluate_body(cid, 5)]}).status_code == 200
+    assert client.post("/evaluate", json=evaluate_body(cid, 3)).status_code == 201
+    assert _evaluation_rows(cid) == 7
+
+
+def test_dedupe_window_can_be_switched_off(client, monkeypatch) -> None:
+    monkeypatch.setattr(main.evaluation_dedupe, "window_seconds", 0)
+    cid = make_company(client)
+    assert client.post("/evaluate", json=evaluate_body(cid)).status_code == 201
+    assert client.post("/evaluate", json=evaluate_body(cid)).status_code == 201
+    assert _evaluation_rows(cid) == 2
+
+
+def test_deleted_company_is_forgotten(client) -> None:
+    cid = make_company(client)
+    client.post("/evaluate", json=evaluate_body(cid), headers={"Idempotency-Key": "k"})
+    client.delete(f"/companies/{cid}")
+
+    r = client.post("/evaluate", json=evaluate_body(cid), headers={"Idempotency-Key": "k"})
+    assert r.status_code == 404
+
+
+def test_concurrent_double_submit_writes_once(client) -> None:
+    cid = make_company(client)
+
+    async def _double_submit():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            return await asyncio.gather(
+                *(ac.post("/evaluate", json=evaluate_body(cid)) for _ in range(5))
+            )
+
+    responses = asyncio.run(_double_submit())
+    assert sorted(r.status_code for r in responses) == [200, 200, 200, 200, 201]
+    assert len({r.json()["id"] for r in responses}) == 1
+    assert _evaluation_rows(cid) == 1
+
+
+def test_dedupe_store_is_bounded_and_expires() -> None:
+    evaluation = main.EvaluationOut(
+        id=1, company_id=1, score=0.0, badge="poor", evidence=[], model_version="v1",
+        created_at="2026-01-01T00:00:00"
+    )
+    store = main.EvaluationDedupe(window_seconds=60, key_ttl_seconds=60, max_entries=2)
+    for mask in (1, 2, 3):
+        store.remember(f"key-{mask}", 1, mask, evaluation)
+    assert store.find("key-1", 1, 1) is None  # pushed out by the size bound
+    assert store.find("key-3", 1, 3) is evaluation
+
+    expired = main.EvaluationDedupe(window_seconds=0, key_ttl_seconds=0, max_entries=2)
+    expired.remember("key", 1, 1, evaluation)
+    assert expired.find("key", 1, 1) is None
@@ -0,0 +1,106 @@
+from sqlalchemy import text
+
+import main
+from conftest import evaluate_body, make_company, test_engine
+
+
+def _evaluation_rows(company_id: int) -> list:
+    with test_engine.connect() as conn:
+        return conn.execute(
+            text(
+                "SELECT signal_mask, confirmed_at FROM evaluations"
+                " WHERE company_id = :cid ORDER BY id"
+            ),
+            {"cid": company_id},
+        ).all()
+
+
+def test_unchanged_signals_confirm_instead_of_writing(client) -> None:
+    cid = make_company(client)
+    first = client.post("/evaluate", json=evaluate_body(cid)).json()
+    assert first["confirmed_at"] is None
+
+    # Re-check says the contact page is still there
+    r = client.patch("/evaluate", json={"company_id": cid, "has_contact_page": True})
+    assert r.status_code == 200
+    out = r.json()
+    assert out["changed"] is False
+    assert out["evaluation"]["id"] == first["id"]
+    assert out["evaluation"]["score"] == first["score"]
+    assert out["evaluation"]["confirmed_at"] is not None
+    assert out["signals"] == main.mask_to_signals(0b111)
+
+    # Nothing at all changed is a confirmation too
+    assert client.patch("/evaluate", json={"company_id": cid}).status_code == 200
+    rows = _evaluation_rows(cid)
+    assert len(rows) == 1 and rows[0][1] is not None
+    summary = client.get(f"/companies/{cid}/summary").json()
+    assert summary["evaluation_count"] == 1
+
+
+def test_changed_signals_merge_with_the_last_vector(client) -> None:
+    cid = make_company(client)
+    client.post("/evaluate", json=evaluate_body(cid, 3))
+
+    r = client.patch(
+        "/evaluate",
+        json={"company_id": cid, "has_clear_services_page": False, "content_matches_intent": True},
+    )
+    assert r.status_code == 201
+    out = r.json()
+    assert out["changed"] is True
+    expected = main.compute_findability(out["signals"])
+    assert out["signals"] == main.mask_to_signals(0b10_0000_0101)
+    assert out["evaluation"]["evidence"] == expected["evidence"]
+    assert out["evaluation"]["score"] == expected["score"]
+    assert out["evaluation"]["model_version"] == "v1"
+    assert out["evaluation"]["confirmed_at"] is None
+
+    assert [mask for mask, _ in _evaluation_rows(cid)] == [0b111, 0b10_0000_0101]
+    # The new row is the latest now; history and summary agree
+    history = client.get(f"/companies/{cid}/evaluations").json()
+    assert history[0] == out["evaluation"]
+    summary = client.get(f"/companies/{cid}/summary").json()
+    assert (summary["evaluation_count"], summary["latest_evaluation_id"]) == (
+        2,
+        out["evaluation"]["id"],
+    )
+
+    # Merging builds on the delta-written row, not the original one
+    again = client.patch("/evaluate", json={"company_id": cid, "has_contact_page": False})
+    assert again.json()["signals"] == main.mask_to_signals(0b10_0000_0100)
+
+
+def test_first_delta_needs_every_signal(client) -> None:
+    cid = make_company(client)
+    r = client.patch("/evaluate", json={"company_id": cid, "has_contact_page": True})
+    assert r.status_code == 422
+    detail = r.json()["detail"]
+    assert detail["error"] == "no_previous_evaluation"
+    assert "has_contact_page" not in detail["missing"] and len(detail["missing"]) == 9
+
+    full = client.patch("/evaluate", json=evaluate_body(cid, 2))
+    assert full.status_code == 201
+    assert full.json()["evaluation"]["badge"] == main.compute_findability(
+        main.mask_to_signals(0b11)
+    )["badge"]
+
+
+def test_delta_rejects_unknown_fields_and_companies(client) -> None:
+    cid = make_company(client)
+    client.post("/evaluate", json=evaluate_body(cid))
+    typo = client.patch("/evaluate", json={"company_id": cid, "has_contact_pgae": True})
+    assert typo.status_code == 422
+    missing = client.patch("/evaluate", json={"company_id": 99999})
+    assert missing.status_code == 404
+    assert missing.json()["detail"]["error"] == "company_not_found"
+
+
+def test_delta_outcomes_are_counted(client) -> None:
+    cid = make_company(client)
+    client.post("/evaluate", json=evaluate_body(cid))
+    client.patch("/evaluate", json={"company_id": cid})
+    client.patch("/evaluate", json={"company_id": cid, "has_contact_page": False})
+    metrics = client.get("/metrics").text
+    assert 'evaluation_deltas_total{result="confirmed"}' in metrics
+    assert 'evaluation_deltas_total{result="written"}' in metrics
@@ -1,4 +1,9 @@
+from typing import List
+
+from sqlalchemy import text
+
 import main
+from conftest import test_engine
 
 
 def _mk_company(client) -> int:
@@ -95,3 +100,179 @@ def test_evaluate_requires_existing_company(client) -> None:
     data = r.json()
     assert data["detail"]["error"] == "company_not_found"
 
+
+def _all_signals(company_id: int, value: bool) -> dict:
+    body = {"company_id": company_id}
+    for field in main.EvaluateIn.model_fields:
+        if field != "company_id":
+            body[field] = value
+    return body
+
+
+def test_evaluate_batch_scores_and_reports_missing_companies(client) -> None:
+    cid = _mk_company(client)
+    items = [
+        _all_signals(cid, True),
+        _all_signals(99999, True),
+        _all_signals(cid, False),
+    ]
+    r = client.post("/evaluate/batch", json={"items": items})
+    assert r.status_code == 200
+    data = r.json()
+    assert data["created"] == 2
+    assert data["failed"] == 1
+
+    first, missing, last = data["results"]
+    assert [first["index"], missing["index"], last["index"]] == [0, 1, 2]
+    assert first["evaluation"]["badge"] == "excellent"
+    assert first["evaluation"]["company_id"] == cid
+    assert missing["evaluation"] is None
+    assert missing["error"]["error"] == "company_not_found"
+    assert last["evaluation"]["badge"] == "poor"
+    assert last["evaluation"]["evidence"] == ["No clear signals provided"]
+    assert first["evaluation"]["id"] < last["evaluation"]["id"]
+
+
+def test_evaluate_batch_matches_single_evaluate(client) -> None:
+    cid = _mk_company(client)
+    body = _all_signals(cid, False)
+    body["has_contact_page"] = True
+    body["has_reviews_or_testimonials"] = True
+
+    single = client.post("/evaluate", json=body).json()
+    batch = client.post("/evaluate/batch", json={"items": [body]}).json()
+    batched = batch["results"][0]["evaluation"]
+    for key in ("company_id", "score", "badge", "evidence"):
+        assert batched[key] == single[key]
+
+
+def test_evidence_is_stored_as_a_signal_mask(client) -> None:
+    cid = _mk_company(client)
+    body = _all_signals(cid, False)
+    body["has_contact_page"] = True
+    body["content_matches_intent"] = True
+
+    created = client.post("/evaluate", json=body).json()
+    assert created["evidence"] == ["+ contact page", "+ content matches intent"]
+
+    with test_engine.connect() as conn:
+        stored = conn.execute(
+            text("SELECT signal_mask FROM evaluations WHERE id = :id"), {"id": created["id"]}
+        ).scalar_one()
+    assert stored == 0b10_0000_0001
+
+    # Read back through history: same evidence, rebuilt from the mask
+    history = client.get(f"/companies/{cid}/evaluations").json()
+    assert history[0]["evidence"] == created["evidence"]
+
+
+def test_evaluate_batch_rejects_empty(client) -> None:
+    r = client.post("/evaluate/batch", json={"items": []})
+    assert r.status_code == 422
+
+
+def _evaluate_with(client, cid: int, n_true: int) -> dict:
+    body = _all_signals(cid, False)
+    for field in list(body)[1 : 1 + n_true]:
+        body[field] = True
+    r = client.post("/evaluate", json=body)
+    assert r.status_code == 201
+    return r.json()
+
+
+def test_company_evaluation_history_pages_newest_first(client) -> None:
+    cid = _mk_company(client)
+    other = client.post("/companies", json={"name": "Other Co"}).json()["id"]
+    created = [_evaluate_with(client, cid, n) for n in range(5)]
+    _evaluate_with(client, other, 3)
+
+    seen: List[int] = []
+    r = client.get(f"/companies/{cid}/evaluations?limit=2")
+    while True:
+        assert r.status_code == 200
+        seen.extend(e["id"] for e in r.json())
+        cursor = r.headers.get("x-next-cursor")
+        if not cursor:
+            break
+        r = client.get(f"/companies/{cid}/evaluations", params={"limit": 2, "before": cursor})
+
+    # Same-second timestamps still page cleanly thanks to the id tiebreak
+    assert seen == [e["id"] for e in reversed(created)]
+
+
+def test_company_evaluation_history_errors(client) -> None:
+    assert client.get("/companies/999/evaluations").status_code == 404
+    cid = _mk_company(client)
+    r = client.get(f"/companies/{cid}/evaluations?before=garbage")
+    assert r.status_code == 422
+    assert r.json()["detail"]["error"] == "bad_cursor"
+
+
+def test_summary_tracks_running_stats(client) -> None:
+    cid = _mk_company(client)
+    scores = [_evaluate_with(client, cid, n)["score"] for n in (0, 6, 2)]
+
+    r = client.get(f"/companies/{cid}/summary")
+    assert r.status_code == 200
+    summary = r.json()
+    assert summary["evaluation_count"] == 3
+    assert summary["latest_score"] == scores[-1]
+    assert summary["latest_badge"] == main.compute_findability(
+        main.mask_to_signals(0b11)
+    )["badge"]
+    assert summary["score_min"] == min(scores)
+    assert summary["score_max"] == max(scores)
+    assert abs(summary["score_mean"] - sum(scores) / 3) < 1e-9
+
+
+def test_summary_follows_batch_writes(client) -> None:
+    cid = _mk_company(client)
+    _evaluate_with(client, cid, 1)
+    batch = client.post(
+        "/evaluate/batch",
+        json={"items": [_all_signals(cid, True), _all_signals(cid, False)]},
+    ).json()
+
+    summary = client.get(f"/companies/{cid}/summary").json()
+    assert summary["evaluation_count"] == 3
+    assert summary["latest_evaluation_id"] == batch["results"][-1]["evaluation"]["id"]
+    assert summary["latest_badge"] == "poor"
+    assert summary["score_max"] == batch["results"][0]["evaluation"]["score"]
+
+
+def test_summary_404s(client) -> None:
+    assert client.get("/companies/999/summary").json()["detail"]["error"] == "company_not_found"
+    cid = _mk_company(client)
+    r = client.get(f"/companies/{cid}/summary")
+    assert r.status_code == 404
+    assert r.json()["detail"]["error"] == "no_evaluations"
+
+
+def test_list_summaries_for_many_companies(client) -> None:
+    first = _mk_company(client)
+    second = client.post("/companies", json={"name": "Second Co"}).json()["id"]
+    never = client.post("/companies", json={"name": "Never Co"}).json()["id"]
+    _evaluate_with(client, first, 6)
+    _evaluate_with(client, second, 0)
+
+    r = client.get(
+        "/evaluations/summaries", params={"company_id": [second, first, never]}
+    )
+    assert r.status_code == 200
+    assert [(s["company_id"], s["latest_badge"]) for s in r.json()] == [
+        (first, "excellent"),
+        (second, "poor"),
+    ]
+
+
+def test_summaries_backfill_from_history(client) -> None:
+    cid = _mk_company(client)
+    for n in (1, 6):
+        _evaluate_with(client, cid, n)
+    with test_engine.begin() as connection:
+        connection.execute(text("DELETE FROM evaluation_summaries"))
+        main.ensure_evaluation_summaries(connection)
+
+    summary = client.get(f"/companies/{cid}/summary").json()
+    assert summary["evaluation_count"] == 2
+    assert summary["latest_badge"] == "excellent"
@@ -0,0 +1,216 @@
+import time
+from typing import Iterator, List
+
+import pytest
+from sqlalchemy import func, select
+
+import main
+from conftest import TestingSessionLocal, WorkerSessionLocal, evaluate
+
+
+def _seed(client, count: int = 5) -> List[int]:
+    ids = []
+    for i in range(count):
+        cid = client.post("/companies", json={"name": f"Rescore Co {i}"}).json()["id"]
+        evaluate(client, cid, i + 1)
+        ids.append(cid)
+    # One company that was never evaluated: nothing to re-score there
+    client.post("/companies", json={"name": "Never Scored Co"})
+    return ids
+
+
+@pytest.fixture
+def runner() -> Iterator[main.JobRunner]:
+    runner = main.JobRunner(
+        WorkerSessionLocal, workers=1, chunk_size=2, poll_seconds=0.05, stale_seconds=60
+    )
+    yield runner
+    runner.stop()
+
+
+HALF_WEIGHTS = {"presence": 0.3, "rank": 0.15, "confidence": 0.05}
+
+
+def _evaluations(company_id: int) -> list:
+    with TestingSessionLocal() as db:
+        return db.execute(
+            select(main.Evaluation.score, main.Evaluation.signal_mask, main.Evaluation.model_version)
+            .where(main.Evaluation.company_id == company_id)
+            .order_by(main.Evaluation.id)
+        ).all()
+
+
+def _assert_summary_is_current(client, company_id: int) -> None:
+    # Re-score chunks write through _insert_evaluations, which keeps
+    # evaluation_summaries in step; the newest row must be the latest there
+    history = client.get(f"/companies/{company_id}/evaluations").json()
+    summary = client.get(f"/companies/{company_id}/summary").json()
+    assert summary["evaluation_count"] == len(history)
+    assert summary["latest_evaluation_id"] == history[0]["id"]
+    assert (summary["latest_score"], summary["latest_badge"]) == (
+        history[0]["score"],
+        history[0]["badge"],
+    )
+
+
+def test_rescore_job_applies_new_weights(client, runner) -> None:
+    ids = _seed(client)
+    spec = {"version": "half", "weights": HALF_WEIGHTS}
+    assert client.post("/scoring-models", json=spec).status_code == 201
+    r = client.post("/jobs/rescore", json={"model_version": "half"})
+    assert r.status_code == 202
+    job = r.json()
+    assert (job["status"], job["total"], job["processed"]) == ("queued", 5, 0)
+    assert job["model_version"] == "half"
+
+    # Asking again while it's pending hands back the same job...
+    again = client.post("/jobs/rescore", json={"model_version": "half"})
+    assert again.status_code == 200
+    assert again.json()["id"] == job["id"]
+    # ...but a re-score with a different model is a different job
+    other = client.post("/jobs/rescore")
+    assert other.status_code == 202
+    assert other.json()["model_version"] == "v1"
+
+    assert runner.run_pending() == 2
+
+    done = client.get(f"/jobs/{job['id']}").json()
+    assert done["status"] == "done"
+    assert (done["processed"], done["progress"], done["eta_seconds"]) == (5, 1.0, 0.0)
+    assert done["throughput_per_second"] > 0
+    assert done["finished_at"] is not None
+    for cid in ids:
+        (old_score, old_mask, old_model), (new_score, new_mask, new_model), _ = _evaluations(cid)
+        assert (old_model, new_model) == ("v1", "half")
+        assert new_mask == old_mask
+        assert new_score == pytest.approx(old_score * 0.5)
+        _assert_summary_is_current(client, cid)
+
+    # A finished job doesn't block the next one
+    assert client.post("/jobs/rescore", json={"model_version": "half"}).status_code == 202
+
+
+def test_rescore_supersedes_deduped_evaluations(client, runner) -> None:
+    cid = client.post("/companies", json={"name": "Dedupe Co"}).json()["id"]
+    before = evaluate(client, cid, 3)
+    spec = {"version": "half", "weights": HALF_WEIGHTS}
+    assert client.post("/scoring-models", json=spec).status_code == 201
+    assert client.post("/jobs/rescore", json={"model_version": "half"}).status_code == 202
+    assert runner.run_pending() == 1
+
+    # Same signals inside the dedupe window: the re-scored row is the latest
+    # now, so this scores again instead of replaying the pre-rescore answer
+    after = evaluate(client, cid, 3)
+    assert after["id"] != before["id"]
+    assert [row.model_version for row in _evaluations(cid)] == ["v1", "half", "v1"]
+    _assert_summary_is_current(client, cid)
+
+
+def test_rescore_with_unknown_model_is_404(client) -> None:
+    r = client.post("/jobs/rescore", json={"model_version": "nope"})
+    assert r.status_code == 404
+    assert r.json()["detail"]["error"] == "scoring_model_not_found"
+
+
+def test_rescore_job_resumes_after_a_crash(client, runner) -> None:
+    ids = _seed(client)
+    job_id = client.post("/jobs/rescore").json()["id"]
+
+    # A worker claims the job, commits one chunk, then dies without a trace
+    with TestingSessionLocal() as db:
+        assert main._claim_job(db, stale_seconds=60) == job_id
+        assert main._rescore_chunk(db, job_id, chunk_size=2)
+    midway = client.get(f"/jobs/{job_id}").json()
+    assert (midway["status"], midway["processed"], midway["progress"]) == ("running", 2, 0.4)
+
+    # Its heartbeat is fresh, so nobody steals it yet...
+    assert runner.run_pending() == 0
+    # ...until it goes stale
+    runner.stale_seconds = 0
+    assert runner.run_pending() == 1
+
+    done = client.get(f"/jobs/{job_id}").json()
+    assert (done["status"], done["processed"], done["attempts"]) == ("done", 5, 2)
+    # Every company re-scored exactly once, crash or not
+    assert [len(_evaluations(cid)) for cid in ids] == [2] * 5
+    for cid in ids:
+        _assert_summary_is_current(client, cid)
+
+
+def test_failed_chunk_rolls_back_and_retries(client, runner, monkeypatch) -> None:
+    ids = _seed(client)
+    job_id = client.post("/jobs/rescore").json()["id"]
+    real_update = main._update_evaluation_summaries
+    calls = {"n": 0}
+
+    def _flaky(db, rows):
+        calls["n"] += 1
+        if calls["n"] == 2:
+            raise RuntimeError("disk hiccup")  # after the chunk's INSERT ran
+        return real_update(db, rows)
+
+    monkeypatch.setattr(main, "_update_evaluation_summaries", _flaky)
+    runner.run_pending()
+
+    assert client.get(f"/jobs/{job_id}").json()["status"] == "done"
+    assert [len(_evaluations(cid)) for cid in ids] == [2] * 5
+    for cid in ids:
+        _assert_summary_is_current(client, cid)
+
+
+def test_job_fails_after_repeated_errors(client, runner, monkeypatch) -> None:
+    _seed(client, count=1)
+    job_id = client.post("/jobs/rescore").json()["id"]
+
+    def _broken(db, rows):
+        raise RuntimeError("disk on fire")
+
+    monkeypatch.setattr(main, "_insert_evaluations", _broken)
+    runner.run_pending()
+
+    failed = client.get(f"/jobs/{job_id}").json()
+    assert failed["status"] == "failed"
+    assert failed["error"] == "RuntimeError: disk on fire"
+    assert failed["processed"] == 0
+
+
+def test_worker_threads_pick_up_new_jobs(client, runner) -> None:
+    _seed(client)
+    runner.start()
+    job_id = client.post("/jobs/rescore").json()["id"]
+    deadline = time.monotonic() + 10
+    while client.get(f"/jobs/{job_id}").json()["status"] != "done":
+        assert time.monotonic() < deadline
+        time.sleep(0.02)
+    with TestingSessionLocal() as db:
+        assert db.scalar(select(func.count()).select_from(main.Evaluation)) == 10
+
+
+def test_idle_polls_stay_off_the_writer(client) -> None:
+    writer_sessions = []
+
+    def _writer():
+        writer_sessions.append(True)
+        return WorkerSessionLocal()
+
+    runner = main.JobRunner(
+        _writer,
+        workers=1,
+        chunk_size=2,
+        poll_seconds=0.05,
+        stale_seconds=60,
+        read_session_factory=WorkerSessionLocal,
+    )
+    _seed(client, count=1)
+    assert runner._claim() is None
+    assert writer_sessions == []  # under BEGIN IMMEDIATE, that's no write lock
+
+    job_id = client.post("/jobs/rescore").json()["id"]
+    assert runner._claim() == job_id
+    assert writer_sessions == [True]
+
+
+def test_unknown_job_is_404(client) -> None:
+    r = client.get("/jobs/999")
+    assert r.status_code == 404
+    assert r.json()["detail"]["error"] == "job_not_found"
@@ -0,0 +1,51 @@
+"""The orjson fast path must answer byte for byte what response_model would."""
+
+from typing import Dict
+
+import main
+from conftest import evaluate
+
+READ_PATHS = (
+    "/companies",
+    "/companies?limit=1",
+    "/companies?stream=true",
+    "/companies/export",
+    "/companies/{cid}",
+    "/companies/{cid}/evaluations",
+    "/companies/{cid}/evaluations?limit=1",
+    "/companies/{cid}/summary",
+    "/evaluations/summaries?company_id={cid}&company_id={other}",
+)
+
+
+def _seed(client) -> Dict[str, int]:
+    cid = client.post(
+        "/companies",
+        json={"name": "Café Ünïcode", "city": "Zürich", "website": "https://x.example"},
+    ).json()["id"]
+    other = client.post("/companies", json={"name": "Plain Co"}).json()["id"]
+    for n_true in (3, 7):
+        evaluate(client, cid, n_true)
+    return {"cid": cid, "other": other}
+
+
+def _read_all(client, ids: Dict[str, int], monkeypatch, fast: bool) -> dict:
+    monkeypatch.setattr(main, "FAST_JSON", fast)
+    main.company_cache.clear()
+    responses = {}
+    for path in READ_PATHS:
+        r = client.get(path.format(**ids))
+        assert r.status_code == 200, r.text
+        responses[path] = (r.content, r.headers.get("x-next-cursor"), r.headers["content-type"])
+    return responses
+
+
+def test_orjson_and_pydantic_bodies_match(client, monkeypatch) -> None:
+    ids = _seed(client)
+    slow = _read_all(client, ids, monkeypatch, fast=False)
+    fast = _read_all(client, ids, monkeypatch, fast=True)
+    for path in READ_PATHS:
+        assert fast[path] == slow[path], path
+    # The cursor header survives the hand-built response
+    assert fast["/companies?limit=1"][1] == str(ids["cid"])
+
@@ -0,0 +1,206 @@
+"""Schema migrations: fresh DBs and DB files from the very first release."""
+
+from sqlalchemy import create_engine, event, inspect, text
+
+import main
+from conftest import evaluate_body, test_async_engine, test_engine
+
+# What the first release's create_all produced
+LEGACY_SCHEMA = [
+    """
+    CREATE TABLE companies (
+        id INTEGER NOT NULL, name VARCHAR NOT NULL, website VARCHAR,
+        country VARCHAR, state VARCHAR, city VARCHAR, industry VARCHAR,
+        niche VARCHAR, created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL,
+        PRIMARY KEY (id)
+    )
+    """,
+    "CREATE INDEX ix_companies_id ON companies (id)",
+    """
+    CREATE TABLE evaluations (
+        id INTEGER NOT NULL, company_id INTEGER NOT NULL, score FLOAT NOT NULL,
+        badge VARCHAR NOT NULL, evidence JSON NOT NULL,
+        created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(company_id) REFERENCES companies (id) ON DELETE CASCADE
+    )
+    """,
+    "CREATE INDEX ix_evaluations_id ON evaluations (id)",
+    "CREATE INDEX ix_evaluations_company_id ON evaluations (company_id)",
+]
+
+
+def _index_names(connection, table_name: str) -> set:
+    return {index["name"] for index in inspect(connection).get_indexes(table_name)}
+
+
+def test_migrate_fresh_database(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    try:
+        with engine.begin() as connection:
+            assert main.migrate(connection) == [v for v, _, _ in main.MIGRATIONS]
+            assert main.migrate(connection) == []  # nothing left to do
+            indexes = _index_names(connection, "evaluations")
+        assert {"ix_evaluations_company_created", "ix_evaluations_badge_created"} <= indexes
+        assert "ix_evaluations_company_id" not in indexes
+    finally:
+        engine.dispose()
+
+
+def test_migrate_upgrades_legacy_database(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    try:
+        with engine.begin() as connection:
+            for ddl in LEGACY_SCHEMA:
+                connection.exec_driver_sql(ddl)
+            connection.exec_driver_sql(
+                "INSERT INTO companies (id, name) VALUES (1, 'Legacy Co'), (2, 'legacy co')"
+            )
+            connection.exec_driver_sql(
+                "INSERT INTO evaluations (company_id, score, badge, evidence) VALUES "
+                "(1, 0.2, 'poor', '[\"No clear signals provided\"]'), "
+                "(1, 0.9, 'excellent', '[\"+ contact page\", \"+ loads fast\"]')"
+            )
+
+        with engine.begin() as connection:
+            main.migrate(connection)
+
+        with engine.connect() as connection:
+            versions = connection.execute(
+                text("SELECT version FROM schema_migrations ORDER BY version")
+            ).scalars().all()
+            assert versions == [v for v, _, _ in main.MIGRATIONS]
+
+            indexes = _index_names(connection, "evaluations")
+            assert "ix_evaluations_company_created" in indexes
+            assert "ix_evaluations_company_id" not in indexes
+            segment_indexes = {f"ix_companies_{field}" for field in main.STATS_DIMENSIONS}
+            assert segment_indexes <= _index_names(connection, "companies")
+
+            columns = {col["name"] for col in inspect(connection).get_columns("evaluations")}
+            assert "evidence" not in columns
+            masks = connection.execute(
+                text("SELECT signal_mask FROM evaluations ORDER BY id")
+            ).scalars().all()
+            assert masks == [0, 0b1_0000_0001]
+            # Scored before models had versions: that was v1
+            versions = connection.execute(
+                text("SELECT DISTINCT model_version FROM evaluations")
+            ).scalars().all()
+            assert versions == ["v1"]
+
+            keys = connection.execute(
+                text("SELECT id, name_key FROM companies ORDER BY id")
+            ).all()
+            assert keys == [(1, "legacy co"), (2, None)]
+
+            hits = connection.execute(
+                text("SELECT rowid FROM companies_fts WHERE companies_fts MATCH '\"legacy\"'")
+            ).scalars().all()
+            assert sorted(hits) == [1, 2]
+
+            summary = connection.execute(
+                text("SELECT evaluation_count, latest_badge, score_max FROM evaluation_summaries")
+            ).one()
+            assert tuple(summary) == (2, "excellent", 0.9)
+    finally:
+        engine.dispose()
+
+
+def test_history_index_gains_id_tiebreak(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'step9.db'}")
+    try:
+        with engine.begin() as connection:
+            main.migrate(connection)
+            # Roll back to what step 5 used to build, as on a DB from before step 10
+            connection.exec_driver_sql("DROP INDEX ix_evaluations_company_created")
+            connection.exec_driver_sql(
+                "CREATE INDEX ix_evaluations_company_created"
+                " ON evaluations (company_id, created_at DESC)"
+            )
+            connection.exec_driver_sql("DELETE FROM schema_migrations WHERE version = 10")
+
+        with engine.begin() as connection:
+            assert main.migrate(connection) == [10]
+            columns = {
+                index["name"]: index["column_names"]
+                for index in inspect(connection).get_indexes("evaluations")
+            }
+        assert columns["ix_evaluations_company_created"] == ["company_id", "created_at", "id"]
+    finally:
+        engine.dispose()
+
+
+def test_fractional_created_at_is_trimmed(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'step10.db'}")
+    try:
+        with engine.begin() as connection:
+            main.migrate(connection)
+            connection.exec_driver_sql("INSERT INTO companies (id, name) VALUES (1, 'Queued Co')")
+            connection.exec_driver_sql(
+                "INSERT INTO evaluations (company_id, score, badge, signal_mask, created_at)"
+                " VALUES (1, 0.5, 'fair', 3, '2026-01-01 00:00:00.000000'),"
+                " (1, 0.5, 'fair', 3, '2026-01-01 00:00:01')"
+            )
+            connection.exec_driver_sql("DELETE FROM schema_migrations WHERE version = 11")
+
+        with engine.begin() as connection:
+            assert main.migrate(connection) == [11]
+            stored = connection.exec_driver_sql(
+                "SELECT created_at FROM evaluations ORDER BY id"
+            ).scalars().all()
+        assert stored == ["2026-01-01 00:00:00", "2026-01-01 00:00:01"]
+    finally:
+        engine.dispose()
+
+
+def _history_queries(client, company_id: int) -> list:
+    """The evaluations SELECTs GET /companies/{id}/evaluations runs, first page and next."""
+    captured: list = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("SELECT") and "FROM evaluations" in statement:
+            captured.append((statement, parameters))
+
+    engines = (test_engine, test_async_engine.sync_engine)
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", _record)
+    try:
+        first = client.get(f"/companies/{company_id}/evaluations", params={"limit": 1})
+        assert first.status_code == 200
+        nxt = client.get(
+            f"/companies/{company_id}/evaluations",
+            params={"limit": 1, "before": first.headers["x-next-cursor"]},
+        )
+        assert nxt.status_code == 200
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", _record)
+    return captured
+
+
+def test_time_series_queries_use_composite_indexes(client) -> None:
+    cid = client.post("/companies", json={"name": "Indexed Co"}).json()["id"]
+    for n_true in (1, 2, 3):
+        assert client.post("/evaluate", json=evaluate_body(cid, n_true)).status_code == 201
+    queries = _history_queries(client, cid)
+    assert len(queries) == 2
+
+    with test_engine.connect() as connection:
+        for statement, parameters in queries:
+            plan = " ".join(
+                row[-1]
+                for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            )
+            assert "ix_evaluations_company_created" in plan
+            assert "TEMP B-TREE" not in plan
+
+        plan = " ".join(
+            row[-1]
+            for row in connection.exec_driver_sql(
+                "EXPLAIN QUERY PLAN SELECT * FROM evaluations "
+                "WHERE badge = 'good' AND created_at >= '2026-01-01' ORDER BY created_at"
+            )
+        )
+        assert "ix_evaluations_badge_created" in plan
+        assert "TEMP B-TREE" not in plan
@@ -1,4 +1,17 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
 import main
+from conftest import evaluate_body
 
 
 def test_health_endpoint(client) -> None:
@@ -22,3 +35,207 @@ def test_get_db_generator_yields_and_closes() -> None:
     assert session.bind is not None
     gen.close()
 
+
+def test_metrics_label_by_route_template(client) -> None:
+    cid = client.post("/companies", json={"name": "Label Co"}).json()["id"]
+    client.get(f"/companies/{cid}")
+    client.get("/companies/424242")
+    client.get("/definitely/not/a/route")
+
+    body = client.get("/metrics").text
+    assert 'path="/companies/{id}"' in body
+    assert f'path="/companies/{cid}"' not in body
+    assert 'path="/companies/424242"' not in body
+    assert 'path="<unmatched>"' in body
+    assert "/definitely/not/a/route" not in body
+
+
+def test_version_header_on_success_and_error(client) -> None:
+    assert client.get("/health").headers["x-app-version"] == main.__version__
+    assert client.get("/companies/999999").headers["x-app-version"] == main.__version__
+
+
+def test_metrics_count_status_codes(client) -> None:
+    labels = {"method": "GET", "path": "/companies/{id}", "status_code": "404"}
+    before = REGISTRY.get_sample_value("api_request_count_total", labels) or 0.0
+    client.get("/companies/999999")
+    after = REGISTRY.get_sample_value("api_request_count_total", labels)
+    assert after == before + 1
+
+
+def test_get_read_db_generator_uses_read_engine() -> None:
+    gen = main.get_read_db()
+    session = next(gen)
+    assert session.bind is main.read_engine
+    gen.close()
+
+
+def _pragma(connection, name: str):
+    return connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+def test_tuned_storage_profile_applies_pragmas(tmp_path) -> None:
+    url = f"sqlite:///{tmp_path / 'tuned.db'}"
+    writer = main.create_storage_engine(url, profile="tuned")
+    reader = main.create_storage_engine(url, profile="tuned", read_only=True)
+    try:
+        with writer.begin() as connection:
+            assert _pragma(connection, "journal_mode") == "wal"
+            assert _pragma(connection, "synchronous") == 1  # NORMAL
+            assert _pragma(connection, "foreign_keys") == 1
+            assert _pragma(connection, "busy_timeout") == 5000
+            connection.exec_driver_sql("CREATE TABLE t (x INTEGER)")
+
+        with reader.connect() as connection:
+            assert _pragma(connection, "query_only") == 1
+            assert _pragma(connection, "journal_mode") == "wal"
+            with pytest.raises(OperationalError):
+                connection.exec_driver_sql("INSERT INTO t VALUES (1)")
+        assert writer.pool.size() == main.DB_POOL_SIZE
+    finally:
+        writer.dispose()
+        reader.dispose()
+
+
+def test_tuned_writers_take_the_write_lock_up_front(tmp_path) -> None:
+    # Two writers (think: two worker processes) where the first reads before it
+    # writes. With a deferred BEGIN the second slips in between that read and
+    # the write (or the write fails on a stale snapshot); BEGIN IMMEDIATE holds
+    # the write lock from the start, so the second waits its turn.
+    url = f"sqlite:///{tmp_path / 'writers.db'}"
+    first = main.create_storage_engine(url, profile="tuned")
+    second = main.create_storage_engine(url, profile="tuned")
+    statements = []
+
+    @event.listens_for(first, "before_cursor_execute")
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    def _other_worker() -> None:
+        with second.begin() as connection:
+            connection.exec_driver_sql("INSERT INTO t VALUES (2)")
+
+    try:
+        with first.begin() as connection:
+            connection.exec_driver_sql("CREATE TABLE t (x INTEGER)")
+        with first.begin() as connection:
+            assert connection.exec_driver_sql("SELECT count(*) FROM t").scalar() == 0
+            other = threading.Thread(target=_other_worker)
+            other.start()
+            time.sleep(0.2)  # give it time to try (and wait)
+            connection.exec_driver_sql("INSERT INTO t VALUES (1)")
+        other.join()
+        with first.connect() as connection:
+            rows = connection.exec_driver_sql("SELECT x FROM t ORDER BY rowid").scalars().all()
+        assert rows == [1, 2]
+        assert "BEGIN IMMEDIATE" in statements
+    finally:
+        first.dispose()
+        second.dispose()
+
+
+@pytest.fixture(params=["sync", "async"])
+def app_engines(request, tmp_path, monkeypatch):
+    """The app on what _build_engines() makes of a file DB, through the real dependencies.
+
+    Everything else runs on conftest's plain engine, so this is where the
+    tuned writer (BEGIN IMMEDIATE) and the query_only read pool meet the
+    endpoints. Yields the statements each engine ran.
+    """
+    url = f"sqlite:///{tmp_path / 'app.db'}"
+    setup = create_engine(url)
+    with setup.begin() as connection:
+        main.migrate(connection)
+    setup.dispose()
+
+    monkeypatch.setattr(main, "DATABASE_URL", url)
+    asynchronous = request.param == "async"
+    writer, reader = main._build_engines(asynchronous=asynchronous)
+    if asynchronous:
+        monkeypatch.setattr(main, "AsyncSessionLocal", async_sessionmaker(bind=writer))
+        monkeypatch.setattr(main, "AsyncReadSessionLocal", async_sessionmaker(bind=reader))
+        dependencies = (main.get_async_db, main.get_async_read_db)
+    else:
+        monkeypatch.setattr(main, "SessionLocal", sessionmaker(bind=writer))
+        monkeypatch.setattr(main, "ReadSessionLocal", sessionmaker(bind=reader))
+        dependencies = (main.get_db, main.get_read_db)
+    monkeypatch.setitem(main.app.dependency_overrides, main.get_session, dependencies[0])
+    monkeypatch.setitem(main.app.dependency_overrides, main.get_read_session, dependencies[1])
+
+    statements: dict = {"writer": [], "reader": []}
+    for name, engine in (("writer", writer), ("reader", reader)):
+        sync_engine = engine.sync_engine if asynchronous else engine
+        event.listen(
+            sync_engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args, ran=statements[name]: ran.append(statement),
+        )
+    main.company_cache.clear()
+    main.evaluation_dedupe.clear()
+    main.stats_cache.clear()
+    try:
+        yield statements
+    finally:
+        for engine in (writer, reader):
+            if asynchronous:
+                asyncio.run(engine.dispose())
+            else:
+                engine.dispose()
+
+
+def test_endpoints_write_through_the_writer_and_read_from_the_read_pool(
+    app_engines, monkeypatch
+) -> None:
+    with TestClient(main.app) as client:
+        cid = client.post("/companies", json={"name": "Engine Co"}).json()["id"]
+        assert client.post("/evaluate", json=evaluate_body(cid)).status_code == 201
+        history = client.get(f"/companies/{cid}/evaluations")
+        assert history.status_code == 200 and len(history.json()) == 1
+
+        # The read pool refuses writes, even from an endpoint that tries one
+        monkeypatch.setitem(
+            main.app.dependency_overrides,
+            main.get_session,
+            main.app.dependency_overrides[main.get_read_session],
+        )
+        with pytest.raises(OperationalError, match="readonly"):
+            client.post("/companies", json={"name": "Sneaky Co"})
+        assert [c["name"] for c in client.get("/companies").json()] == ["Engine Co"]
+
+    writer, reader = app_engines["writer"], app_engines["reader"]
+    assert "BEGIN IMMEDIATE" in writer
+    assert any(s.startswith("INSERT INTO evaluations") for s in writer)
+    assert any("FROM evaluations" in s for s in reader)
+    assert any(s.startswith("INSERT INTO companies") for s in reader)  # the refused one
+    assert not any(s.startswith("BEGIN") for s in reader)
+
+
+def test_basic_storage_profile_keeps_sqlite_defaults(tmp_path) -> None:
+    basic = main.create_storage_engine(f"sqlite:///{tmp_path / 'basic.db'}", profile="basic")
+    try:
+        with basic.connect() as connection:
+            assert _pragma(connection, "journal_mode") == "delete"
+            assert _pragma(connection, "foreign_keys") == 1
+    finally:
+        basic.dispose()
+
+
+def test_unknown_storage_profile_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        main.create_storage_engine("sqlite://", profile="turbo")
+
+
+def test_async_storage_engine_uses_async_driver(tmp_path) -> None:
+    async_engine = main.create_storage_engine(
+        f"sqlite:///{tmp_path / 'async.db'}", profile="tuned", asynchronous=True
+    )
+    try:
+        assert isinstance(async_engine, AsyncEngine)
+        assert async_engine.url.drivername == "sqlite+aiosqlite"
+    finally:
+        async_engine.sync_engine.dispose()
+
+
+def test_async_storage_engine_rejects_unknown_backend() -> None:
+    with pytest.raises(ValueError):
+        main.create_storage_engine("mysql://u:p@localhost/db", asynchronous=True)
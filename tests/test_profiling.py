@@ -0,0 +1,210 @@
+import os
+import re
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+
+import pytest
+from fastapi.routing import APIRoute
+from prometheus_client import REGISTRY
+from sqlalchemy import event
+
+import main
+from conftest import evaluate_body
+
+SPANS = ("validation", "db_query", "db_commit", "scoring", "encoding")
+
+# A fresh interpreter, since which routes get wrapped is decided at import
+# and startup: prints how many API routes are profiled, and how many there are
+COUNT_PROFILED_ROUTES = textwrap.dedent(
+    """
+    from fastapi.routing import APIRoute
+    from fastapi.testclient import TestClient
+    import main
+
+    with TestClient(main.app):
+        routes = [r for r in main.app.router.routes if isinstance(r, APIRoute)]
+        profiled = [r for r in routes if getattr(r.dependant.call, "_profiled", False)]
+    print(len(profiled), len(routes))
+    """
+)
+
+
+def _span_count(method: str, path: str, span: str) -> float:
+    value = REGISTRY.get_sample_value(
+        "api_request_span_seconds_count", {"method": method, "path": path, "span": span}
+    )
+    return value or 0.0
+
+
+def _wait_for_profiles(directory, label: str, count: int = 1) -> list:
+    # The sampler thread writes them just after the response goes out
+    deadline = time.monotonic() + 5
+    while True:
+        files = sorted(name for name in os.listdir(directory) if label in name)
+        if len(files) >= count or time.monotonic() > deadline:
+            return files
+        time.sleep(0.01)
+
+
+def _profiled_routes() -> list:
+    routes = [r for r in main.app.router.routes if isinstance(r, APIRoute)]
+    return [r for r in routes if getattr(r.dependant.call, "_profiled", False)]
+
+
+@pytest.fixture
+def spans_on(monkeypatch):
+    monkeypatch.setattr(main, "PROFILE_SPANS", False)
+    main.enable_profile_spans()
+    yield
+    # Later tests (pinned query counts among them) must see what prod sees
+    main.disable_profile_spans()
+
+
+def test_spans_are_off_by_default(client) -> None:
+    assert main.PROFILE_SPANS is False
+    cid = client.post("/companies", json={"name": "Quiet Co"}).json()["id"]
+    before = _span_count("POST", "/evaluate", "scoring")
+    assert client.post("/evaluate", json=evaluate_body(cid)).status_code == 201
+    assert _span_count("POST", "/evaluate", "scoring") == before
+
+
+@pytest.mark.parametrize("env, expect_profiled", [({}, False), ({"PROFILE_SPANS": "1"}, True)])
+def test_routes_are_only_wrapped_when_profiling(env, expect_profiled) -> None:
+    base = {k: v for k, v in os.environ.items() if not k.startswith("PROFILE_")}
+    out = subprocess.run(
+        [sys.executable, "-c", COUNT_PROFILED_ROUTES],
+        env={**base, **env},
+        cwd=os.path.dirname(main.__file__),
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+    profiled, routes = int(out[-2]), int(out[-1])
+    assert routes > 20
+    assert profiled == (routes if expect_profiled else 0)
+
+
+def test_disabling_spans_unhooks_events_and_routes(client) -> None:
+    main.enable_profile_spans()
+    try:
+        assert _profiled_routes()
+        assert all(event.contains(*listener) for listener in main._SPAN_LISTENERS)
+    finally:
+        main.disable_profile_spans()
+    assert main.PROFILE_SPANS is False
+    assert _profiled_routes() == []
+    assert not any(event.contains(*listener) for listener in main._SPAN_LISTENERS)
+    # Unwrapped routes still serve requests
+    assert client.post("/companies", json={"name": "Unwrapped Co"}).status_code == 201
+
+
+def test_evaluate_reports_every_span(client, spans_on) -> None:
+    cid = client.post("/companies", json={"name": "Spanned Co"}).json()["id"]
+    before = {span: _span_count("POST", "/evaluate", span) for span in SPANS}
+    assert client.post("/evaluate", json=evaluate_body(cid)).status_code == 201
+    for span in SPANS:
+        assert _span_count("POST", "/evaluate", span) == before[span] + 1, span
+
+    # The spans can't add up to more than the whole request
+    total = sum(
+        REGISTRY.get_sample_value(
+            "api_request_span_seconds_sum", {"method": "POST", "path": "/evaluate", "span": span}
+        )
+        for span in SPANS
+    )
+    latency = REGISTRY.get_sample_value(
+        "api_request_latency_seconds_sum", {"method": "POST", "path": "/evaluate"}
+    )
+    assert 0 < total <= latency
+
+
+def test_rejected_requests_only_spend_time_validating(client, spans_on) -> None:
+    before = {span: _span_count("POST", "/evaluate", span) for span in SPANS}
+    assert client.post("/evaluate", json={"company_id": "nope"}).status_code == 422
+    after = {span: _span_count("POST", "/evaluate", span) for span in SPANS}
+    assert after["validation"] == before["validation"] + 1
+    assert all(after[span] == before[span] for span in SPANS if span != "validation")
+
+
+def test_orjson_bodies_count_as_encoding(client, spans_on, monkeypatch) -> None:
+    monkeypatch.setattr(main, "FAST_JSON", True)
+    client.post("/companies", json={"name": "Encoded Co"})
+    before = REGISTRY.get_sample_value(
+        "api_request_span_seconds_sum", {"method": "GET", "path": "/companies", "span": "encoding"}
+    ) or 0.0
+    assert client.get("/companies").status_code == 200
+    after = REGISTRY.get_sample_value(
+        "api_request_span_seconds_sum", {"method": "GET", "path": "/companies", "span": "encoding"}
+    )
+    assert after > before
+
+
+def test_sampled_requests_write_collapsed_stacks(client, monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(main, "PROFILE_SAMPLE_PERCENT", 100)
+    monkeypatch.setattr(main, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(main.stack_sampler, "interval_seconds", 0.001)
+    cid = client.post("/companies", json={"name": "Sampled Co"}).json()["id"]
+
+    def _slow_lookup(db, company_id):
+        time.sleep(0.05)  # DB work in the threadpool (sync) or on the loop (async)
+        return real_lookup(db, company_id)
+
+    real_lookup = main._load_company_segment
+    monkeypatch.setattr(main, "_load_company_segment", _slow_lookup)
+    writers = []
+    real_write = main.SampledRequest.write
+
+    def _write(self, label, seconds):
+        writers.append(threading.current_thread().name)
+        return real_write(self, label, seconds)
+
+    monkeypatch.setattr(main.SampledRequest, "write", _write)
+    before = REGISTRY.get_sample_value("api_profiled_requests_total")
+    assert client.post("/evaluate", json=evaluate_body(cid)).status_code == 201
+
+    files = _wait_for_profiles(tmp_path, "POST_evaluate")
+    assert len(files) == 1
+    # Written by the sampler thread (the one taking samples), not the event loop
+    assert set(writers) == {"stack-sampler"}
+    assert REGISTRY.get_sample_value("api_profiled_requests_total") > before
+    lines = (tmp_path / files[0]).read_text().splitlines()
+    assert lines and all(re.fullmatch(r".+ \d+", line) for line in lines)
+    slow = sum(int(line.rsplit(" ", 1)[1]) for line in lines if "_slow_lookup" in line)
+    assert slow >= 5  # most of 50ms at 1ms intervals, leaving room for a busy box
+
+
+def test_profile_dir_keeps_only_the_newest_files(tmp_path, monkeypatch) -> None:
+    def _profile(stamp: int) -> str:
+        path = tmp_path / f"{1700000000000 + stamp}-1-GET_health.collapsed"
+        path.write_text("a 1\n")
+        return str(path)
+
+    for stamp in range(4):  # left over from an earlier run
+        _profile(stamp)
+    (tmp_path / "notes.txt").write_text("not ours")
+    listings = []
+    real_listdir = os.listdir
+    monkeypatch.setattr(os, "listdir", lambda path: listings.append(path) or real_listdir(path))
+    sampler = main.StackSampler(0.001)
+
+    for stamp in range(4, 8):
+        sampler._prune(_profile(stamp), keep=3)
+
+    assert listings == [str(tmp_path)]  # only to seed, not once per file
+    monkeypatch.undo()
+    assert sorted(os.listdir(tmp_path)) == [
+        "1700000000005-1-GET_health.collapsed",
+        "1700000000006-1-GET_health.collapsed",
+        "1700000000007-1-GET_health.collapsed",
+        "notes.txt",
+    ]
+
+
+def test_unsampled_requests_write_nothing(client, monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(main, "PROFILE_SAMPLE_PERCENT", 0)
+    monkeypatch.setattr(main, "PROFILE_DIR", str(tmp_path))
+    client.post("/companies", json={"name": "Unsampled Co"})
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,68 @@
+"""Pin how many SQL statements each endpoint runs so eager loading can't creep back."""
+
+from typing import List
+
+import main
+from conftest import TestingSessionLocal, evaluate_body
+
+
+def _mk_company_with_history(client, name: str = "History Co", evaluations: int = 3) -> int:
+    cid = client.post("/companies", json={"name": name}).json()["id"]
+    # Distinct signals each time so /evaluate's dedupe doesn't fold them together
+    for n_true in range(evaluations):
+        body = evaluate_body(cid, n_true)
+        assert client.post("/evaluate", json=body).status_code == 201
+    return cid
+
+
+def test_create_company_query_count(client, query_counter: List[str]) -> None:
+    r = client.post("/companies", json={"name": "Count Co"})
+    assert r.status_code == 201
+    assert len(query_counter) == 2  # insert + refresh
+
+
+def test_get_company_does_not_load_history(client, query_counter: List[str]) -> None:
+    cid = _mk_company_with_history(client)
+    query_counter.clear()
+
+    assert client.get(f"/companies/{cid}").status_code == 200
+    assert len(query_counter) == 1
+    assert "evaluations" not in query_counter[0]
+
+
+def test_list_companies_query_count(client, query_counter: List[str]) -> None:
+    for i in range(3):
+        _mk_company_with_history(client, name=f"History Co {i}")
+    query_counter.clear()
+
+    assert len(client.get("/companies").json()) == 3
+    assert len(query_counter) == 1
+
+
+def test_update_company_query_count(client, query_counter: List[str]) -> None:
+    cid = _mk_company_with_history(client)
+    query_counter.clear()
+
+    assert client.patch(f"/companies/{cid}", json={"city": "LA"}).status_code == 200
+    assert len(query_counter) == 3  # load + update + refresh
+
+
+def test_delete_company_query_count(client, query_counter: List[str]) -> None:
+    cid = _mk_company_with_history(client)
+    query_counter.clear()
+
+    assert client.delete(f"/companies/{cid}").status_code == 204
+    # load + delete; the FK cascade clears evaluations without an ORM round trip
+    assert len(query_counter) == 2
+
+    with TestingSessionLocal() as db:
+        assert db.query(main.Evaluation).filter_by(company_id=cid).count() == 0
+
+
+def test_evaluate_uses_primary_key_probe(client, query_counter: List[str]) -> None:
+    cid = _mk_company_with_history(client)
+    query_counter.clear()
+
+    assert client.post("/evaluate", json=evaluate_body(cid, 10)).status_code == 201
+    assert len(query_counter) == 4  # probe + insert + summary upsert + refresh
+    assert query_counter[0].startswith("SELECT companies.id")
@@ -1,4 +1,22 @@
-from main import compute_findability, SIGNALS
+import numpy as np
+import pytest
+
+from pydantic import ValidationError
+
+from main import (
+    BADGES,
+    DEFAULT_SCORING_MODEL,
+    FINDABILITY_EVIDENCE,
+    SIGNAL_MASK_ALL,
+    SIGNALS,
+    ScoringModelSpec,
+    _compute_findability_reference,
+    compile_scoring_model,
+    compute_findability,
+    compute_findability_batch,
+    mask_to_signals,
+    signals_to_mask,
+)
 
 
 def _signals_with_true(n: int) -> dict[str, bool]:
@@ -40,3 +58,118 @@ def test_scoring_six_true_signals() -> None:
     assert res["score"] >= 0.8
 
 
+def test_lookup_table_matches_reference_for_all_masks() -> None:
+    masks = np.arange(SIGNAL_MASK_ALL + 1, dtype=np.uint16)
+    batch = compute_findability_batch(masks)
+    assert len(masks) == 1024
+
+    for mask in range(SIGNAL_MASK_ALL + 1):
+        signals = mask_to_signals(mask)
+        expected = _compute_findability_reference(signals, DEFAULT_SCORING_MODEL.spec)
+
+        # Scalar path
+        assert compute_findability(signals) == expected
+        # Single-int batch path
+        one = compute_findability_batch(mask)
+        assert one.score == expected["score"]
+        assert BADGES[one.badge] == expected["badge"]
+        assert list(FINDABILITY_EVIDENCE[one.evidence]) == expected["evidence"]
+        # Vectorized path
+        assert batch.score[mask] == expected["score"]
+        assert BADGES[batch.badge[mask]] == expected["badge"]
+        assert list(FINDABILITY_EVIDENCE[batch.evidence[mask]]) == expected["evidence"]
+
+
+def _original_rules(signals: dict[str, bool]) -> dict:
+    # The hard-coded rules from before scoring models, kept verbatim
+    n_true = sum(1 for name in SIGNALS if signals.get(name, False))
+    presence = 1.0 if n_true >= 2 else 0.0
+    if n_true >= 6:
+        rank_component = 1.0
+    elif n_true >= 4:
+        rank_component = 0.9
+    elif n_true >= 2:
+        rank_component = 0.8
+    else:
+        rank_component = 0.0
+    rank_confidence = 0.0 if n_true == 0 else min(1.0, 0.3 + 0.1 * n_true)
+    overall = max(0.0, min(1.0, 0.6 * presence + 0.3 * rank_component + 0.1 * rank_confidence))
+    if overall >= 0.8:
+        badge = "excellent"
+    elif overall >= 0.6:
+        badge = "good"
+    elif overall >= 0.4:
+        badge = "fair"
+    else:
+        badge = "poor"
+    return {"score": overall, "badge": badge}
+
+
+def test_default_model_is_bit_identical_to_the_original_rules() -> None:
+    assert DEFAULT_SCORING_MODEL.version == "v1"
+    for mask in range(SIGNAL_MASK_ALL + 1):
+        signals = mask_to_signals(mask)
+        expected = _original_rules(signals)
+        got = compute_findability(signals)
+        assert (got["score"], got["badge"]) == (expected["score"], expected["badge"])
+
+
+def test_custom_model_compiles_its_own_tables() -> None:
+    spec = ScoringModelSpec(
+        version="strict",
+        signal_weights={"contact page": 2.0},
+        badge_bands=[("excellent", 0.95), ("good", 0.7)],
+    )
+    model = compile_scoring_model(spec)
+    for mask in range(SIGNAL_MASK_ALL + 1):
+        expected = _compute_findability_reference(mask_to_signals(mask), spec)
+        assert model.score_table[mask] == expected["score"]
+        assert BADGES[model.badge_table[mask]] == expected["badge"]
+
+    # The contact page alone now counts as two signals, enough to be mentioned
+    alone = compute_findability(_signals_with_true(1), model)
+    assert alone["score"] == pytest.approx(0.6 + 0.3 * 0.8 + 0.1 * 0.5)
+    assert alone["badge"] == "good"
+    assert compute_findability(_signals_with_true(1))["badge"] == "poor"  # v1 untouched
+    # No fair band any more: what isn't good is poor
+    assert set(model.badge_table.tolist()) <= {BADGES.index(b) for b in ("poor", "good", "excellent")}
+
+
+@pytest.mark.parametrize(
+    "bad",
+    [
+        {"version": "has spaces"},
+        {"version": "x", "signal_weights": {"carrier pigeon": 1.0}},
+        {"version": "x", "rank_steps": [(2, 0.8), (6, 1.0)]},
+        {"version": "x", "badge_bands": [("stellar", 0.9)]},
+        {"version": "x", "badge_bands": [("fair", 0.4), ("good", 0.6)]},
+    ],
+)
+def test_scoring_model_spec_rejects_nonsense(bad: dict) -> None:
+    with pytest.raises(ValidationError):
+        ScoringModelSpec(**bad)
+
+
+def test_signals_to_mask_round_trip() -> None:
+    signals = _signals_with_true(3)
+    mask = signals_to_mask(signals)
+    assert mask == 0b111
+    assert mask_to_signals(mask) == signals
+
+
+def test_compute_findability_returns_fresh_evidence_list() -> None:
+    first = compute_findability(_signals_with_true(2))
+    first["evidence"].append("tampered")
+    assert compute_findability(_signals_with_true(2))["evidence"] == [
+        "+ contact page",
+        "+ clear services page",
+    ]
+
+
+def test_compute_findability_batch_rejects_out_of_range_masks() -> None:
+    with pytest.raises(ValueError):
+        compute_findability_batch(SIGNAL_MASK_ALL + 1)
+    with pytest.raises(ValueError):
+        compute_findability_batch(np.array([0, 1 << 10], dtype=np.uint16))
+    with pytest.raises(ValueError):
+        compute_findability_batch(np.array([0.5]))
@@ -0,0 +1,121 @@
+import math
+
+import pytest
+
+import main
+from conftest import TestingSessionLocal, evaluate, evaluate_body
+
+# Mentioned with just one signal, and a higher bar for excellent
+GENEROUS = {
+    "version": "generous-2",
+    "description": "Count one signal as mentioned",
+    "presence_min": 1,
+    "badge_bands": [["excellent", 0.9], ["good", 0.6], ["fair", 0.4]],
+}
+
+
+def test_builtin_model_is_listed_and_active(client) -> None:
+    models = client.get("/scoring-models").json()
+    assert [(m["version"], m["builtin"], m["active"]) for m in models] == [("v1", True, True)]
+    assert models[0]["spec"]["weights"] == {"presence": 0.6, "rank": 0.3, "confidence": 0.1}
+
+    r = client.get("/scoring-models/nope")
+    assert r.status_code == 404
+    assert r.json()["detail"]["error"] == "scoring_model_not_found"
+
+
+def test_store_a_model_and_versions_never_change(client) -> None:
+    r = client.post("/scoring-models", json=GENEROUS)
+    assert r.status_code == 201, r.text
+    created = r.json()
+    assert (created["version"], created["builtin"], created["active"]) == ("generous-2", False, False)
+    assert created["spec"]["presence_min"] == 1
+    assert created["created_at"] is not None
+
+    assert client.get("/scoring-models/generous-2").json() == created
+    assert [m["version"] for m in client.get("/scoring-models").json()] == ["v1", "generous-2"]
+
+    for version in ("generous-2", "v1"):
+        dupe = client.post("/scoring-models", json={**GENEROUS, "version": version})
+        assert dupe.status_code == 409
+        assert dupe.json()["detail"]["error"] == "scoring_model_exists"
+
+    bad = client.post("/scoring-models", json={"version": "x", "signal_weights": {"vibes": 1}})
+    assert bad.status_code == 422
+
+
+def test_stored_models_load_from_the_db(client) -> None:
+    assert client.post("/scoring-models", json=GENEROUS).status_code == 201
+    # Another process (or a restart) only has the row to go on
+    main.scoring_models.reset()
+    with TestingSessionLocal() as db:
+        model = main.scoring_models.get(db, "generous-2")
+    assert model.spec.presence_min == 1
+    assert model.score_table[0b1] > main.DEFAULT_SCORING_MODEL.score_table[0b1]
+
+
+def test_evaluations_record_their_model_version(client, monkeypatch) -> None:
+    cid = client.post("/companies", json={"name": "Versioned Co"}).json()["id"]
+    first = evaluate(client, cid, 1)
+    assert (first["model_version"], first["badge"]) == ("v1", "poor")
+
+    assert client.post("/scoring-models", json=GENEROUS).status_code == 201
+    with TestingSessionLocal() as db:
+        # What SCORING_MODEL=generous-2 would do at startup
+        registry = main.ScoringModelRegistry([main.DEFAULT_SCORING_MODEL], "generous-2")
+        registry.add(main.scoring_models.get(db, "generous-2"))
+        registry.activate(db)
+    monkeypatch.setattr(main.scoring_models, "active", registry.active)
+    main.evaluation_dedupe.clear()  # a restart would have forgotten it too
+
+    second = evaluate(client, cid, 1)
+    assert second["model_version"] == "generous-2"
+    assert second["badge"] == "good"
+    assert second["score"] == pytest.approx(0.6 + 0.3 * 0.0 + 0.1 * 0.4)
+
+    history = client.get(f"/companies/{cid}/evaluations").json()
+    assert [e["model_version"] for e in history] == ["generous-2", "v1"]
+    batch = client.post("/evaluate/batch", json={"items": [evaluate_body(cid, 2)]}).json()
+    assert batch["results"][0]["evaluation"]["model_version"] == "generous-2"
+
+
+def test_activating_an_unknown_model_fails_loudly(client) -> None:
+    registry = main.ScoringModelRegistry([main.DEFAULT_SCORING_MODEL], "missing")
+    with TestingSessionLocal() as db, pytest.raises(RuntimeError):
+        registry.activate(db)
+
+
+def test_compare_models_over_latest_signals(client) -> None:
+    # Latest signal counts: 0, 1, 1, 6 (the first company's older 6 doesn't count)
+    for i, counts in enumerate(([6, 0], [1], [1], [6])):
+        cid = client.post("/companies", json={"name": f"Compare Co {i}"}).json()["id"]
+        for n_true in counts:
+            evaluate(client, cid, n_true)
+    assert client.post("/scoring-models", json=GENEROUS).status_code == 201
+
+    r = client.get("/scoring-models/compare", params={"base": "v1", "candidate": "generous-2"})
+    assert r.status_code == 200, r.text
+    diff = r.json()
+    assert (diff["base"], diff["candidate"], diff["companies"]) == ("v1", "generous-2", 4)
+    # One signal goes poor -> good (twice); six signals stays excellent under
+    # both (0.6 + 0.3 + 0.09 >= 0.9 as well as >= 0.8)
+    assert diff["badge_transitions"] == [
+        {"from_badge": "poor", "to_badge": "good", "companies": 2}
+    ]
+    assert diff["companies_rebadged"] == 2
+    with TestingSessionLocal() as db:
+        generous = main.scoring_models.get(db, "generous-2")
+    one_signal_delta = generous.score_table[1] - main.DEFAULT_SCORING_MODEL.score_table[1]
+    assert diff["mean_score_delta"] == pytest.approx(2 * one_signal_delta / 4)
+    # One-signal combinations gain presence; two-signal ones (0.89) fall
+    # short of the new excellent bar. From three signals up nothing moves.
+    assert diff["combinations_changed"] == len(main.SIGNALS) + math.comb(len(main.SIGNALS), 2)
+
+    same = client.get("/scoring-models/compare", params={"base": "v1", "candidate": "v1"}).json()
+    assert (same["companies_rebadged"], same["mean_score_delta"], same["combinations_changed"]) == (
+        0,
+        0.0,
+        0,
+    )
+    missing = client.get("/scoring-models/compare", params={"base": "v1", "candidate": "v9"})
+    assert missing.status_code == 404
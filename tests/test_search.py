@@ -0,0 +1,66 @@
+from sqlalchemy import text
+
+import main
+from conftest import test_engine
+
+
+def _names(r) -> list:
+    assert r.status_code == 200
+    return [c["name"] for c in r.json()]
+
+
+def test_search_matches_substrings_across_fields(client) -> None:
+    client.post("/companies", json={"name": "Sunrise Dental", "city": "Austin"})
+    client.post("/companies", json={"name": "Harbor Plumbing", "industry": "Home services"})
+    client.post("/companies", json={"name": "Blue Fin Sushi", "niche": "omakase dental-free"})
+
+    assert _names(client.get("/companies?q=rise")) == ["Sunrise Dental"]
+    assert _names(client.get("/companies?q=AUSTIN")) == ["Sunrise Dental"]
+    assert _names(client.get("/companies?q=home serv")) == ["Harbor Plumbing"]
+    assert _names(client.get("/companies?q=dental")) == ["Sunrise Dental", "Blue Fin Sushi"]
+
+
+def test_search_ranked_order_prefers_name_hits(client) -> None:
+    client.post("/companies", json={"name": "Acme Bakery", "niche": "widgets"})
+    client.post("/companies", json={"name": "Widget World"})
+
+    assert _names(client.get("/companies?q=widget")) == ["Acme Bakery", "Widget World"]
+    r = client.get("/companies?q=widget&order=rank")
+    assert _names(r) == ["Widget World", "Acme Bakery"]
+    assert "x-next-cursor" not in r.headers
+
+
+def test_search_rank_rejects_cursor(client) -> None:
+    r = client.get("/companies?q=widget&order=rank&after_id=3")
+    assert r.status_code == 422
+    assert r.json()["detail"]["error"] == "cursor_not_supported"
+
+
+def test_search_index_follows_updates_and_deletes(client) -> None:
+    cid = client.post("/companies", json={"name": "Old Name Co"}).json()["id"]
+    client.patch(f"/companies/{cid}", json={"name": "Fresh Name Co"})
+
+    assert _names(client.get("/companies?q=old name")) == []
+    assert _names(client.get("/companies?q=fresh")) == ["Fresh Name Co"]
+
+    client.delete(f"/companies/{cid}")
+    assert _names(client.get("/companies?q=fresh")) == []
+
+
+def test_search_short_and_quoted_queries(client) -> None:
+    client.post("/companies", json={"name": 'The "Q" Shop'})
+    client.post("/companies", json={"name": "Other Co"})
+
+    # Under three characters skips the trigram index but still works
+    assert _names(client.get("/companies?q=q")) == ['The "Q" Shop']
+    # Quotes are treated as text, not FTS syntax
+    assert _names(client.get('/companies?q="q" sh')) == ['The "Q" Shop']
+
+
+def test_search_index_backfills_existing_rows(client) -> None:
+    client.post("/companies", json={"name": "Legacy Labs"})
+    with test_engine.begin() as connection:
+        connection.execute(text("DROP TABLE companies_fts"))
+        main.ensure_company_search_index(connection)
+
+    assert _names(client.get("/companies?q=legacy")) == ["Legacy Labs"]
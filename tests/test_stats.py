@@ -0,0 +1,143 @@
+from typing import List
+
+import pytest
+from sqlalchemy import event
+
+import main
+from conftest import evaluate, make_company, test_async_engine, test_engine
+
+
+def test_stats_group_by_country_uses_latest_evaluation(client) -> None:
+    us_a = make_company(client, "Alpha", country="US", industry="dental")
+    us_b = make_company(client, "Bravo", country="US", industry="legal")
+    ca = make_company(client, "Charlie", country="CA", industry="dental")
+    make_company(client, "Never Scored", country="US")
+
+    evaluate(client, us_a, 0)
+    evaluate(client, us_a, 10)  # only this one counts for Alpha
+    evaluate(client, us_b, 0)
+    evaluate(client, ca, 4)
+
+    r = client.get("/stats", params={"group_by": "country"})
+    assert r.status_code == 200
+    data = r.json()
+    assert data["companies"] == 3
+    us, canada = data["segments"]
+    assert us["key"] == {"country": "US"}
+    assert us["companies"] == 2
+    assert us["badges"] == {"poor": 1, "fair": 0, "good": 0, "excellent": 1}
+    assert us["histogram"][0] == 1 and us["histogram"][-1] == 1
+    assert sum(us["histogram"]) == 2
+    assert us["score_mean"] == pytest.approx(0.5)  # (0.0 + 1.0) / 2
+    assert canada["key"] == {"country": "CA"}
+    assert canada["badges"]["excellent"] == 1
+
+
+def test_stats_filters_and_multiple_groups(client) -> None:
+    evaluate(client, make_company(client, "Alpha", country="US", industry="dental"), 3)
+    evaluate(client, make_company(client, "Bravo", country="US"), 3)
+    evaluate(client, make_company(client, "Charlie", country="CA", industry="dental"), 3)
+
+    r = client.get(
+        "/stats", params={"group_by": ["country", "industry"], "country": "US", "bins": 4}
+    )
+    assert r.status_code == 200
+    data = r.json()
+    assert data["filters"] == {"country": "US"}
+    assert [s["key"] for s in data["segments"]] == [
+        {"country": "US", "industry": "dental"},
+        {"country": "US", "industry": None},
+    ]
+    assert all(len(s["histogram"]) == 4 for s in data["segments"])
+
+    overall = client.get("/stats").json()
+    assert overall["segments"][0]["key"] == {}
+    assert overall["companies"] == 3
+
+
+@pytest.mark.parametrize("field", main.STATS_DIMENSIONS)
+def test_stats_filters_search_the_segment_indexes(client, field) -> None:
+    evaluate(client, make_company(client, "Alpha", **{field: "x"}), 3)
+    captured = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if "FROM evaluation_summaries" in statement:
+            captured.append((statement, parameters))
+
+    engines = (test_engine, test_async_engine.sync_engine)
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", _record)
+    try:
+        assert client.get("/stats", params={field: "x"}).json()["companies"] == 1
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", _record)
+
+    [(statement, parameters)] = captured
+    with test_engine.connect() as connection:
+        plan = " ".join(
+            row[-1]
+            for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        )
+    assert f"INDEX ix_companies_{field} ({field}=?)" in plan
+
+
+def test_stats_rejects_unknown_dimension(client) -> None:
+    assert client.get("/stats", params={"group_by": "name"}).status_code == 422
+    assert client.get("/stats", params={"bins": 0}).status_code == 422
+
+
+def test_stats_cache_is_dropped_only_for_affected_segments(
+    client, query_counter: List[str]
+) -> None:
+    us = make_company(client, "Alpha", country="US")
+    ca = make_company(client, "Charlie", country="CA")
+    evaluate(client, us, 0)
+    evaluate(client, ca, 0)
+
+    us_stats = {"group_by": "industry", "country": "US"}
+    first = client.get("/stats", params=us_stats).json()
+    query_counter.clear()
+    assert client.get("/stats", params=us_stats).json() == first
+    assert query_counter == []  # served from the cache
+
+    evaluate(client, ca, 10)  # different segment: US entry survives
+    query_counter.clear()
+    assert client.get("/stats", params=us_stats).json() == first
+    assert query_counter == []
+
+    evaluate(client, us, 10)
+    fresh = client.get("/stats", params=us_stats).json()
+    assert fresh["segments"][0]["badges"]["excellent"] == 1
+
+
+def test_stats_cache_follows_company_moves_and_deletes(client) -> None:
+    cid = make_company(client, "Alpha", country="US")
+    evaluate(client, cid, 10)
+    assert client.get("/stats", params={"country": "US"}).json()["companies"] == 1
+
+    client.patch(f"/companies/{cid}", json={"country": "CA"})
+    assert client.get("/stats", params={"country": "US"}).json()["companies"] == 0
+    assert client.get("/stats", params={"country": "CA"}).json()["companies"] == 1
+
+    client.delete(f"/companies/{cid}")
+    assert client.get("/stats", params={"country": "CA"}).json()["companies"] == 0
+
+
+def test_stats_cache_expires_and_stays_bounded() -> None:
+    cache = main.StatsCache(ttl_seconds=0, max_entries=2)
+    stats = main.StatsOut(group_by=[], filters={}, bins=1, companies=0, segments=[])
+    cache.put(("a",), {}, stats, cache.generation)
+    assert cache.get(("a",)) is None  # already expired
+
+    cache = main.StatsCache(ttl_seconds=60, max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put((key,), {}, stats, cache.generation)
+    assert cache.get(("a",)) is None
+    assert cache.get(("c",)) is stats
+
+    # A write between reading the generation and storing the result wins
+    generation = cache.generation
+    cache.invalidate([{"country": "US"}])
+    cache.put(("d",), {}, stats, generation)
+    assert cache.get(("d",)) is None
@@ -0,0 +1,100 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+from prometheus_client import multiprocess
+from prometheus_client.parser import text_string_to_metric_families
+
+import main
+import serve
+
+# A stand-in for one worker: same metric names as main.py, written to the
+# shared multiprocess dir the way a uvicorn worker under serve.py would
+WORKER_SCRIPT = textwrap.dedent(
+    """
+    import sys
+    from prometheus_client import Counter, Gauge
+
+    hits, depth = int(sys.argv[1]), int(sys.argv[2])
+    Counter("company_cache_hits", "hits").inc(hits)
+    Gauge("evaluation_queue_depth", "depth", multiprocess_mode="livesum").set(depth)
+    """
+)
+
+
+def _run_worker(multiproc_dir: str, hits: int, depth: int) -> None:
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=multiproc_dir)
+    subprocess.run(
+        [sys.executable, "-c", WORKER_SCRIPT, str(hits), str(depth)], env=env, check=True
+    )
+
+
+def _samples(client) -> dict:
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    return {
+        sample.name: sample.value
+        for family in text_string_to_metric_families(r.text)
+        for sample in family.samples
+        if not sample.labels
+    }
+
+
+def test_worker_count_reads_web_concurrency(monkeypatch) -> None:
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    assert serve.worker_count() == 3
+    monkeypatch.setenv("WEB_CONCURRENCY", "0")
+    assert serve.worker_count() == 1
+    monkeypatch.delenv("WEB_CONCURRENCY")
+    assert serve.worker_count() == serve.usable_cpus()
+
+
+def test_usable_cpus_respects_container_quota(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: set(range(8)), raising=False)
+    cpu_max = tmp_path / "cpu.max"
+    monkeypatch.setattr(serve, "CGROUP_V2_CPU_MAX", str(cpu_max))
+    monkeypatch.setattr(serve, "CGROUP_V1_CPU_DIR", str(tmp_path / "v1"))
+
+    # No cgroup files at all: the affinity mask decides
+    assert serve.usable_cpus() == 8
+    cpu_max.write_text("max 100000\n")
+    assert serve.usable_cpus() == 8
+    cpu_max.write_text("200000 100000\n")
+    assert serve.usable_cpus() == 2
+    cpu_max.write_text("10000 100000\n")  # a tenth of a CPU still gets one worker
+    assert serve.usable_cpus() == 1
+
+    # cgroup v1
+    cpu_max.unlink()
+    (tmp_path / "v1").mkdir()
+    (tmp_path / "v1" / "cpu.cfs_quota_us").write_text("300000\n")
+    (tmp_path / "v1" / "cpu.cfs_period_us").write_text("100000\n")
+    assert serve.usable_cpus() == 3
+    (tmp_path / "v1" / "cpu.cfs_quota_us").write_text("-1\n")
+    assert serve.usable_cpus() == 8
+
+
+def test_metrics_add_up_across_worker_processes(client, tmp_path, monkeypatch) -> None:
+    multiproc_dir = str(tmp_path)
+    _run_worker(multiproc_dir, hits=2, depth=4)
+    _run_worker(multiproc_dir, hits=3, depth=1)
+    monkeypatch.setattr(main, "PROMETHEUS_MULTIPROC_DIR", multiproc_dir)
+
+    samples = _samples(client)
+    assert samples["company_cache_hits_total"] == 5
+    assert samples["evaluation_queue_depth"] == 5
+
+
+def test_dead_workers_drop_out_of_live_gauges(client, tmp_path, monkeypatch) -> None:
+    multiproc_dir = str(tmp_path)
+    _run_worker(multiproc_dir, hits=2, depth=4)
+    monkeypatch.setattr(main, "PROMETHEUS_MULTIPROC_DIR", multiproc_dir)
+    # What a worker's shutdown hook does; counters keep their totals
+    for name in os.listdir(multiproc_dir):
+        if name.startswith("gauge_livesum_"):
+            multiprocess.mark_process_dead(int(name.rsplit("_", 1)[1][:-3]), multiproc_dir)
+
+    samples = _samples(client)
+    assert samples["company_cache_hits_total"] == 2
+    assert samples.get("evaluation_queue_depth", 0) == 0
@@ -0,0 +1,167 @@
+import threading
+import time
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import event, text
+
+import main
+from conftest import TestingSessionLocal, evaluate_body, test_engine
+
+
+def _rows(company_id: int) -> list:
+    with test_engine.connect() as conn:
+        return conn.execute(
+            text(
+                "SELECT signal_mask, score, created_at FROM evaluations"
+                " WHERE company_id = :cid ORDER BY id"
+            ),
+            {"cid": company_id},
+        ).all()
+
+
+def _batch_samples() -> tuple:
+    count = REGISTRY.get_sample_value("evaluation_commit_batch_size_count") or 0.0
+    total = REGISTRY.get_sample_value("evaluation_commit_batch_size_sum") or 0.0
+    return count, total
+
+
+@pytest.fixture()
+def writer(client, monkeypatch):
+    writer = main.EvaluationWriter(
+        TestingSessionLocal, max_queue=100, flush_ms=100, flush_rows=50
+    )
+    monkeypatch.setattr(main, "evaluation_writer", writer)
+    writer.start()
+    yield writer
+    writer.stop()
+
+
+def test_write_behind_answers_now_and_commits_later(client, writer) -> None:
+    cid = client.post("/companies", json={"name": "Queue Co"}).json()["id"]
+
+    r = client.post("/evaluate", json=evaluate_body(cid, 4))
+    assert r.status_code == 202
+    queued = r.json()
+    assert queued["id"] is None
+    assert queued["queued"] is True
+    assert queued["evidence"] == main.compute_findability(
+        main.mask_to_signals(0b1111)
+    )["evidence"]
+
+    writer.flush()
+    [(mask, score, _created_at)] = _rows(cid)
+    assert (mask, score) == (0b1111, queued["score"])
+    summary = client.get(f"/companies/{cid}/summary").json()
+    assert summary["evaluation_count"] == 1
+    assert summary["latest_at"] == queued["created_at"]
+
+
+def test_write_behind_probe_stays_off_the_writer(client, writer) -> None:
+    cid = client.post("/companies", json={"name": "Probe Co"}).json()["id"]
+    begun = []
+
+    def _watched_writer_db():
+        db = TestingSessionLocal()
+        event.listen(db, "after_begin", lambda *args: begun.append(True))
+        try:
+            yield db
+        finally:
+            db.close()
+
+    # db_mode puts the usual override back afterwards
+    main.app.dependency_overrides[main.get_session] = _watched_writer_db
+    assert client.post("/evaluate", json=evaluate_body(cid)).status_code == 202
+    assert begun == []  # under BEGIN IMMEDIATE this would have taken the write lock
+
+
+def test_history_pages_mix_write_behind_and_sync_rows(client, writer) -> None:
+    cid = client.post("/companies", json={"name": "Mixed Co"}).json()["id"]
+    for n_true in (1, 2):
+        assert client.post("/evaluate", json=evaluate_body(cid, n_true)).status_code == 202
+    writer.flush()
+    writer.stop()
+    for n_true in (3, 4):
+        assert client.post("/evaluate", json=evaluate_body(cid, n_true)).status_code == 201
+    # Same second for all four, keeping whatever format each write mode stored
+    with test_engine.begin() as conn:
+        conn.execute(
+            text(
+                "UPDATE evaluations SET created_at = '2026-01-01 00:00:00' || substr(created_at, 20)"
+                " WHERE company_id = :cid"
+            ),
+            {"cid": cid},
+        )
+
+    newest_first = [e["id"] for e in client.get(f"/companies/{cid}/evaluations").json()]
+    assert newest_first == sorted(newest_first, reverse=True)
+    paged, params = [], {"limit": 1}
+    while True:
+        r = client.get(f"/companies/{cid}/evaluations", params=params)
+        paged += [e["id"] for e in r.json()]
+        if "x-next-cursor" not in r.headers:
+            break
+        params["before"] = r.headers["x-next-cursor"]
+    assert paged == newest_first
+
+
+def test_write_behind_still_404s_unknown_companies(client, writer) -> None:
+    r = client.post("/evaluate", json=evaluate_body(12345))
+    assert r.status_code == 404
+
+
+def test_write_behind_group_commits(client, writer) -> None:
+    cid = client.post("/companies", json={"name": "Burst Co"}).json()["id"]
+    count, total = _batch_samples()
+    for n_true in range(10):
+        assert client.post("/evaluate", json=evaluate_body(cid, n_true)).status_code == 202
+    writer.flush()
+
+    new_count, new_total = _batch_samples()
+    assert new_total - total == 10
+    assert new_count - count < 10  # coalesced into fewer commits
+    assert len(_rows(cid)) == 10
+
+
+def test_write_behind_full_queue_answers_429(client, monkeypatch) -> None:
+    cid = client.post("/companies", json={"name": "Busy Co"}).json()["id"]
+    release = threading.Event()
+
+    def _slow_session():
+        release.wait(5)
+        return TestingSessionLocal()
+
+    writer = main.EvaluationWriter(_slow_session, max_queue=1, flush_ms=1, flush_rows=1)
+    monkeypatch.setattr(main, "evaluation_writer", writer)
+    writer.start()
+    try:
+        assert client.post("/evaluate", json=evaluate_body(cid, 1)).status_code == 202
+        while writer.depth:  # worker picked it up and is stuck committing
+            time.sleep(0.01)
+        assert client.post("/evaluate", json=evaluate_body(cid, 2)).status_code == 202
+        assert REGISTRY.get_sample_value("evaluation_queue_depth") == 1
+        r = client.post("/evaluate", json=evaluate_body(cid, 3))
+        assert r.status_code == 429
+        assert r.headers["retry-after"] == "1"
+        assert r.json()["detail"]["error"] == "evaluation_queue_full"
+    finally:
+        release.set()
+        writer.stop()  # shutdown drains what was accepted
+    assert [mask for mask, _, _ in _rows(cid)] == [0b1, 0b11]
+
+
+def test_write_behind_drops_rows_for_deleted_companies(client) -> None:
+    keep = client.post("/companies", json={"name": "Keep Co"}).json()["id"]
+    gone = client.post("/companies", json={"name": "Gone Co"}).json()["id"]
+    client.delete(f"/companies/{gone}")
+
+    writer = main.EvaluationWriter(TestingSessionLocal, max_queue=10, flush_ms=1, flush_rows=10)
+    row = {"score": 0.5, "badge": "fair", "signal_mask": 3, "created_at": main.datetime(2026, 1, 1)}
+    writer._commit(
+        [
+            main.QueuedEvaluation(row={**row, "company_id": gone}, segment={}),
+            main.QueuedEvaluation(row={**row, "company_id": keep}, segment={}),
+        ]
+    )
+    assert len(_rows(keep)) == 1
+    assert _rows(gone) == []